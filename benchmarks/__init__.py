@@ -0,0 +1,4 @@
+# benchmarks/__init__.py
+
+# Offline benchmarks and load-testing helpers. Nothing in here is imported
+# by the bot itself.
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""Import-time budgets for the bot and the index scripts.
+
+Usage::
+
+    python -m benchmarks.bench_imports
+    python -m benchmarks.bench_imports --output new.json --compare old.json
+
+Each module is imported ``--repeat`` times in a fresh interpreter with
+``-X importtime`` and the fastest cumulative time is compared with its
+budget. Budgets are in milliseconds on a typical development machine; scale
+them with ``--scale`` on slower hosts. The run also fails if importing a
+module loads one of the heavy libraries that should only be loaded on first
+use (Playwright, BeautifulSoup, requests, rapidfuzz, and aiohttp for the
+modules that scripts use without the bot).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, ROOT_DIR)
+
+from benchmarks.bench_search import _git_commit
+
+LAZY = ("playwright", "bs4", "requests", "rapidfuzz")
+
+# module -> (budget in ms, libraries it must not load)
+BUDGETS: dict[str, tuple[float, tuple[str, ...]]] = {
+    # discord.py alone accounts for most of the bot's import time
+    "bot": (500, LAZY),
+    "search_service": (400, LAZY),
+    "scrapers.aggregator": (120, LAZY + ("aiohttp",)),
+    "scrapers.myrient": (30, LAZY + ("aiohttp",)),
+    "scrapers.emulatorjs": (30, LAZY + ("aiohttp",)),
+    "scrapers.title_index": (30, LAZY + ("aiohttp",)),
+    "scrapers.paths": (5, LAZY + ("aiohttp",)),
+}
+
+
+def _parse_importtime(stderr: str, module: str) -> list[tuple[str, int, int]]:
+    """Return ``(name, cumulative microseconds, depth)`` for ``module`` and its imports.
+
+    ``-X importtime`` lists each module after everything it imported, so the
+    tree of ``module`` is the run of nested lines just before its own line.
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue  # the header line
+        name = parts[2].rstrip()
+        rows.append((name.strip(), int(parts[1]), (len(name) - len(name.lstrip())) // 2))
+    end = next(i for i, row in enumerate(rows) if row[0] == module and row[2] == 0)
+    start = end
+    while start > 0 and rows[start - 1][2] > 0:
+        start -= 1
+    return rows[start:end + 1]
+
+
+def measure(module: str, repeat: int, env: dict) -> dict:
+    """Import ``module`` ``repeat`` times and return its fastest import."""
+    best: list[tuple[str, int, int]] | None = None
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=ROOT_DIR, env=env, capture_output=True, text=True,
+        )
+        if out.returncode != 0:
+            print(out.stderr[-2000:], file=sys.stderr)
+            raise RuntimeError(f"importing {module} failed")
+        tree = _parse_importtime(out.stderr, module)
+        if best is None or tree[-1][1] < best[-1][1]:
+            best = tree
+    # Slowest packages it pulls in, for spotting what to defer next
+    children = sorted(
+        ((name, us) for name, us, _ in best[:-1] if "." not in name),
+        key=lambda item: item[1], reverse=True,
+    )
+    return {
+        "module": module,
+        "ms": round(best[-1][1] / 1000, 1),
+        "loaded": sorted({name.split(".")[0] for name, _, _ in best}),
+        "slowest": [[name, round(us / 1000, 1)] for name, us in children[:5]],
+    }
+
+
+def _bot_config() -> str:
+    """Write a throwaway config so ``bot`` can be imported without secrets."""
+    cfg = {"token": "bench", "guildId": "0", "theGamesDbApiKey": "bench", "prefix": "!", "cachePath": ""}
+    fd, path = tempfile.mkstemp(suffix=".json")
+    with os.fdopen(fd, "w") as f:
+        json.dump(cfg, f)
+    return path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("modules", nargs="*", help=f"modules to check (default: {', '.join(BUDGETS)})")
+    parser.add_argument("--repeat", type=int, default=5, help="imports per module; the fastest counts")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every budget by this factor")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--compare", help="baseline JSON file from a previous run")
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = {r["module"]: r for r in json.load(f)["results"]}
+
+    config_path = _bot_config()
+    env = dict(os.environ, LETMEPLAYTHIS_CONFIG=config_path)
+    results, failed = [], False
+    try:
+        for module in args.modules or BUDGETS:
+            budget, lazy = BUDGETS.get(module, (float("inf"), LAZY))
+            res = measure(module, args.repeat, env)
+            res["budget_ms"] = budget * args.scale
+            eager = [lib for lib in lazy if lib in res["loaded"]]
+            ok = res["ms"] <= res["budget_ms"] and not eager
+            failed |= not ok
+
+            line = f"  {module:<22} {res['ms']:>8.1f}ms  budget {res['budget_ms']:>6.0f}ms  {'ok' if ok else 'FAIL'}"
+            old = baseline.get(module)
+            if old and old["ms"]:
+                line += f"  ({(res['ms'] - old['ms']) / old['ms'] * 100:+.1f}% vs baseline)"
+            print(line)
+            if eager:
+                print(f"    loads {', '.join(eager)} at import time")
+            if not ok:
+                print("    slowest: " + ", ".join(f"{name} {ms}ms" for name, ms in res["slowest"]))
+            results.append(res)
+    finally:
+        os.remove(config_path)
+
+    if args.output:
+        report = {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "results": results,
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n[bench] wrote results to {args.output}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""Offline benchmarks for index search and the download link pipeline.
+
+Usage::
+
+    python -m benchmarks.bench_search --sizes 10000,100000,1000000
+    python -m benchmarks.bench_search --output new.json --compare old.json
+
+Each index size runs in a fresh subprocess so peak RSS is measured per
+scenario. Network-backed providers (RomsPure, GOG-Games) are replaced with
+stubs that sleep for ``--stub-latency`` milliseconds, so no traffic leaves
+the machine. Results are written as JSON together with the current git
+commit so that runs from different commits can be compared with
+``--compare``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, ROOT_DIR)
+
+from benchmarks import synthetic
+
+DEFAULT_SIZES = "10000,100000,1000000"
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    """Return the ``pct`` percentile of ``samples`` (nearest-rank)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[rank]
+
+
+def _summarize(samples: list[float], wall: float) -> dict:
+    """Return latency percentiles in milliseconds and throughput in ops/s."""
+    return {
+        "count": len(samples),
+        "p50_ms": round(_percentile(samples, 50) * 1000, 3),
+        "p99_ms": round(_percentile(samples, 99) * 1000, 3),
+        "max_ms": round(max(samples, default=0.0) * 1000, 3),
+        "throughput_ops": round(len(samples) / wall, 2) if wall > 0 else 0.0,
+    }
+
+
+def _peak_rss_mb() -> float:
+    """Return the peak resident set size of this process in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes
+    if sys.platform == "darwin":
+        return round(peak / (1024 * 1024), 1)
+    return round(peak / 1024, 1)
+
+
+def _git_commit() -> str:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT_DIR, capture_output=True, text=True, check=True,
+        )
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _install_stubs(aggregator, latency: float) -> None:
+    """Replace network-backed providers in ``aggregator`` with sleeping stubs."""
+
+    async def stub_gog(game_title: str, platform_name: str) -> list[tuple[str, None]]:
+        await asyncio.sleep(latency)
+        return [(f"https://gog-games.invalid/game/{game_title.replace(' ', '_')}", None)]
+
+    async def stub_romspure(game_title: str, platform_name: str) -> list[tuple[str, None]]:
+        await asyncio.sleep(latency)
+        return [(f"https://romspure.invalid/roms/{game_title.replace(' ', '-')}", None)]
+
+    aggregator.REGISTRY["GOG-Games"].fetch = stub_gog
+    aggregator.REGISTRY["RomsPure"].fetch = stub_romspure
+
+
+async def _time_calls(func, queries: list[tuple[str, str]]) -> dict:
+    samples: list[float] = []
+    start = time.perf_counter()
+    for title, plat in queries:
+        t0 = time.perf_counter()
+        await func(title, plat)
+        samples.append(time.perf_counter() - t0)
+    return _summarize(samples, time.perf_counter() - start)
+
+
+async def _run_scenario(size: int, queries: int, seed: int, latency: float, compress: bool = False) -> dict:
+    """Benchmark one index size. Runs inside a worker subprocess."""
+    import scrapers.myrient as myrient
+    import scrapers.emulatorjs as emulatorjs
+    import scrapers.aggregator as aggregator
+    import scrapers.shared_cache as shared_cache
+
+    result: dict = {"size": size}
+    with tempfile.TemporaryDirectory() as tmp:
+        myrient_path = os.path.join(tmp, "myrient_index.txt")
+        ejs_path = os.path.join(tmp, "emulatorjs_index.json")
+
+        t0 = time.perf_counter()
+        synthetic.write_myrient_index(myrient_path, size, seed)
+        synthetic.write_emulatorjs_index(ejs_path, max(100, size // 100), seed)
+        result["generate_s"] = round(time.perf_counter() - t0, 3)
+        if compress:
+            with contextlib.redirect_stdout(io.StringIO()):
+                myrient.sort_index(myrient_path, compress=True)
+            myrient_path = myrient.index_path(myrient_path, True)
+        result["index_mb"] = round(os.path.getsize(myrient_path) / (1024 * 1024), 1)
+
+        myrient.INDEX_PATH = myrient_path
+        myrient.reset_index_cache()
+        emulatorjs.INDEX_PATH = ejs_path
+        emulatorjs._index_cache = None
+        emulatorjs.set_base_url("http://emulatorjs.invalid/")
+        _install_stubs(aggregator, latency)
+        shared_cache.set_path(None)
+
+        workload = synthetic.make_queries(queries, seed)
+
+        # The scrapers log every lookup; keep that out of the timings.
+        with contextlib.redirect_stdout(io.StringIO()):
+            t0 = time.perf_counter()
+            myrient._get_sorted_index() or myrient._load_index()
+            result["myrient_load_s"] = round(time.perf_counter() - t0, 3)
+            t0 = time.perf_counter()
+            emulatorjs._load_index()
+            result["emulatorjs_load_s"] = round(time.perf_counter() - t0, 3)
+
+            result["search_myrient"] = await _time_calls(myrient.search_myrient, workload)
+            result["search_emulatorjs"] = await _time_calls(emulatorjs.search_emulatorjs, workload)
+            result["get_all_download_links"] = await _time_calls(
+                aggregator.get_all_download_links, workload
+            )
+
+    result["peak_rss_mb"] = _peak_rss_mb()
+    return result
+
+
+def _run_worker(size: int, args: argparse.Namespace) -> dict:
+    """Run a single scenario in a subprocess and return its parsed result."""
+    cmd = [
+        sys.executable, "-m", "benchmarks.bench_search", "--worker",
+        "--sizes", str(size), "--queries", str(args.queries),
+        "--seed", str(args.seed), "--stub-latency", str(args.stub_latency),
+    ]
+    if args.compress:
+        cmd.append("--compress")
+    out = subprocess.run(cmd, cwd=ROOT_DIR, capture_output=True, text=True)
+    if out.returncode != 0:
+        print(out.stderr, file=sys.stderr)
+        raise RuntimeError(f"benchmark worker for size {size} failed")
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def _print_table(results: list[dict], baseline: dict | None) -> None:
+    base_by_size = {r["size"]: r for r in (baseline or {}).get("results", [])}
+    for res in results:
+        print(f"\n== {res['size']:,} paths (peak RSS {res['peak_rss_mb']} MiB, "
+              f"index {res.get('index_mb', '?')} MiB, load {res['myrient_load_s']}s) ==")
+        for name in ("search_myrient", "search_emulatorjs", "get_all_download_links"):
+            stats = res[name]
+            line = (f"  {name:<24} p50={stats['p50_ms']:>9.3f}ms "
+                    f"p99={stats['p99_ms']:>9.3f}ms  {stats['throughput_ops']:>10.2f} ops/s")
+            old = base_by_size.get(res["size"], {}).get(name)
+            if old and old["p50_ms"]:
+                delta = (stats["p50_ms"] - old["p50_ms"]) / old["p50_ms"] * 100
+                line += f"  (p50 {delta:+.1f}% vs baseline)"
+            print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=DEFAULT_SIZES,
+                        help="comma separated Myrient index sizes (default: %(default)s)")
+    parser.add_argument("--queries", type=int, default=200,
+                        help="number of (title, platform) lookups per scenario")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--stub-latency", type=float, default=0.0,
+                        help="simulated latency of stubbed HTTP providers in ms")
+    parser.add_argument("--compress", action="store_true",
+                        help="search a compressed Myrient index instead of plain text")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--compare", help="baseline JSON file from a previous run")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+
+    if args.worker:
+        res = asyncio.run(
+            _run_scenario(sizes[0], args.queries, args.seed, args.stub_latency / 1000, args.compress)
+        )
+        print(json.dumps(res))
+        return
+
+    results = []
+    for size in sizes:
+        print(f"[bench] running {size:,} paths...")
+        results.append(_run_worker(size, args))
+
+    report = {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "params": {
+            "queries": args.queries,
+            "seed": args.seed,
+            "stub_latency_ms": args.stub_latency,
+            "compress": args.compress,
+        },
+        "results": results,
+    }
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    _print_table(results, baseline)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n[bench] wrote results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
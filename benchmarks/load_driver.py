@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""Drive the ``/play`` flow headlessly at a configurable concurrency.
+
+The driver imports ``bot.py`` without connecting to Discord and invokes the
+``play_command`` callback with fake ``Interaction`` objects. When the
+dropdown arrives it picks one of the options and runs the select callback
+the command attached to it, just as a user click would.
+
+Start the mock servers first and export the base URLs they print, then::
+
+    python -m benchmarks.load_driver --users 50 --sessions 500
+
+Recorded per session: time-to-dropdown (command invocation until the select
+menu is sent) and time-to-embed (option picked until the final embed is
+edited in). Event-loop lag is sampled throughout the run with
+:class:`loop_monitor.LoopMonitor`, which also prints the stack of any call
+that blocks the loop for longer than ``--stall-ms``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import importlib
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, ROOT_DIR)
+
+from benchmarks.bench_search import _percentile
+from benchmarks.mock_servers.catalog import Catalog
+from loop_monitor import LoopMonitor
+
+
+class _FakeResponse:
+    def __init__(self, owner: "FakeInteraction") -> None:
+        self._owner = owner
+        self._done = False
+
+    def is_done(self) -> bool:
+        return self._done
+
+    async def defer(self, *args, **kwargs) -> None:
+        self._done = True
+        self._owner.events.append(("defer", time.perf_counter()))
+
+
+class _FakeFollowup:
+    def __init__(self, owner: "FakeInteraction") -> None:
+        self._owner = owner
+
+    async def send(self, content=None, *, view=None, embed=None, **kwargs) -> None:
+        self._owner.messages.append(content)
+        if view is not None:
+            self._owner.view = view
+            self._owner.events.append(("dropdown", time.perf_counter()))
+        else:
+            self._owner.events.append(("followup", time.perf_counter()))
+
+
+class FakeInteraction:
+    """Just enough of :class:`discord.Interaction` for the ``/play`` flow."""
+
+    def __init__(self, data: dict | None = None, guild_id: int | None = None) -> None:
+        self.data = data or {}
+        self.guild_id = guild_id
+        self.response = _FakeResponse(self)
+        self.followup = _FakeFollowup(self)
+        self.view = None
+        self.embed = None
+        self.messages: list[str | None] = []
+        self.events: list[tuple[str, float]] = []
+
+    async def edit_original_response(self, *, embed=None, view=None, **kwargs) -> None:
+        self.embed = embed
+        self.events.append(("embed", time.perf_counter()))
+
+
+def _load_bot(
+    no_gog: bool, search_service: str = "", guild_id: int | None = None, guild_regions: list[str] | None = None
+):
+    """Import ``bot.py`` with a throwaway config so it never logs in.
+
+    ``guild_regions`` becomes the region priority of ``guild_id``.
+    """
+    cfg = {
+        "token": "load-test",
+        "guildId": "0",
+        "theGamesDbApiKey": os.environ.get("THEGAMESDB_API_KEY", "load-test"),
+        "prefix": "!",
+        "ownerID": "",
+        "emulatorJsBaseUrl": os.environ.get("EMULATORJS_BASE_URL", ""),
+        # Measure real provider calls, not hits from a previous run
+        "cachePath": "",
+        "searchServiceUrl": search_service,
+    }
+    if guild_id is not None and guild_regions:
+        cfg["guildRegionPriority"] = {str(guild_id): guild_regions}
+    fd, path = tempfile.mkstemp(suffix=".json")
+    with os.fdopen(fd, "w") as f:
+        json.dump(cfg, f)
+    os.environ["LETMEPLAYTHIS_CONFIG"] = path
+    try:
+        bot_module = importlib.import_module("bot")
+    finally:
+        os.remove(path)
+
+    if no_gog:
+        import scrapers.aggregator as aggregator
+
+        async def no_links(game_title: str, platform_name: str) -> list[tuple[str, None]]:
+            return []
+
+        aggregator.REGISTRY["GOG-Games"].fetch = no_links
+    return bot_module
+
+
+async def _session(
+    bot_module, title: str, rng: random.Random, think: float, pick: str, guild_id: int | None = None
+) -> dict:
+    """Run one ``/play`` invocation followed by a selection."""
+    result: dict = {"title": title, "error": None, "dropdown_s": None, "embed_s": None}
+    interaction = FakeInteraction(guild_id=guild_id)
+    start = time.perf_counter()
+    try:
+        await bot_module.play_command.callback(interaction, title)
+    except Exception as e:
+        result["error"] = f"play: {type(e).__name__}: {e}"
+        return result
+
+    if interaction.view is None:
+        result["no_results"] = True
+        return result
+    result["dropdown_s"] = interaction.events[-1][1] - start
+
+    if think:
+        await asyncio.sleep(think)
+    select = interaction.view.children[0]
+    option = select.options[0] if pick == "first" else rng.choice(select.options)
+    click = FakeInteraction({"values": [option.value]}, guild_id=guild_id)
+    picked = time.perf_counter()
+    try:
+        await select.callback(click)
+    except Exception as e:
+        result["error"] = f"select: {type(e).__name__}: {e}"
+        return result
+    if click.embed is None:
+        result["error"] = "select: no embed produced"
+        return result
+    result["embed_s"] = click.events[-1][1] - picked
+    return result
+
+
+def _stats(samples: list[float]) -> dict:
+    return {
+        "count": len(samples),
+        "p50_ms": round(_percentile(samples, 50) * 1000, 1),
+        "p99_ms": round(_percentile(samples, 99) * 1000, 1),
+        "max_ms": round(max(samples, default=0.0) * 1000, 1),
+    }
+
+
+async def run(args: argparse.Namespace) -> dict:
+    guild_regions = [r.strip() for r in args.guild_regions.split(",") if r.strip()]
+    bot_module = _load_bot(args.no_gog, args.search_service, args.guild_id, guild_regions)
+    rng = random.Random(args.seed)
+    if args.titles:
+        with open(args.titles, "r", encoding="utf-8") as f:
+            titles = [line.strip() for line in f if line.strip()]
+    else:
+        titles = Catalog(args.games, args.seed).titles
+
+    sem = asyncio.Semaphore(args.users)
+    monitor = LoopMonitor(interval=0.01, threshold=args.stall_ms / 1000, history=1_000_000)
+    monitor.start()
+
+    async def one() -> dict:
+        async with sem:
+            return await _session(
+                bot_module, rng.choice(titles), rng, args.think_ms / 1000, args.pick, args.guild_id
+            )
+
+    start = time.perf_counter()
+    # The bot logs every request; keep the report readable.
+    with contextlib.redirect_stdout(io.StringIO()) if args.quiet else contextlib.nullcontext():
+        results = await asyncio.gather(*(one() for _ in range(args.sessions)))
+    wall = time.perf_counter() - start
+    await monitor.stop()
+
+    errors = [r["error"] for r in results if r["error"]]
+    return {
+        "params": {
+            "users": args.users,
+            "sessions": args.sessions,
+            "think_ms": args.think_ms,
+            "pick": args.pick,
+            "seed": args.seed,
+            "guild_id": args.guild_id,
+        },
+        "wall_s": round(wall, 2),
+        "sessions_per_s": round(len(results) / wall, 2) if wall else 0.0,
+        "time_to_dropdown": _stats([r["dropdown_s"] for r in results if r["dropdown_s"] is not None]),
+        "time_to_embed": _stats([r["embed_s"] for r in results if r["embed_s"] is not None]),
+        "loop_lag": _stats(list(monitor.samples)),
+        "loop_stalls": monitor.stalls,
+        "no_results": sum(1 for r in results if r.get("no_results")),
+        "error_rate": round(len(errors) / len(results), 4) if results else 0.0,
+        "errors": sorted(set(errors))[:20],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Headless load driver for the /play command.")
+    parser.add_argument("--users", type=int, default=10, help="concurrent simulated users")
+    parser.add_argument("--sessions", type=int, default=100, help="total /play invocations")
+    parser.add_argument("--think-ms", type=float, default=0.0,
+                        help="delay between the dropdown appearing and the selection")
+    parser.add_argument("--pick", choices=("random", "first"), default="random",
+                        help="which dropdown option the simulated user selects")
+    parser.add_argument("--titles", help="file with one search title per line "
+                                         "(default: titles from the mock server catalog)")
+    parser.add_argument("--games", type=int, default=5000, help="mock catalog size, must match the server")
+    parser.add_argument("--seed", type=int, default=0, help="mock catalog seed, must match the server")
+    parser.add_argument("--no-gog", action="store_true",
+                        help="skip GOG-Games lookups, which need a Playwright browser")
+    parser.add_argument("--search-service", default="",
+                        help="resolve links through a running search_service.py, e.g. unix:data/search.sock")
+    parser.add_argument("--stall-ms", type=float, default=100.0,
+                        help="print the loop stack whenever it is blocked this long")
+    parser.add_argument("--guild-id", type=int, default=None,
+                        help="guild the fake interactions come from (default: none, as in a DM)")
+    parser.add_argument("--guild-regions", default="",
+                        help="region priority for --guild-id, e.g. Europe,USA (exercises guildRegionPriority)")
+    parser.add_argument("--quiet", action="store_true", help="suppress the bot's own logging")
+    parser.add_argument("--output", help="write the report as JSON to this file")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
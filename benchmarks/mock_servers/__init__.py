@@ -0,0 +1,18 @@
+# benchmarks/mock_servers/__init__.py
+"""Local stand-ins for the third-party sites the bot talks to.
+
+A single aiohttp application serves TheGamesDB's ``ByGameName``,
+``ByGameID`` and ``Images`` endpoints, RomsPure search pages, the
+gog-games.to search page and Myrient directory listings, all backed by one
+seeded synthetic :class:`~benchmarks.mock_servers.catalog.Catalog`. Latency
+and errors can be injected per provider.
+
+Run it with ``python -m benchmarks.mock_servers`` and point the bot at it
+through the ``*_BASE_URL`` environment variables it prints on startup.
+"""
+
+from benchmarks.mock_servers.app import build_app
+from benchmarks.mock_servers.catalog import Catalog
+from benchmarks.mock_servers.faults import FaultConfig
+
+__all__ = ["build_app", "Catalog", "FaultConfig"]
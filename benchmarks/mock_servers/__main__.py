@@ -0,0 +1,85 @@
+# benchmarks/mock_servers/__main__.py
+"""Run the mock servers: ``python -m benchmarks.mock_servers --port 8089``.
+
+Fault settings apply to every provider unless overridden per provider with
+``--set PROVIDER.FIELD=VALUE``, for example::
+
+    python -m benchmarks.mock_servers --latency-ms 40 \\
+        --set romspure.latency_ms=800 --set gog_games.error_rate=0.2
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(os.path.dirname(SCRIPT_DIR))
+sys.path.insert(0, ROOT_DIR)
+
+from aiohttp import web
+
+from benchmarks.mock_servers.app import PROVIDERS, build_app
+from benchmarks.mock_servers.catalog import Catalog, Recordings
+from benchmarks.mock_servers.faults import FaultConfig
+
+
+def _parse_overrides(values: list[str], default: FaultConfig) -> dict[str, FaultConfig]:
+    faults = {name: default.copy() for name in PROVIDERS}
+    for item in values:
+        key, _, raw = item.partition("=")
+        provider, _, field = key.partition(".")
+        if provider not in faults or field not in FaultConfig.FIELDS or not raw:
+            raise SystemExit(f"invalid --set value '{item}'")
+        setattr(faults[provider], field, float(raw))
+    return faults
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve mock TheGamesDB, RomsPure, GOG-Games and Myrient endpoints.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--games", type=int, default=5000, help="size of the synthetic catalog")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--hang-rate", type=float, default=0.0)
+    parser.add_argument("--set", action="append", default=[], metavar="PROVIDER.FIELD=VALUE",
+                        help=f"per-provider fault override; providers: {', '.join(PROVIDERS)}")
+    parser.add_argument("--recordings", help="JSON file of recorded responses to replay")
+    parser.add_argument("--monthly-allowance", type=int, default=6000,
+                        help="starting TheGamesDB remaining_monthly_allowance")
+    parser.add_argument("--write-myrient-index",
+                        help="write a Myrient index matching the catalog to this path and continue")
+    args = parser.parse_args()
+
+    default = FaultConfig(args.latency_ms, args.jitter_ms, args.error_rate, args.hang_rate)
+    faults = _parse_overrides(args.set, default)
+    catalog = Catalog(args.games, args.seed)
+    recordings = Recordings(args.recordings)
+
+    if args.write_myrient_index:
+        with open(args.write_myrient_index, "w", encoding="utf-8") as f:
+            for line in sorted(catalog.myrient_paths()):
+                f.write(line + "\n")
+        print(f"[mock] wrote Myrient index to {args.write_myrient_index}")
+
+    origin = f"http://{args.host}:{args.port}"
+    print("[mock] point the bot at this server with:")
+    print(f"  export THEGAMESDB_BASE_URL={origin}")
+    print(f"  export ROMSPURE_BASE_URL={origin}")
+    print(f"  export GOG_GAMES_BASE_URL={origin}")
+    print(f"  export MYRIENT_BASE_URL={origin}/files")
+    for name, fault in faults.items():
+        print(f"[mock] {name}: {fault}")
+    if len(recordings):
+        print(f"[mock] replaying {len(recordings)} recorded responses")
+
+    app = build_app(catalog, faults, recordings, monthly_allowance=args.monthly_allowance, seed=args.seed)
+    web.run_app(app, host=args.host, port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()
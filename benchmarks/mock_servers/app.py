@@ -0,0 +1,67 @@
+# benchmarks/mock_servers/app.py
+"""Assemble every mock provider into one aiohttp application."""
+
+from __future__ import annotations
+
+import json
+import random
+
+from aiohttp import web
+
+from benchmarks.mock_servers import gog_games, myrient, romspure, thegamesdb
+from benchmarks.mock_servers.catalog import Catalog, Recordings
+from benchmarks.mock_servers.faults import FaultConfig, with_faults
+
+PROVIDERS = (thegamesdb.PROVIDER, romspure.PROVIDER, gog_games.PROVIDER, myrient.PROVIDER)
+
+
+def build_app(
+    catalog: Catalog,
+    faults: dict[str, FaultConfig] | None = None,
+    recordings: Recordings | None = None,
+    myrient_paths: list[str] | None = None,
+    monthly_allowance: int = 6000,
+    seed: int = 0,
+) -> web.Application:
+    """Return an application serving all providers from ``catalog``.
+
+    ``faults`` maps provider names (see :data:`PROVIDERS`) to the latency and
+    error profile to apply. Requests matching an entry in ``recordings`` are
+    answered with the recorded response instead of synthetic data, after the
+    provider's faults have been applied.
+    """
+    faults = faults or {}
+    rng = random.Random(seed)
+    app = web.Application()
+
+    provider_routes = {
+        thegamesdb.PROVIDER: thegamesdb.routes(catalog, monthly_allowance),
+        romspure.PROVIDER: romspure.routes(catalog),
+        gog_games.PROVIDER: gog_games.routes(catalog),
+        myrient.PROVIDER: myrient.routes(
+            myrient_paths if myrient_paths is not None else catalog.myrient_paths()
+        ),
+    }
+
+    for provider, entries in provider_routes.items():
+        fault = faults.get(provider, FaultConfig())
+        for method, path, handler in entries:
+            if recordings:
+                handler = _replaying(handler, recordings)
+            app.router.add_route(method, path, with_faults(handler, fault, rng))
+
+    return app
+
+
+def _replaying(handler, recordings: Recordings):
+    async def wrapped(request: web.Request) -> web.StreamResponse:
+        hit = recordings.lookup(request.method, request.path, request.query.items())
+        if hit is None:
+            return await handler(request)
+        body = hit.get("body", "")
+        status = hit.get("status", 200)
+        if isinstance(body, (dict, list)):
+            return web.Response(text=json.dumps(body), status=status, content_type="application/json")
+        return web.Response(text=body, status=status, content_type=hit.get("content_type", "text/html"))
+
+    return wrapped
@@ -0,0 +1,116 @@
+# benchmarks/mock_servers/catalog.py
+"""Synthetic game catalog shared by all mock providers."""
+
+from __future__ import annotations
+
+import json
+import random
+import re
+import urllib.parse
+
+from benchmarks.synthetic import make_titles
+from scrapers.myrient import MYRIENT_PLATFORM_MAP
+from scrapers.platform_map import ROMSPURE_PLATFORM_MAP
+
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+
+
+def slugify(title: str) -> str:
+    return _SLUG_RE.sub("-", title.lower()).strip("-")
+
+
+class Catalog:
+    """A seeded set of games spread across the platforms the bot knows.
+
+    The same ``seed`` and ``games`` always produce the same catalog, so a load
+    driver can rebuild it to pick titles that exist on the mock servers.
+    """
+
+    def __init__(self, games: int = 5000, seed: int = 0) -> None:
+        rng = random.Random(seed)
+        names = set(ROMSPURE_PLATFORM_MAP) | {
+            name for name in MYRIENT_PLATFORM_MAP if not name.startswith("DOS")
+        }
+        self.platforms: dict[int, str] = {
+            idx: name for idx, name in enumerate(sorted(names), start=1)
+        }
+        self.games: dict[int, dict] = {}
+        for game_id, title in enumerate(make_titles(games, seed), start=1):
+            platform_id = rng.choice(list(self.platforms))
+            year = rng.randint(1980, 2015)
+            self.games[game_id] = {
+                "id": game_id,
+                "game_title": title,
+                "release_date": f"{year}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                "platform": platform_id,
+                "overview": f"<p>{title} is a synthetic game used for load testing.</p>",
+                "rating": rng.choice(["E - Everyone", "T - Teen", "M - Mature", "Not Rated"]),
+            }
+        self._by_word: dict[str, set[int]] = {}
+        for game_id, game in self.games.items():
+            for word in game["game_title"].lower().split():
+                self._by_word.setdefault(word, set()).add(game_id)
+
+    @property
+    def titles(self) -> list[str]:
+        return [g["game_title"] for g in self.games.values()]
+
+    def platform_name(self, game: dict) -> str:
+        return self.platforms[game["platform"]]
+
+    def search(self, query: str, platform: str | None = None, limit: int = 20) -> list[dict]:
+        """Return games whose title contains every word of ``query``."""
+        words = query.lower().split()
+        if not words:
+            return []
+        ids: set[int] | None = None
+        for word in words:
+            matches = self._by_word.get(word, set())
+            ids = matches if ids is None else ids & matches
+            if not ids:
+                return []
+        games = [self.games[i] for i in sorted(ids or ())]
+        if platform is not None:
+            games = [g for g in games if self.platform_name(g) == platform]
+        return games[:limit]
+
+    def myrient_paths(self) -> list[str]:
+        """Return Myrient index lines for every game on a mapped platform."""
+        paths = []
+        for game in self.games.values():
+            directory = MYRIENT_PLATFORM_MAP.get(self.platform_name(game))
+            if directory:
+                paths.append(f"{directory}/{game['game_title']} (USA).zip")
+        return paths
+
+
+class Recordings:
+    """Recorded responses keyed by method, path and query string.
+
+    The file is a JSON object mapping ``"GET /v1/Games/ByGameID?id=1"`` style
+    keys to ``{"status": int, "body": str | object}``. Query parameters are
+    sorted and ``apikey`` is ignored when building keys, so recordings made
+    with a real key replay against any key.
+    """
+
+    def __init__(self, path: str | None = None) -> None:
+        self._responses: dict[str, dict] = {}
+        if path:
+            with open(path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+            for key, value in raw.items():
+                method, _, target = key.partition(" ")
+                parsed = urllib.parse.urlsplit(target)
+                query = urllib.parse.parse_qsl(parsed.query, keep_blank_values=True)
+                self._responses[self.key(method, parsed.path, query)] = value
+
+    @staticmethod
+    def key(method: str, path: str, query) -> str:
+        params = sorted((k, v) for k, v in query if k != "apikey")
+        return f"{method.upper()} {path}?{urllib.parse.urlencode(params)}"
+
+    def lookup(self, method: str, path: str, query) -> dict | None:
+        return self._responses.get(self.key(method, path, query))
+
+    def __len__(self) -> int:
+        return len(self._responses)
@@ -0,0 +1,61 @@
+# benchmarks/mock_servers/faults.py
+"""Latency and error injection for the mock servers."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+
+from aiohttp import web
+
+
+class FaultConfig:
+    """Describe how slow and how unreliable one provider should be.
+
+    ``latency_ms`` is added to every response, plus a uniformly distributed
+    ``jitter_ms``. A fraction ``error_rate`` of requests fail with HTTP 503
+    and a fraction ``hang_rate`` never answer within ``hang_s`` seconds,
+    which is how a stuck upstream looks to the bot.
+    """
+
+    FIELDS = ("latency_ms", "jitter_ms", "error_rate", "hang_rate", "hang_s")
+
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        hang_rate: float = 0.0,
+        hang_s: float = 60.0,
+    ) -> None:
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.hang_rate = hang_rate
+        self.hang_s = hang_s
+
+    def copy(self, **changes: float) -> "FaultConfig":
+        values = {name: getattr(self, name) for name in self.FIELDS}
+        values.update(changes)
+        return FaultConfig(**values)
+
+    def __repr__(self) -> str:
+        inner = ", ".join(f"{name}={getattr(self, name)}" for name in self.FIELDS)
+        return f"FaultConfig({inner})"
+
+
+def with_faults(handler, faults: FaultConfig, rng: random.Random):
+    """Wrap an aiohttp ``handler`` so it honours ``faults``."""
+
+    async def wrapped(request: web.Request) -> web.StreamResponse:
+        delay = faults.latency_ms + rng.uniform(0, faults.jitter_ms)
+        if delay:
+            await asyncio.sleep(delay / 1000)
+        roll = rng.random()
+        if roll < faults.hang_rate:
+            await asyncio.sleep(faults.hang_s)
+        elif roll < faults.hang_rate + faults.error_rate:
+            return web.Response(status=503, text="injected failure")
+        return await handler(request)
+
+    return wrapped
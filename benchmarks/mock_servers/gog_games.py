@@ -0,0 +1,39 @@
+# benchmarks/mock_servers/gog_games.py
+"""Mock of the gog-games.to search page.
+
+The real page is rendered client-side; this mock returns the final markup
+directly, which Playwright loads just the same.
+"""
+
+from __future__ import annotations
+
+import html
+
+from aiohttp import web
+
+from benchmarks.mock_servers.catalog import Catalog, slugify
+
+PROVIDER = "gog_games"
+
+
+def routes(catalog: Catalog) -> list[tuple[str, str, object]]:
+
+    async def search(request: web.Request) -> web.Response:
+        query = request.query.get("search", "")
+        cards = []
+        for game in catalog.search(query, "PC") if query else []:
+            cards.append(
+                f'<a class="jsx-3307928730 card" href="/game/{slugify(game["game_title"])}">'
+                '<div class="jsx-3307928730 title">'
+                f"<span>{html.escape(game['game_title'])}</span></div></a>"
+            )
+        page = "<html><body>" + "".join(cards) + "</body></html>"
+        return web.Response(text=page, content_type="text/html")
+
+    async def detail(request: web.Request) -> web.Response:
+        return web.Response(text="<html><body>Game detail</body></html>", content_type="text/html")
+
+    return [
+        ("GET", "/", search),
+        ("GET", "/game/{slug}", detail),
+    ]
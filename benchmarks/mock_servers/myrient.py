@@ -0,0 +1,53 @@
+# benchmarks/mock_servers/myrient.py
+"""Mock of the Myrient open directory listings under ``/files``."""
+
+from __future__ import annotations
+
+import html
+import urllib.parse
+
+from aiohttp import web
+
+PROVIDER = "myrient"
+
+
+def _build_tree(paths: list[str]) -> dict[str, tuple[set[str], set[str]]]:
+    """Return ``{directory: (subdirs, files)}`` with ``""`` as the root."""
+    tree: dict[str, tuple[set[str], set[str]]] = {"": (set(), set())}
+    for path in paths:
+        parts = path.split("/")
+        current = ""
+        for part in parts[:-1]:
+            tree.setdefault(current, (set(), set()))[0].add(part)
+            current = f"{current}{part}/"
+        tree.setdefault(current, (set(), set()))[1].add(parts[-1])
+    return tree
+
+
+def routes(paths: list[str]) -> list[tuple[str, str, object]]:
+    tree = _build_tree(paths)
+
+    async def listing(request: web.Request) -> web.Response:
+        rel = request.match_info["tail"]
+        if rel and not rel.endswith("/"):
+            # A file download; the content does not matter for load tests
+            parent, _, name = rel.rpartition("/")
+            parent = f"{parent}/" if parent else ""
+            if name in tree.get(parent, (set(), set()))[1]:
+                return web.Response(body=b"\0" * 16, content_type="application/octet-stream")
+            return web.Response(status=404, text="Not Found")
+        entry = tree.get(rel)
+        if entry is None:
+            return web.Response(status=404, text="Not Found")
+        subdirs, files = entry
+        rows = ['<tr><td><a href="../">Parent directory/</a></td></tr>']
+        for name in sorted(subdirs):
+            href = urllib.parse.quote(name) + "/"
+            rows.append(f'<tr><td><a href="{href}">{html.escape(name)}/</a></td></tr>')
+        for name in sorted(files):
+            href = urllib.parse.quote(name)
+            rows.append(f'<tr><td><a href="{href}">{html.escape(name)}</a></td></tr>')
+        page = '<html><body><table id="list"><tbody>' + "".join(rows) + "</tbody></table></body></html>"
+        return web.Response(text=page, content_type="text/html")
+
+    return [("GET", "/files/{tail:.*}", listing)]
@@ -0,0 +1,44 @@
+# benchmarks/mock_servers/romspure.py
+"""Mock of the RomsPure per-platform search pages."""
+
+from __future__ import annotations
+
+import html
+
+from aiohttp import web
+
+from benchmarks.mock_servers.catalog import Catalog, slugify
+from scrapers.platform_map import ROMSPURE_PLATFORM_MAP
+
+PROVIDER = "romspure"
+
+
+def routes(catalog: Catalog) -> list[tuple[str, str, object]]:
+    by_subpath: dict[str, str] = {}
+    for name, subpath in ROMSPURE_PLATFORM_MAP.items():
+        by_subpath.setdefault(subpath, name)
+
+    async def search(request: web.Request) -> web.Response:
+        subpath = request.match_info["subpath"]
+        platform = by_subpath.get(subpath)
+        if platform is None:
+            return web.Response(status=404, text="Not Found")
+        origin = f"{request.scheme}://{request.host}"
+        items = []
+        for game in catalog.search(request.query.get("keywords", ""), platform):
+            href = f"{origin}/roms/{subpath}/{slugify(game['game_title'])}"
+            items.append(
+                '<div class="col-archive-item">'
+                f'<a href="{href}"><h3 class="h6 font-weight-semibold">'
+                f"{html.escape(game['game_title'])}</h3></a></div>"
+            )
+        page = "<html><body><div class=\"row\">" + "".join(items) + "</div></body></html>"
+        return web.Response(text=page, content_type="text/html")
+
+    async def detail(request: web.Request) -> web.Response:
+        return web.Response(text="<html><body>ROM detail</body></html>", content_type="text/html")
+
+    return [
+        ("GET", "/roms/{subpath}", search),
+        ("GET", "/roms/{subpath}/{slug}", detail),
+    ]
@@ -0,0 +1,92 @@
+# benchmarks/mock_servers/thegamesdb.py
+"""Mock of the TheGamesDB ``/v1/Games`` endpoints used by the bot."""
+
+from __future__ import annotations
+
+from aiohttp import web
+
+from benchmarks.mock_servers.catalog import Catalog, slugify
+
+PROVIDER = "thegamesdb"
+
+
+class _Allowance:
+    """Mimic the per-key monthly quota fields TheGamesDB returns."""
+
+    def __init__(self, monthly: int) -> None:
+        self.remaining = monthly
+
+    def fields(self) -> dict:
+        self.remaining = max(0, self.remaining - 1)
+        return {
+            "remaining_monthly_allowance": self.remaining,
+            "extra_allowance": 0,
+            "allowance_refresh_timer": 2592000,
+        }
+
+
+def _ids(raw: str) -> list[int]:
+    return [int(part) for part in raw.split(",") if part.strip().isdigit()]
+
+
+def routes(catalog: Catalog, monthly_allowance: int = 6000) -> list[tuple[str, str, object]]:
+    allowance = _Allowance(monthly_allowance)
+
+    def platform_include(games: list[dict]) -> dict:
+        data = {}
+        for g in games:
+            pid = g["platform"]
+            data[str(pid)] = {"id": pid, "name": catalog.platforms[pid], "alias": slugify(catalog.platforms[pid])}
+        return {"platform": {"data": data}}
+
+    def envelope(payload: dict, include: dict | None = None) -> web.Response:
+        body = {"code": 200, "status": "Success", "data": payload}
+        if include is not None:
+            body["include"] = include
+        body.update(allowance.fields())
+        return web.json_response(body)
+
+    async def by_game_name(request: web.Request) -> web.Response:
+        games = catalog.search(request.query.get("name", ""))
+        return envelope({"count": len(games), "games": games})
+
+    async def by_game_id(request: web.Request) -> web.Response:
+        games = [catalog.games[i] for i in _ids(request.query.get("id", "")) if i in catalog.games]
+        include = platform_include(games) if "platform" in request.query.get("include", "") else {}
+        return envelope({"count": len(games), "games": games}, include)
+
+    async def images(request: web.Request) -> web.Response:
+        origin = f"{request.scheme}://{request.host}"
+        images = {}
+        for game_id in _ids(request.query.get("games_id", "")):
+            game = catalog.games.get(game_id)
+            if game is None:
+                continue
+            slug = slugify(game["game_title"])
+            arr = [{"id": game_id * 10, "type": "boxart", "side": "front",
+                    "filename": f"boxart/front/{slug}-1.jpg"}]
+            # Only some games have a clear logo, like on the real site
+            if game_id % 3 == 0:
+                arr.append({"id": game_id * 10 + 1, "type": "clearlogo",
+                            "filename": f"clearlogo/{slug}.png"})
+            images[str(game_id)] = arr
+        base_url = {"original": f"{origin}/cdn/images/original/"}
+        return envelope({"count": len(images), "base_url": base_url, "images": images})
+
+    async def platforms(request: web.Request) -> web.Response:
+        data = {
+            str(pid): {"id": pid, "name": name, "alias": slugify(name)}
+            for pid, name in catalog.platforms.items()
+        }
+        return envelope({"count": len(data), "platforms": data})
+
+    async def cdn(request: web.Request) -> web.Response:
+        return web.Response(body=b"\x89PNG\r\n\x1a\n", content_type="image/png")
+
+    return [
+        ("GET", "/v1/Games/ByGameName", by_game_name),
+        ("GET", "/v1/Games/ByGameID", by_game_id),
+        ("GET", "/v1/Games/Images", images),
+        ("GET", "/v1/Platforms", platforms),
+        ("GET", "/cdn/images/original/{tail:.*}", cdn),
+    ]
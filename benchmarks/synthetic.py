@@ -0,0 +1,108 @@
+# benchmarks/synthetic.py
+"""Generate synthetic Myrient and EmulatorJS indexes for benchmarking.
+
+Everything is driven by a seeded :class:`random.Random` so the same arguments
+always produce the same files, which keeps results comparable across commits.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+
+from scrapers.myrient import MYRIENT_PLATFORM_MAP
+from scrapers.emulatorjs import EMULATORJS_PLATFORM_MAP
+
+_WORDS = [
+    "Super", "Mega", "Ultra", "Final", "Dragon", "Quest", "Fantasy", "Legend",
+    "Star", "Wars", "Racing", "Kart", "Soccer", "Tennis", "Golf", "Fighter",
+    "Street", "Mortal", "Kombat", "Metal", "Gear", "Solid", "Sonic", "Mario",
+    "Zelda", "Castle", "Vania", "Blaster", "Master", "Shadow", "Knight",
+    "Ninja", "Turtles", "Space", "Invaders", "Hero", "Rally", "Tactics",
+    "Chronicles", "Adventure", "Island", "World", "Kingdom", "Hearts", "Crash",
+    "Spyro", "Tomb", "Raider", "Resident", "Evil", "Silent", "Hill", "Crystal",
+]
+_REGIONS = ["USA", "Europe", "Japan", "USA, Europe", "Germany", "France", "World"]
+_EXTRA_TAGS = ["", "", "", "", " (Rev 1)", " (Demo)", " (Beta)", " (En,Fr,De)"]
+
+
+def make_titles(count: int, seed: int = 0) -> list[str]:
+    """Return ``count`` pseudo-random, mostly unique game titles."""
+    rng = random.Random(seed)
+    titles = []
+    for i in range(count):
+        words = rng.sample(_WORDS, rng.randint(2, 4))
+        title = " ".join(words)
+        if rng.random() < 0.3:
+            title += f" {rng.randint(2, 5)}"
+        # Suffix keeps titles unique once the word combinations run out
+        if i >= len(_WORDS) ** 2:
+            title += f" {i}"
+        titles.append(title)
+    return titles
+
+
+def myrient_paths(count: int, seed: int = 0) -> list[str]:
+    """Return ``count`` index lines spread across every Myrient platform directory."""
+    rng = random.Random(seed)
+    dirs = sorted(set(MYRIENT_PLATFORM_MAP.values()))
+    titles = make_titles(max(1, count // 3), seed)
+    paths: list[str] = []
+    while len(paths) < count:
+        title = rng.choice(titles)
+        directory = rng.choice(dirs)
+        region = rng.choice(_REGIONS)
+        tag = rng.choice(_EXTRA_TAGS)
+        if directory.startswith("Redump/") and rng.random() < 0.15:
+            total = rng.randint(2, 4)
+            for disc in range(1, total + 1):
+                paths.append(f"{directory}/{title} ({region}) (Disc {disc}){tag}.zip")
+        else:
+            paths.append(f"{directory}/{title} ({region}){tag}.zip")
+    return paths[:count]
+
+
+def write_myrient_index(path: str, count: int, seed: int = 0) -> None:
+    """Write a sorted synthetic Myrient index with ``count`` lines to ``path``."""
+    with open(path, "w", encoding="utf-8") as f:
+        for line in sorted(myrient_paths(count, seed)):
+            f.write(line + "\n")
+
+
+def emulatorjs_index(per_system: int, seed: int = 0) -> dict[str, list[str]]:
+    """Return a synthetic EmulatorJS index with ``per_system`` titles per code."""
+    rng = random.Random(seed)
+    codes = sorted(set(EMULATORJS_PLATFORM_MAP.values()))
+    titles = make_titles(per_system * 2, seed)
+    return {
+        code: [f"{t} ({rng.choice(_REGIONS)})" for t in rng.sample(titles, per_system)]
+        for code in codes
+    }
+
+
+def write_emulatorjs_index(path: str, per_system: int, seed: int = 0) -> None:
+    """Write a synthetic EmulatorJS index to ``path``."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(emulatorjs_index(per_system, seed), f)
+
+
+def make_queries(count: int, seed: int = 0) -> list[tuple[str, str]]:
+    """Return ``(title, platform)`` queries mixing hits, typos and misses."""
+    rng = random.Random(seed + 1)
+    platforms = sorted(
+        name for name in MYRIENT_PLATFORM_MAP
+        if name not in {"PC", "DOS"} and not name.startswith("DOS ")
+    )
+    titles = make_titles(200, seed)
+    queries = []
+    for i in range(count):
+        title = rng.choice(titles)
+        kind = i % 4
+        if kind == 1 and len(title) > 4:
+            # Drop a character to simulate a typo
+            pos = rng.randrange(len(title))
+            title = title[:pos] + title[pos + 1:]
+        elif kind == 3:
+            title = "Nonexistent " + title
+        queries.append((title, rng.choice(platforms)))
+    return queries
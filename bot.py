@@ -1,219 +1,296 @@
 import os
 import json
+import asyncio
+import collections
+import functools
+import urllib.parse
 import discord
 from discord.ext import commands
 from discord import app_commands, Interaction
-import aiohttp
-from bs4 import BeautifulSoup
 
 # Import your scraper functions:
-from scrapers.gog_games import get_gog_download_links
-from scrapers.romspure import get_romspure_download_links
-from scrapers.myrient import get_myrient_download_links
 import scrapers.emulatorjs as emulatorjs
-from scrapers.emulatorjs import get_emulatorjs_play_url
+import scrapers.memory as memory
+import scrapers.shared_cache as shared_cache
+import scrapers.thegamesdb as thegamesdb
+import scrapers.tgdb_mirror as tgdb_mirror
+import scrapers.title_index as title_index
+from loop_monitor import monitor as loop_monitor
+from prefetch import Prefetcher
+from scrapers.platform_map import resolve_platform
+from scrapers.rate_limit import DROPDOWN, INTERACTIVE, Ticket
+from scrapers.thegamesdb import (
+    search_by_name,
+    fetch_for_dropdown,
+    get_full_details,
+    fetch_images,
+    fetch_images_batch,
+)
 
 script_dir = os.path.dirname(os.path.abspath(__file__))
-config_path = os.path.join(script_dir, "config.json")
+# LETMEPLAYTHIS_CONFIG lets tooling such as the load driver supply its own config
+config_path = os.environ.get("LETMEPLAYTHIS_CONFIG") or os.path.join(script_dir, "config.json")
 
 with open(config_path, "r") as f:
     config = json.load(f)
 
+if config.get("traceMemory", False):
+    # Started before the indexes load so !memory can show where memory went
+    import tracemalloc
+
+    tracemalloc.start()
+# Byte budgets for the in-memory caches, in MiB by name as shown by !memory
+memory.set_budgets(config.get("cacheBudgetsMb", {}))
+
 TOKEN = config["token"]
 GUILD_ID = int(config["guildId"])
 GUILD = discord.Object(id=GUILD_ID)
 
 THEGAMESDB_API_KEY = config["theGamesDbApiKey"]
+thegamesdb.set_api_key(THEGAMESDB_API_KEY)
+thegamesdb.set_base_url(config.get("theGamesDbBaseUrl", "").strip() or None)
+if "theGamesDbMirrorPath" in config:
+    # Blank disables the mirror; otherwise the path of the SQLite file
+    mirror_path = config["theGamesDbMirrorPath"].strip()
+    tgdb_mirror.set_path(os.path.join(script_dir, mirror_path) if mirror_path else None)
+if "cachePath" in config:
+    # Blank disables the shared response/link cache
+    cache_path = config["cachePath"].strip()
+    shared_cache.set_path(os.path.join(script_dir, cache_path) if cache_path else None)
+
+# Set by scripts/run_sharded.py: the shards this process runs, the total shard
+# count and the number of bot processes sharing the API key
+SHARD_IDS = [int(s) for s in os.environ.get("LETMEPLAYTHIS_SHARD_IDS", "").split(",") if s.strip()]
+SHARD_COUNT = int(os.environ.get("LETMEPLAYTHIS_SHARD_COUNT", 0)) or None
+PROCESS_COUNT = max(1, int(os.environ.get("LETMEPLAYTHIS_PROCESS_COUNT", 1)))
+
+# Each process gets an equal share of the TheGamesDB request rate
+thegamesdb.scheduler.configure(
+    rate=float(config.get("theGamesDbRatePerSecond", 5)) / PROCESS_COUNT,
+    burst=max(1, int(config.get("theGamesDbBurst", 10)) // PROCESS_COUNT),
+    reserve=int(config.get("theGamesDbQuotaReserve", 300)),
+)
 PREFIX = config["prefix"]
 EMULATORJS_BASE_URL = config.get("emulatorJsBaseUrl", "").strip() or None
 emulatorjs.set_base_url(EMULATORJS_BASE_URL)
 
+LOOP_MONITOR_ENABLED = bool(config.get("loopMonitor", False))
+loop_monitor.threshold = float(config.get("loopLagThresholdMs", 250)) / 1000
+
+# Resolve download links in a separate search_service.py process if set,
+# e.g. "unix:data/search.sock"; blank resolves them in this process
+SEARCH_SERVICE_URL = config.get("searchServiceUrl", "").strip()
+link_service = None
+if SEARCH_SERVICE_URL:
+    # search_service pulls in aiohttp's server side; only load it when used
+    from search_service import LinkServiceClient
+
+    link_service = LinkServiceClient(SEARCH_SERVICE_URL)
+
+# Number of dropdown options resolved speculatively; 0 disables prefetching
+PREFETCH_TOP_N = int(config.get("prefetchTopN", 3))
+
+# Preferred release regions for direct downloads, e.g. ["Europe", "USA"];
+# guildRegionPriority overrides it for single servers, keyed by guild id
+REGION_PRIORITY = config.get("regionPriority") or None
+GUILD_REGION_PRIORITY = {
+    int(guild_id): regions for guild_id, regions in config.get("guildRegionPriority", {}).items()
+}
+
+
+def region_priority(guild_id: int | None) -> list[str] | None:
+    """Return the region preference for a server, or ``None`` for the providers' default."""
+    return GUILD_REGION_PRIORITY.get(guild_id, REGION_PRIORITY)
+
 intents = discord.Intents.default()
 intents.message_content = True
 
-bot = commands.Bot(command_prefix=PREFIX, intents=intents)
-
-# -------------------------------------------------------------------------
-# Basic GET helper for TheGamesDB calls
-# -------------------------------------------------------------------------
-async def fetch_json(url: str) -> dict:
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url) as resp:
-            print(f"DEBUG fetch_json GET {resp.url} => {resp.status}")
-            if resp.status != 200:
-                text = await resp.text()
-                print("DEBUG response text:", text)
-                raise RuntimeError(f"HTTP {resp.status} from TheGamesDB")
-            return await resp.json()
+if SHARD_IDS and SHARD_COUNT:
+    bot = commands.AutoShardedBot(
+        command_prefix=PREFIX, intents=intents, shard_ids=SHARD_IDS, shard_count=SHARD_COUNT
+    )
+else:
+    bot = commands.Bot(command_prefix=PREFIX, intents=intents)
 
 # -------------------------------------------------------------------------
 # Utility to clean HTML from descriptions
 # -------------------------------------------------------------------------
 def clean_text(raw_text: str) -> str:
+    from bs4 import BeautifulSoup  # Loaded on the first game shown, not at startup
+
     return BeautifulSoup(raw_text, "html.parser").get_text(separator=" ").strip()
 
+@bot.event
+async def on_ready():
+    if LOOP_MONITOR_ENABLED:
+        loop_monitor.start()
+    if not len(title_index.index):
+        # Building reads the local indexes; keep it off the event loop
+        asyncio.get_running_loop().run_in_executor(None, title_index.build_default)
+    if not SHARD_IDS or 0 in SHARD_IDS:
+        # Commands are global; one process syncing them is enough
+        await bot.tree.sync()
+    shards = f" (shards {','.join(map(str, SHARD_IDS))} of {SHARD_COUNT})" if SHARD_IDS else ""
+    print(f"Logged in as {bot.user}{shards}")
+
 # -------------------------------------------------------------------------
-# 1) ByGameName search with TheGamesDB
+# !lag owner-only command reporting event-loop lag
 # -------------------------------------------------------------------------
-async def search_by_name(title: str) -> list:
-    base_url = "https://api.thegamesdb.net/v1/Games/ByGameName"
-    fields = "platform,rating"
-    url = (
-        f"{base_url}?apikey={THEGAMESDB_API_KEY}"
-        f"&name={title}"
-        f"&fields={fields}"
+@bot.command(name="lag")
+@commands.is_owner()
+async def lag_command(ctx: commands.Context):
+    if not loop_monitor.running:
+        await ctx.send("Loop monitor is disabled. Set `loopMonitor` to true in config.json.")
+        return
+    stats = loop_monitor.stats()
+    await ctx.send(
+        f"Event-loop lag: last {stats['last_ms']}ms, p50 {stats['p50_ms']}ms, "
+        f"p99 {stats['p99_ms']}ms, max {stats['max_ms']}ms, "
+        f"{stats['stalls']} stalls over {loop_monitor.threshold * 1000:.0f}ms"
     )
-    data = await fetch_json(url)
-    return data.get("data", {}).get("games", [])
 
 # -------------------------------------------------------------------------
-# 2) Minimal ByGameID to get platform + release_date for dropdown label
+# !memory owner-only command reporting resident indexes and caches
 # -------------------------------------------------------------------------
-async def fetch_for_dropdown(game_id: int) -> dict:
-    base = "https://api.thegamesdb.net/v1/Games/ByGameID"
-    fields = "platform,overview,rating"
-    includes = "platform"
-
-    url = (
-        f"{base}?apikey={THEGAMESDB_API_KEY}"
-        f"&id={game_id}"
-        f"&fields={fields}"
-        f"&include={includes}"
-    )
-    data = await fetch_json(url)
-    games_list = data.get("data", {}).get("games", [])
-    if not games_list:
-        return {"title": "", "year": "????", "platform_name": "Unknown"}
-
-    g_info = games_list[0]
-    game_title = g_info.get("game_title", "Unknown Title")
-    rdate = g_info.get("release_date", "")
-    year_str = rdate[:4] if rdate else "????"
-
-    incl = data.get("include", {})
-    p_data = incl.get("platform", {}).get("data", {})
-    p_val = g_info.get("platform")
-    p_str = "Unknown"
-    if p_val is not None:
-        spv = str(p_val)
-        if spv in p_data:
-            p_str = p_data[spv].get("name", "Unknown")
-
-    return {
-        "title": game_title,
-        "year": year_str,
-        "platform_name": p_str
-    }
+@bot.command(name="memory")
+@commands.is_owner()
+async def memory_command(ctx: commands.Context):
+    # Walking the indexes takes a moment; keep it off the event loop
+    data = await asyncio.get_running_loop().run_in_executor(None, memory.report, 5)
+    await ctx.send(f"```\n{memory.format_report(data)[:1900]}\n```")
 
 # -------------------------------------------------------------------------
-# 3) Full ByGameID for final embed details
+# Download links, from the search service when one is configured
 # -------------------------------------------------------------------------
-async def get_full_details(game_id: int) -> dict:
-    base = "https://api.thegamesdb.net/v1/Games/ByGameID"
-    fields = "platform,overview,rating"
-    includes = "platform"
-
-    url = (
-        f"{base}?apikey={THEGAMESDB_API_KEY}"
-        f"&id={game_id}"
-        f"&fields={fields}"
-        f"&include={includes}"
-    )
-    data = await fetch_json(url)
-    games_list = data.get("data", {}).get("games", [])
-    if not games_list:
-        return {}
-
-    g_info = games_list[0]
-    result = {}
-    result["title"] = g_info.get("game_title", "Unknown Title")
-    rdate = g_info.get("release_date", "")
-    result["release_date"] = rdate if rdate else "Unknown"
-    result["overview"] = g_info.get("overview", "")
-    result["rating"] = g_info.get("rating", "N/A")
-
-    incl = data.get("include", {})
-    p_data = incl.get("platform", {}).get("data", {})
-    p_val = g_info.get("platform")
-    plat_str = "Unknown"
-    if p_val is not None:
-        spv = str(p_val)
-        if spv in p_data:
-            plat_str = p_data[spv].get("name", "Unknown")
-    result["platform"] = plat_str
-
-    return result
+async def find_download_links(
+    title: str, platform: str, regions: list[str] | None = None
+) -> list[tuple[str, str, int | None]]:
+    if link_service is not None:
+        from search_service import ServiceUnavailable
+
+        try:
+            return await link_service.get_all_download_links(title, platform, regions)
+        except ServiceUnavailable as e:
+            print(f"[search_service] {e}; resolving links in-process")
+    # The providers are only loaded once this process resolves links itself
+    from scrapers.aggregator import get_all_download_links
+
+    return await get_all_download_links(title, platform, regions=regions)
 
 # -------------------------------------------------------------------------
-# 4) /v1/Games/Images for clearlogo/boxart from TheGamesDB
+# Resolve a selected game: full details, image and download links
 # -------------------------------------------------------------------------
-async def fetch_images(game_id: int) -> str:
-    base_url = "https://api.thegamesdb.net/v1/Games/Images"
-    filter_types = "clearlogo,boxart"
-    url = (
-        f"{base_url}?apikey={THEGAMESDB_API_KEY}"
-        f"&games_id={game_id}"
-        f"&filter%5Btype%5D={filter_types}"
-    )
-    data = await fetch_json(url)
+async def resolve_game(
+    game_id: int, priority: int | Ticket = INTERACTIVE, regions: list[str] | None = None
+) -> tuple[dict, str, list] | None:
+    """Return ``(details, image_url, download_links)`` or ``None`` if unknown.
 
-    data_obj = data.get("data", {})
-    base_original = data_obj.get("base_url", {}).get("original", "https://cdn.thegamesdb.net/images/original/")
-    images_dict = data_obj.get("images", {})
+    ``regions`` is the preferred order of release regions for the links.
+    """
+    # 1) Fetch images (clearlogo or boxart) while the details load
+    images = asyncio.ensure_future(fetch_images(game_id, priority))
+    images.add_done_callback(lambda t: t.cancelled() or t.exception())
+    try:
+        # 2) Retrieve full details from TheGamesDB
+        details = await get_full_details(game_id, priority)
+        if not details:
+            return None
+
+        # 3) Aggregator: Get download links from various sources
+        dl_links = await find_download_links(details["title"], details["platform"], regions)
+        img_url = await images
+    finally:
+        images.cancel()  # No-op once it has finished
+    return details, img_url, dl_links
+
+def _field_value(lines: list[str], limit: int = 1024) -> str:
+    """Join ``lines`` into an embed field value, dropping what does not fit."""
+    value = ""
+    for i, line in enumerate(lines):
+        more = f"\n...and {len(lines) - i} more"
+        if len(value) + len(line) + 1 + len(more) > limit:
+            return value + more
+        value = f"{value}\n{line}" if value else line
+    return value
+
+def build_embed(details: dict, img_url: str, dl_links: list) -> discord.Embed:
+    title_text = details["title"]
+    overview = clean_text(details["overview"] or "No overview.")
+    release_date = details["release_date"]
+    rating = details["rating"]
+    platform_str = details["platform"]
+
+    embed = discord.Embed(
+        title=title_text,
+        description=overview[:500] + ("..." if len(overview) > 500 else ""),
+        color=discord.Color.blue()
+    )
+    embed.add_field(name="Platform", value=platform_str, inline=True)
+    embed.add_field(name="Release Date", value=release_date, inline=True)
+    embed.add_field(name="Rating", value=str(rating), inline=True)
 
-    arr = images_dict.get(str(game_id), [])
-    if not arr:
-        return ""
+    if img_url:
+        embed.set_thumbnail(url=img_url)
+    else:
+        embed.set_footer(text="No image found for this game.")
 
-    clearlogo_obj = next((img for img in arr if img.get("type") == "clearlogo"), None)
-    if clearlogo_obj:
-        filename = clearlogo_obj["filename"]
-        return base_original + filename
+    site_lines: list[str] = []
+    direct_lines: list[str] = []
+    play_now_lines: list[str] = []
 
-    boxarts = [img for img in arr if img.get("type") == "boxart"]
-    if boxarts:
-        filename = boxarts[0]["filename"]
-        return base_original + filename
+    # A release may have several files per disc, e.g. a cue sheet and its tracks
+    myrient_files = collections.Counter(disc for source, _, disc in dl_links if source == "Myrient")
 
-    return ""
+    for source, url, disc in dl_links:
+        if source == "Myrient":
+            disc_label = f" (Disc {disc})" if disc is not None else ""
+            if myrient_files[disc] > 1:
+                file_name = urllib.parse.unquote(url.rsplit("/", 1)[-1])
+                title_str = f"Direct Download {file_name} from myrient.erista.me"
+            else:
+                title_str = f"Direct Download {title_text}{disc_label} from myrient.erista.me"
+            direct_lines.append(f"[{title_str}]({url})")
+        elif source == "PlayNow":
+            play_now_lines.append(
+                f"[Play {title_text} at {emulatorjs.BASE_DOMAIN}]({url})"
+            )
+        elif source == "RomsPure":
+            site_lines.append(f"[{title_text} at romspure.cc]({url})")
+        else:
+            site_lines.append(f"[{title_text} at {source}]({url})")
 
-# -------------------------------------------------------------------------
-# Aggregator for download links (GOG + Romspure)
-# Returns a list of tuples: (source, URL)
-# -------------------------------------------------------------------------
-async def get_all_download_links(game_title: str, platform_name: str) -> list[tuple[str, str, int | None]]:
-    """Aggregate download links from various sources.
+    if site_lines:
+        embed.add_field(
+            name="Download Sites",
+            value=_field_value(site_lines),
+            inline=False,
+        )
 
-    Each returned tuple contains ``(source, url, disc_number)`` where
-    ``disc_number`` will be ``None`` for single-disc games.
-    """
-    links: list[tuple[str, str, int | None]] = []
+    if direct_lines:
+        embed.add_field(
+            name="Direct Downloads",
+            value=_field_value(direct_lines),
+            inline=False,
+        )
 
-    # For PC games (including DOS), only query GOG-Games.
-    if platform_name.lower() in {"pc", "dos"}:
-        gog_links = await get_gog_download_links(game_title)
-        for url in gog_links:
-            links.append(("GOG-Games", url, None))
-    else:
-        # For non-PC platforms query both Romspure and Myrient.
-        roms_links = await get_romspure_download_links(game_title, platform_name)
-        for url in roms_links:
-            links.append(("RomsPure", url, None))
+    if play_now_lines:
+        embed.add_field(
+            name="Play Now",
+            value=_field_value(play_now_lines),
+            inline=False,
+        )
 
-        myrient_links = await get_myrient_download_links(game_title, platform_name)
-        for url, disc in myrient_links:
-            links.append(("Myrient", url, disc))
+    return embed
 
-        play_url = await get_emulatorjs_play_url(game_title, platform_name)
-        if play_url:
-            links.append(("PlayNow", play_url, None))
+class PlayView(discord.ui.View):
+    """Select-menu view that drops speculative prefetches when it times out."""
 
-    return links
+    def __init__(self, prefetcher: Prefetcher):
+        super().__init__()
+        self.prefetcher = prefetcher
 
-@bot.event
-async def on_ready():
-    await bot.tree.sync()
-    print(f"Logged in as {bot.user}")
+    async def on_timeout(self):
+        self.prefetcher.cancel()
 
 # -------------------------------------------------------------------------
 # /play slash command
@@ -225,9 +302,10 @@ async def play_command(interaction: Interaction, title: str):
     Flow:
       1) Search TheGamesDB -> up to 10 results.
       2) For each, fetch minimal info (platform + year) for dropdown label.
-      3) User picks one -> fetch full details + images -> aggregate download links from GOG (for PC)
-         or RomsPure (for non-PC).
-      4) Build embed.
+      3) While the user chooses, resolve the first few options in the background.
+      4) User picks one -> fetch full details + images -> aggregate download links from GOG (for PC)
+         or RomsPure (for non-PC), reusing the prefetched result when there is one.
+      5) Build embed.
     """
     await interaction.response.defer()
 
@@ -237,103 +315,72 @@ async def play_command(interaction: Interaction, title: str):
         await interaction.followup.send("No results found or an error occurred.")
         return
 
+    # Remember the titles so later autocomplete requests can suggest them
+    title_index.index.add(g.get("game_title", "") for g in search_results)
+
     top_games = search_results[:10]
 
+    # One request for every option's image, shared with the prefetches below
+    images = asyncio.ensure_future(fetch_images_batch([g["id"] for g in top_games], DROPDOWN))
+    images.add_done_callback(lambda t: t.cancelled() or t.exception())
+
     # Build dropdown options
     options = []
     for g in top_games:
         g_id = g["id"]
         fallback_title = g.get("game_title", "Unknown Title")
         drow = await fetch_for_dropdown(g_id)
-        final_title = drow["title"] if drow["title"] else fallback_title
-        plat_str = drow["platform_name"]
-        year_str = drow["year"]
-        label_str = f"{final_title} ({plat_str}, {year_str})"
+        if drow is None:
+            # Quota is running low: label from the search result alone
+            rdate = g.get("release_date") or ""
+            extras = [rdate[:4]] if rdate else []
+            if g.get("platform") is not None:
+                # Known if an earlier response or the mirror named this id
+                plat_name = resolve_platform(int(g["platform"])).name
+                if plat_name != "Unknown":
+                    extras.insert(0, plat_name)
+            label_str = f"{fallback_title} ({', '.join(extras)})" if extras else fallback_title
+        else:
+            final_title = drow["title"] if drow["title"] else fallback_title
+            plat_str = drow["platform_name"]
+            year_str = drow["year"]
+            label_str = f"{final_title} ({plat_str}, {year_str})"
         options.append(discord.SelectOption(label=label_str, value=str(g_id)))
 
+    prefetcher = Prefetcher(
+        functools.partial(resolve_game, regions=region_priority(interaction.guild_id)),
+        [g["id"] for g in top_games[:PREFETCH_TOP_N]],
+        thegamesdb.scheduler,
+    )
+
     async def select_callback(select_interaction: Interaction):
         await select_interaction.response.defer()
         game_id_str = select_interaction.data["values"][0]
         game_id = int(game_id_str)
 
-        # 1) Retrieve full details from TheGamesDB
-        details = await get_full_details(game_id)
-        if not details:
+        # Usually already resolved by the prefetcher while the user was choosing
+        resolved = await prefetcher.get(game_id)
+        if resolved is None:
             await select_interaction.followup.send("Could not retrieve game details.")
             return
 
-        # 2) Fetch images (clearlogo or boxart)
-        img_url = await fetch_images(game_id)
-
-        # 3) Build embed
-        title_text = details["title"]
-        overview = clean_text(details["overview"] or "No overview.")
-        release_date = details["release_date"]
-        rating = details["rating"]
-        platform_str = details["platform"]
-
-        embed = discord.Embed(
-            title=title_text,
-            description=overview[:500] + ("..." if len(overview) > 500 else ""),
-            color=discord.Color.blue()
-        )
-        embed.add_field(name="Platform", value=platform_str, inline=True)
-        embed.add_field(name="Release Date", value=release_date, inline=True)
-        embed.add_field(name="Rating", value=str(rating), inline=True)
-
-        if img_url:
-            embed.set_thumbnail(url=img_url)
-        else:
-            embed.set_footer(text="No image found for this game.")
-
-        # 4) Aggregator: Get download links from various sources
-        dl_links = await get_all_download_links(title_text, platform_str)
-
-        site_lines: list[str] = []
-        direct_lines: list[str] = []
-        play_now_lines: list[str] = []
-
-        for source, url, disc in dl_links:
-            if source == "Myrient":
-                disc_label = f" (Disc {disc})" if disc is not None else ""
-                title_str = f"Direct Download {title_text}{disc_label} from myrient.erista.me"
-                direct_lines.append(f"[{title_str}]({url})")
-            elif source == "PlayNow":
-                play_now_lines.append(
-                    f"[Play {title_text} at {emulatorjs.BASE_DOMAIN}]({url})"
-                )
-            elif source == "RomsPure":
-                site_lines.append(f"[{title_text} at romspure.cc]({url})")
-            else:
-                site_lines.append(f"[{title_text} at {source}]({url})")
-
-        if site_lines:
-            embed.add_field(
-                name="Download Sites",
-                value="\n".join(site_lines),
-                inline=False,
-            )
-
-        if direct_lines:
-            embed.add_field(
-                name="Direct Downloads",
-                value="\n".join(direct_lines),
-                inline=False,
-            )
-
-        if play_now_lines:
-            embed.add_field(
-                name="Play Now",
-                value="\n".join(play_now_lines),
-                inline=False,
-            )
-
+        embed = build_embed(*resolved)
         await select_interaction.edit_original_response(embed=embed, view=None)
 
     select = discord.ui.Select(placeholder="Select a game", options=options)
     select.callback = select_callback
-    view = discord.ui.View()
+    view = PlayView(prefetcher)
     view.add_item(select)
     await interaction.followup.send("Select a game:", view=view)
-
-bot.run(TOKEN)
+    prefetcher.start()
+
+@play_command.autocomplete("title")
+async def play_title_autocomplete(interaction: Interaction, current: str) -> list[app_commands.Choice[str]]:
+    """Suggest known titles from the local index while the user types."""
+    return [
+        app_commands.Choice(name=t[:100], value=t[:100])
+        for t in title_index.index.complete(current)
+    ]
+
+if __name__ == "__main__":
+    bot.run(TOKEN)
@@ -0,0 +1,107 @@
+# loop_monitor.py
+"""Event-loop lag monitor and blocking-call detector.
+
+A heartbeat task on the event loop records how late each tick fires; that
+delay is the scheduling lag every other coroutine experiences. A separate
+watchdog thread notices when the heartbeat stops altogether for longer than
+``threshold`` seconds, which means some callback is holding the loop, and
+prints the loop thread's current stack so the blocking call can be found.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import sys
+import threading
+import time
+import traceback
+
+
+class LoopMonitor:
+    def __init__(self, interval: float = 0.1, threshold: float = 0.25, history: int = 600) -> None:
+        self.interval = interval
+        self.threshold = threshold
+        self.samples: collections.deque[float] = collections.deque(maxlen=history)
+        self.stalls = 0
+        self.max_lag = 0.0
+        self._last_beat = time.monotonic()
+        self._loop_thread_id: int | None = None
+        self._task: asyncio.Task | None = None
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start monitoring the running loop. Must be called from inside it."""
+        if self.running:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+        self._thread = threading.Thread(target=self._watchdog, name="loop-watchdog", daemon=True)
+        self._thread.start()
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    async def _heartbeat(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+            self.samples.append(lag)
+            self.max_lag = max(self.max_lag, lag)
+            self._last_beat = time.monotonic()
+
+    def _watchdog(self) -> None:
+        reported_beat = None
+        while not self._stop.wait(self.interval / 2):
+            beat = self._last_beat
+            stalled = time.monotonic() - beat - self.interval
+            if stalled < self.threshold or beat == reported_beat:
+                continue
+            # Report each stall once, while the offending code is still running
+            reported_beat = beat
+            self.stalls += 1
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame else "<no frame>\n"
+            print(
+                f"[loop_monitor] event loop blocked for {stalled * 1000:.0f}ms; "
+                f"loop thread stack:\n{stack}",
+                file=sys.stderr,
+            )
+
+    def stats(self) -> dict:
+        """Return the current lag metrics in milliseconds."""
+        ordered = sorted(self.samples)
+
+        def pct(p: float) -> float:
+            if not ordered:
+                return 0.0
+            return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))] * 1000
+
+        return {
+            "last_ms": round(self.samples[-1] * 1000, 1) if self.samples else 0.0,
+            "p50_ms": round(pct(50), 1),
+            "p99_ms": round(pct(99), 1),
+            "max_ms": round(self.max_lag * 1000, 1),
+            "stalls": self.stalls,
+            "samples": len(ordered),
+        }
+
+
+# Shared instance used by the bot
+monitor = LoopMonitor()
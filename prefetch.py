@@ -0,0 +1,76 @@
+# prefetch.py
+"""Speculative resolution of dropdown options while the user is choosing.
+
+After ``/play`` shows its select menu, a :class:`Prefetcher` starts resolving
+the first few options in the background at ``BACKGROUND`` priority. When the
+user picks one, its result is usually ready already; the other speculative
+tasks are cancelled and the picked one is promoted to interactive priority,
+so any of its requests still queued in the scheduler overtake other
+background work. If the pick was not prefetched, or its prefetch failed (for
+instance because it was shed to save TheGamesDB quota), the option is
+resolved again at interactive priority.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Awaitable, Callable, Generic, TypeVar
+
+from scrapers.rate_limit import BACKGROUND, INTERACTIVE, RequestScheduler, Ticket
+
+T = TypeVar("T")
+
+
+def _consume_result(task: asyncio.Task) -> None:
+    # Avoid "exception was never retrieved" warnings for abandoned prefetches
+    if not task.cancelled():
+        task.exception()
+
+
+class Prefetcher(Generic[T]):
+    def __init__(
+        self,
+        resolve: Callable[[int, int | Ticket], Awaitable[T]],
+        game_ids: list[int],
+        scheduler: RequestScheduler,
+    ) -> None:
+        self._resolve = resolve
+        self._game_ids = game_ids
+        self._scheduler = scheduler
+        self._tasks: dict[int, tuple[asyncio.Task, Ticket]] = {}
+
+    def start(self) -> None:
+        if self._scheduler.status()["queued"]:
+            # Requests are already waiting for tokens; don't add to the queue
+            print("[prefetch] scheduler busy; skipping speculative prefetch")
+            return
+        loop = asyncio.get_running_loop()
+        for game_id in self._game_ids:
+            ticket = Ticket(BACKGROUND)
+            task = loop.create_task(self._resolve(game_id, ticket))
+            task.add_done_callback(_consume_result)
+            self._tasks[game_id] = (task, ticket)
+
+    def cancel(self, keep: int | None = None) -> None:
+        """Cancel every speculative task except the one for ``keep``."""
+        for game_id, (task, _) in list(self._tasks.items()):
+            if game_id != keep:
+                task.cancel()
+                del self._tasks[game_id]
+
+    async def get(self, game_id: int) -> T:
+        """Return the resolution for ``game_id``, reusing a prefetch if possible."""
+        self.cancel(keep=game_id)
+        entry = self._tasks.pop(game_id, None)
+        if entry is not None:
+            task, ticket = entry
+            self._scheduler.promote(ticket)
+            try:
+                return await task
+            except asyncio.CancelledError:
+                if not task.cancelled():
+                    # We were cancelled ourselves, not the prefetch
+                    raise
+            except Exception as e:
+                print(f"[prefetch] prefetch of {game_id} failed ({type(e).__name__}: {e}); retrying")
+        return await self._resolve(game_id, INTERACTIVE)
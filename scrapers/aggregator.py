@@ -0,0 +1,121 @@
+# scrapers/aggregator.py
+"""Combine the individual scrapers into a single list of download links."""
+
+import asyncio
+import functools
+from typing import Collection
+
+from scrapers import emulatorjs, gog_games, myrient, romspure, shared_cache
+from scrapers.circuit_breaker import CircuitBreaker
+from scrapers.platform_map import PlatformRoute, resolve_platform
+from scrapers.providers import REGISTRY, Provider, providers_for, register
+
+# Breakers for the providers that depend on third-party sites. The probes
+# run a cheap, known-good search once a tripped breaker's cooldown expires.
+BREAKERS = {
+    "RomsPure": CircuitBreaker(
+        "RomsPure",
+        probe=lambda: romspure.search_romspure("Tetris", "Nintendo Game Boy"),
+        min_timeout=2.0,
+        max_timeout=15.0,
+        slow_after=10.0,
+    ),
+    "GOG-Games": CircuitBreaker(
+        "GOG-Games",
+        probe=lambda: gog_games.search_gog_games("The Witcher"),
+        min_timeout=5.0,
+        max_timeout=25.0,
+        slow_after=20.0,
+    ),
+}
+
+# How long aggregated links are kept in the shared cache, in seconds
+LINKS_TTL = 6 * 3600
+
+
+async def _gog_links(game_title: str, route: PlatformRoute) -> list[tuple[str, int | None]]:
+    return [(url, None) for url in await gog_games.get_gog_download_links(game_title)]
+
+
+async def _romspure_links(game_title: str, route: PlatformRoute) -> list[tuple[str, int | None]]:
+    return [(url, None) for url in await romspure.get_romspure_download_links(game_title, route)]
+
+
+async def _play_now_links(game_title: str, route: PlatformRoute) -> list[tuple[str, int | None]]:
+    play_url = await emulatorjs.get_emulatorjs_play_url(game_title, route)
+    return [(play_url, None)] if play_url else []
+
+
+register(Provider("GOG-Games", _gog_links, gog_games.supports_platform,
+                  priority=0, breaker=BREAKERS["GOG-Games"]))
+register(Provider("RomsPure", _romspure_links, romspure.supports_platform,
+                  priority=10, breaker=BREAKERS["RomsPure"]))
+register(Provider("Myrient", myrient.get_myrient_download_links, myrient.supports_platform,
+                  priority=20, timeout=10.0, regional=True))
+register(Provider("PlayNow", _play_now_links, emulatorjs.supports_platform,
+                  priority=30, timeout=5.0))
+
+# Returned by a failed lookup so it can be told apart from "no links"
+_FAILED: list = []
+
+
+async def _lookup(
+    provider: Provider, game_title: str, route: PlatformRoute, regions: list[str] | None = None
+) -> list:
+    fetch = provider.fetch
+    if regions and provider.regional:
+        fetch = functools.partial(fetch, regions=regions)
+    if provider.breaker is not None:
+        return await provider.breaker.call(fetch, game_title, route, fallback=_FAILED)
+    try:
+        return await asyncio.wait_for(fetch(game_title, route), provider.timeout)
+    except asyncio.TimeoutError:
+        print(f"[aggregator] {provider.name} timed out after {provider.timeout:.0f}s")
+    except Exception as e:
+        print(f"[aggregator] {provider.name} failed: {type(e).__name__}: {e}")
+    return _FAILED
+
+
+async def get_all_download_links(
+    game_title: str,
+    platform_name: str | PlatformRoute,
+    only: Collection[str] | None = None,
+    regions: list[str] | None = None,
+) -> list[tuple[str, str, int | None]]:
+    """Aggregate download links from every provider supporting the platform.
+
+    Each returned tuple contains ``(source, url, disc_number)`` where
+    ``disc_number`` will be ``None`` for single-disc games. Providers run
+    concurrently and their links are listed by provider priority. Providers
+    whose circuit breaker is open are skipped. ``only`` restricts the lookup
+    to the named providers; such partial lookups bypass the shared cache.
+    ``regions`` is the preferred order of release regions (e.g. a server's
+    ``guildRegionPriority``), passed to the providers that choose between
+    regional releases.
+    """
+    # Resolve the platform once; every provider reads its own field
+    route = resolve_platform(platform_name)
+    cache_key = f"{route.name.lower()}\n{game_title.lower()}"
+    if regions:
+        cache_key += "\n" + ",".join(regions).lower()
+    if only is None:
+        cached = shared_cache.get("links", cache_key)
+        if cached is not None:
+            return [tuple(link) for link in cached]
+
+    selected = providers_for(route)
+    if only is not None:
+        selected = [p for p in selected if p.name in only]
+    results = await asyncio.gather(*(_lookup(p, game_title, route, regions) for p in selected))
+
+    links: list[tuple[str, str, int | None]] = []
+    complete = True
+    for provider, found in zip(selected, results):
+        if found is _FAILED:
+            complete = False
+        links.extend((provider.name, url, disc) for url, disc in found)
+
+    # A skipped or failing provider may be back soon; don't cache partial results
+    if complete and only is None:
+        shared_cache.put("links", cache_key, links, LINKS_TTL)
+    return links
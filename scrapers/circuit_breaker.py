@@ -0,0 +1,131 @@
+# scrapers/circuit_breaker.py
+"""Per-provider circuit breakers with latency-driven timeouts.
+
+Each network-backed provider gets a :class:`CircuitBreaker`. Calls that fail,
+time out or take longer than ``slow_after`` seconds count as failures; after
+``failure_threshold`` of them in a row the breaker opens and the provider is
+skipped. Once ``cooldown`` seconds have passed a single background probe is
+sent, and the breaker closes again only if that probe succeeds, so user
+requests never wait on a provider that is known to be down.
+
+The timeout for each call adapts to the provider's recent latency: a multiple
+of the 95th percentile of the last ``window`` successful calls, clamped to
+``[min_timeout, max_timeout]``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import time
+from typing import Awaitable, Callable, TypeVar
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        probe: Callable[[], Awaitable[object]] | None = None,
+        failure_threshold: int = 3,
+        slow_after: float = 10.0,
+        cooldown: float = 30.0,
+        min_timeout: float = 2.0,
+        max_timeout: float = 15.0,
+        window: int = 50,
+    ) -> None:
+        self.name = name
+        self.probe = probe
+        self.failure_threshold = failure_threshold
+        self.slow_after = slow_after
+        self.cooldown = cooldown
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._latencies: collections.deque[float] = collections.deque(maxlen=window)
+        self._probe_task: asyncio.Task | None = None
+
+    def timeout(self) -> float:
+        """Return the timeout for the next call based on recent latencies."""
+        if len(self._latencies) < 5:
+            return self.max_timeout
+        ordered = sorted(self._latencies)
+        p95 = ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+        return min(self.max_timeout, max(self.min_timeout, p95 * 2))
+
+    def allow(self) -> bool:
+        """Return ``True`` if a call may go through right now."""
+        if self.state == CLOSED:
+            return True
+        if time.monotonic() - self.opened_at >= self.cooldown:
+            self._start_probe()
+        return False
+
+    def record_success(self, latency: float) -> None:
+        if latency >= self.slow_after:
+            self.record_failure(f"slow response ({latency:.1f}s)")
+            return
+        self._latencies.append(latency)
+        self.failures = 0
+        if self.state == OPEN:
+            print(f"[breaker] {self.name} recovered; closing circuit")
+        self.state = CLOSED
+
+    def record_failure(self, reason: str) -> None:
+        self.failures += 1
+        print(f"[breaker] {self.name} failure {self.failures}/{self.failure_threshold}: {reason}")
+        if self.state == OPEN or self.failures >= self.failure_threshold:
+            if self.state == CLOSED:
+                print(f"[breaker] {self.name} opened; skipping it for {self.cooldown:.0f}s")
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+
+    async def call(self, func: Callable[..., Awaitable[T]], *args, fallback: T) -> T:
+        """Run ``func(*args)`` through the breaker, returning ``fallback`` on failure."""
+        if not self.allow():
+            return fallback
+        timeout = self.timeout()
+        start = time.monotonic()
+        try:
+            result = await asyncio.wait_for(func(*args), timeout)
+        except asyncio.TimeoutError:
+            self.record_failure(f"timed out after {timeout:.1f}s")
+            return fallback
+        except Exception as e:
+            self.record_failure(f"{type(e).__name__}: {e}")
+            return fallback
+        self.record_success(time.monotonic() - start)
+        return result
+
+    def _start_probe(self) -> None:
+        if self.probe is None:
+            # Without a probe, let the next real call through after the cooldown
+            self.state = CLOSED
+            self.failures = self.failure_threshold - 1
+            return
+        if self._probe_task is not None and not self._probe_task.done():
+            return
+        self._probe_task = asyncio.get_running_loop().create_task(self._run_probe())
+
+    async def _run_probe(self) -> None:
+        start = time.monotonic()
+        try:
+            await asyncio.wait_for(self.probe(), self.max_timeout)
+        except Exception as e:
+            # Includes asyncio.TimeoutError
+            self.record_failure(f"probe failed: {type(e).__name__}: {e}")
+            return
+        self.record_success(time.monotonic() - start)
+
+    def status(self) -> dict:
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "timeout_s": round(self.timeout(), 2),
+        }
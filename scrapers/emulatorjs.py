@@ -10,7 +10,8 @@ from urllib.parse import urlparse
 
 from scrapers.fuzz_fallback import fuzz
 import re
-from scrapers.platform_map import canonicalize_platform_name
+from scrapers import index_store, memory, paths
+from scrapers.platform_map import EMULATORJS_PLATFORM_MAP, PlatformRoute, resolve_platform
 
 # Environment variable for the base URL used to build play links
 # Can be overridden at runtime via :func:`set_base_url`.
@@ -38,25 +39,12 @@ def set_base_url(url: str | None) -> None:
 set_base_url(BASE_URL)
 
 # Path to the JSON index generated via scripts/update_emulatorjs_index.py
-INDEX_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "emulatorjs_index.json")
-
-# Mapping of TheGamesDB platform names to EmulatorJS short codes
-EMULATORJS_PLATFORM_MAP: Dict[str, str] = {
-    "Nintendo Game Boy": "gb",
-    "Nintendo Game Boy Color": "gbc",
-    "Nintendo Game Boy Advance": "gba",
-    "Nintendo Entertainment System": "nes",
-    "Super Nintendo (SNES)": "snes",
-    "Super Nintendo Entertainment System": "snes",
-    "Nintendo 64": "n64",
-    "Sega Genesis": "segaMD",
-    "Sega Mega Drive - Genesis": "segaMD",
-    "Sega Mega Drive": "segaMD",
-    "Sony PlayStation": "psx",
-    "3DO Interactive Multiplayer": "3do",
-}
+INDEX_PATH = paths.EMULATORJS_INDEX
 
 _index_cache: Dict[str, List[str]] | None = None
+# Version of the index being served, from its manifest
+_index_version: int | None = None
+_watcher = index_store.Watcher()
 
 # Regular expression to strip region/revision info like "(USA)" or "(Rev 1)"
 _PAREN_RE = re.compile(r"\s*\([^)]*\)")
@@ -68,14 +56,32 @@ def _normalize_title(title: str) -> str:
 
 
 def _load_index() -> Dict[str, List[str]]:
-    """Load the index from ``INDEX_PATH`` once and cache it."""
-    global _index_cache
-    if _index_cache is not None:
+    """Load the index from ``INDEX_PATH`` once and cache it.
+
+    A newly published version replaces the cached one once it matches its
+    manifest; until then the cached version is kept.
+    """
+    global _index_cache, _index_version
+    if _index_cache is not None and not _watcher.changed(INDEX_PATH):
+        return _index_cache
+
+    manifest = index_store.read_manifest(INDEX_PATH)
+    if _index_cache is not None and (manifest is None or manifest["version"] == _index_version):
         return _index_cache
 
     if os.path.isfile(INDEX_PATH):
-        with open(INDEX_PATH, "r", encoding="utf-8") as f:
-            _index_cache = json.load(f)
+        with open(INDEX_PATH, "rb") as f:
+            data = f.read()
+        if manifest is not None and not index_store.matches(data, manifest):
+            if _index_cache is not None:
+                print(f"[emulatorjs] index file does not match version {manifest['version']}; keeping the current index")
+                return _index_cache
+            print("[emulatorjs] index file does not match its manifest; loading it anyway")
+            manifest = None
+        if _index_cache is not None:
+            print(f"[emulatorjs] now serving index version {manifest['version']}")
+        _index_cache = json.loads(data)
+        _index_version = manifest["version"] if manifest else None
     else:
         print(f"[emulatorjs] index file not found at {INDEX_PATH}")
         _index_cache = {}
@@ -83,18 +89,35 @@ def _load_index() -> Dict[str, List[str]]:
     return _index_cache
 
 
-def _get_code(platform_name: str) -> str | None:
-    canonical = canonicalize_platform_name(platform_name)
-    return EMULATORJS_PLATFORM_MAP.get(canonical)
+memory.register(
+    "emulatorjs.index",
+    lambda: _index_cache,
+    lambda: {"entries": sum(map(len, (_index_cache or {}).values()))},
+)
+
 
+def _get_code(platform_name: str | PlatformRoute) -> str | None:
+    return resolve_platform(platform_name).emulatorjs
 
-async def search_emulatorjs(game_title: str, platform_name: str) -> str | None:
+
+def supports_platform(platform: str | PlatformRoute) -> bool:
+    """Return ``True`` if Play Now links are configured for ``platform``."""
+    return bool(BASE_URL) and _get_code(platform) is not None
+
+
+async def search_emulatorjs(game_title: str, platform_name: str | PlatformRoute) -> str | None:
     """Return a Play Now URL if a match is found."""
+    return match_play_url(game_title, platform_name)
+
+
+def match_play_url(game_title: str, platform_name: str | PlatformRoute) -> str | None:
+    """Synchronous core of :func:`search_emulatorjs`, also used for batches."""
     if not BASE_URL:
         return None
-    code = _get_code(platform_name)
+    route = resolve_platform(platform_name)
+    code = route.emulatorjs
     if code is None:
-        print(f"[emulatorjs] no code for platform '{platform_name}'")
+        print(f"[emulatorjs] no code for platform '{route.name}'")
         return None
 
     index = _load_index().get(code, [])
@@ -122,7 +145,7 @@ async def search_emulatorjs(game_title: str, platform_name: str) -> str | None:
     return f"{BASE_URL}{code}---{best_idx}"
 
 
-async def get_emulatorjs_play_url(game_title: str, platform_name: str) -> str | None:
+async def get_emulatorjs_play_url(game_title: str, platform_name: str | PlatformRoute) -> str | None:
     """Asynchronous wrapper for :func:`search_emulatorjs`."""
 
     return await search_emulatorjs(game_title, platform_name)
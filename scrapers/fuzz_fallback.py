@@ -1,9 +1,37 @@
-"""Wrapper for fuzzy matching with a fallback implementation."""
-try:
-    from rapidfuzz import fuzz  # type: ignore
-except ModuleNotFoundError:  # pragma: no cover - handle missing optional dependency
+"""Wrapper for fuzzy matching with a fallback implementation.
+
+rapidfuzz is only imported the first time a scorer is used, so modules that
+import ``fuzz`` but never match anything (index scripts, the bot at startup)
+don't pay for loading it.
+"""
+import importlib
+import importlib.util
+
+HAVE_RAPIDFUZZ = importlib.util.find_spec("rapidfuzz") is not None
+
+
+class _LazyModule:
+    """Stand-in for a module that is imported on first attribute access."""
+
+    def __init__(self, name: str) -> None:
+        self._name = name
+
+    def __getattr__(self, attr: str):
+        # Copy the module's names onto the proxy so later lookups are plain
+        # attribute reads and never come back here
+        self.__dict__.update(vars(importlib.import_module(self._name)))
+        return getattr(importlib.import_module(self._name), attr)
+
+
+if HAVE_RAPIDFUZZ:
+    fuzz = _LazyModule("rapidfuzz.fuzz")
+    process = _LazyModule("rapidfuzz.process")
+else:  # pragma: no cover - handle missing optional dependency
     import difflib
 
+    # Callers fall back to scoring one choice at a time
+    process = None
+
     class _FallbackFuzz:
         """Minimal replacement for ``rapidfuzz.fuzz``.
 
@@ -17,4 +45,4 @@ except ModuleNotFoundError:  # pragma: no cover - handle missing optional depend
 
     fuzz = _FallbackFuzz()
 
-__all__ = ["fuzz"]
+__all__ = ["fuzz", "process", "HAVE_RAPIDFUZZ"]
@@ -1,11 +1,25 @@
+import os
 import urllib.parse
-from bs4 import BeautifulSoup
 # Attempt to use rapidfuzz for fast fuzzy matching but fall back to difflib
 from scrapers.fuzz_fallback import fuzz
-from playwright.async_api import async_playwright
+from scrapers.platform_map import PlatformRoute, resolve_platform
 
-BASE_URL = "https://gog-games.to"
+# Can be overridden via the environment, e.g. to point at a local mock server
+BASE_URL = os.environ.get("GOG_GAMES_BASE_URL", "https://gog-games.to").rstrip("/")
 THRESHOLD = 85  # Adjusted threshold for strict matching
+# Playwright timeouts in milliseconds
+NAVIGATION_TIMEOUT_MS = 15000
+RESULTS_TIMEOUT_MS = 8000
+# Result cards use a generated class name; fall back to any /game/ link
+RESULT_SELECTOR = "a.jsx-3307928730.card, a[href^='/game/']"
+
+# GOG only sells PC games; DOS titles are listed as PC releases
+PLATFORMS = {"pc", "dos"}
+
+
+def supports_platform(platform: str | PlatformRoute) -> bool:
+    """Return ``True`` for the platforms GOG-Games carries."""
+    return resolve_platform(platform).name.lower() in PLATFORMS
 
 async def search_gog_games(query: str) -> list[tuple[str, str, float]]:
     """
@@ -13,26 +27,30 @@ async def search_gog_games(query: str) -> list[tuple[str, str, float]]:
     Returns a list of tuples: (detail_url, displayed_name, fuzzy_score) for candidates
     whose fuzzy score is above THRESHOLD.
     """
+    # Playwright and BeautifulSoup are slow to import; load them on the first search
+    from bs4 import BeautifulSoup
+    from playwright.async_api import async_playwright
+
     encoded_query = urllib.parse.quote(query)
     search_url = f"{BASE_URL}/?search={encoded_query}"
 
     async with async_playwright() as p:
         browser = await p.chromium.launch(headless=True)  # For debugging, you can set headless=False
-        page = await browser.new_page()
-        # Navigate to the search URL and wait until network is idle.
-        await page.goto(search_url, wait_until="networkidle")
-        # Wait an additional 5000ms to let the JavaScript fully render the results.
-        await page.wait_for_timeout(5000)
-
-        # Try waiting for the specific selector (up to 15 seconds)
         try:
-            await page.wait_for_selector("a.jsx-3307928730.card", timeout=15000)
-        except Exception as e:
-            print("[gog_games] No results found using selector 'a.jsx-3307928730.card'; trying generic selector.")
-            # If not found, we don't immediately return but will check the content below.
+            page = await browser.new_page()
+            # Navigate to the search URL and wait until network is idle.
+            await page.goto(search_url, wait_until="networkidle", timeout=NAVIGATION_TIMEOUT_MS)
+
+            # Wait for the client-side rendered results instead of a fixed delay
+            try:
+                await page.wait_for_selector(RESULT_SELECTOR, timeout=RESULTS_TIMEOUT_MS)
+            except Exception as e:
+                print(f"[gog_games] No results rendered within {RESULTS_TIMEOUT_MS}ms; checking page content.")
+                # If not found, we don't immediately return but will check the content below.
 
-        html = await page.content()
-        await browser.close()
+            html = await page.content()
+        finally:
+            await browser.close()
 
     print(f"[gog_games debug] Fetched HTML snippet (via Playwright): {html[:500]}")
 
@@ -0,0 +1,165 @@
+# scrapers/index_store.py
+"""Atomic, versioned publishing of the local index files.
+
+A build writes the new index to a temporary file and hands it to
+:func:`publish`, which checks it (checksum, entry count and per-platform
+counts against the previous build), renames it over the live file in one
+step and then writes ``<index>.manifest.json`` describing the new version.
+The manifest is written last, so readers only switch once a build is
+complete. Readers poll the manifest with a :class:`Watcher` and keep serving
+the version they have until the new file matches its manifest. The checksum
+is verified once, by :func:`publish`; readers of large files only compare
+sizes with :func:`size_matches`, since hashing on every load would stall
+them for as long as reading the whole file.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+
+MANIFEST_SUFFIX = ".manifest.json"
+# Seconds between checks for a newly published index
+CHECK_INTERVAL = 30.0
+# A build with fewer entries than this share of the previous one is refused
+MIN_ENTRY_RATIO = 0.5
+
+
+class IndexBuildError(RuntimeError):
+    """Raised when a new index fails verification and was not published."""
+
+
+def manifest_path(path: str) -> str:
+    return path + MANIFEST_SUFFIX
+
+
+def read_manifest(path: str) -> dict | None:
+    """Return the manifest of the index at ``path``, or ``None`` if it has none."""
+    try:
+        with open(manifest_path(path), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"[index_store] unreadable manifest for {path}: {e}")
+        return None
+    return manifest if isinstance(manifest, dict) and "sha256" in manifest else None
+
+
+def matches(data, manifest: dict) -> bool:
+    """Return ``True`` if ``data`` (bytes or a memory map) is the indexed file."""
+    return len(data) == manifest.get("size") and hashlib.sha256(data).hexdigest() == manifest["sha256"]
+
+
+def size_matches(data, manifest: dict) -> bool:
+    """Return ``True`` if ``data`` has the size of the file ``manifest`` describes.
+
+    Catches a file replaced or truncated after its manifest was written,
+    without reading it.
+    """
+    return len(data) == manifest.get("size")
+
+
+def file_digest(path: str) -> tuple[int, str]:
+    """Return the size and SHA-256 of the file at ``path``."""
+    sha = hashlib.sha256()
+    size = 0
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            sha.update(block)
+            size += len(block)
+    return size, sha.hexdigest()
+
+
+def check_build(entries: int, groups: dict[str, int], previous: dict | None) -> list[str]:
+    """Return the reasons a build with these counts should not replace ``previous``."""
+    problems = []
+    if entries == 0:
+        problems.append("the new index is empty")
+    if previous:
+        old_entries = previous.get("entries") or 0
+        if entries < old_entries * MIN_ENTRY_RATIO:
+            problems.append(f"{entries} entries, down from {old_entries}")
+        lost = sorted(g for g, n in (previous.get("groups") or {}).items() if n and not groups.get(g))
+        if lost:
+            shown = ", ".join(lost[:10]) + (f" and {len(lost) - 10} more" if len(lost) > 10 else "")
+            problems.append(f"{len(lost)} platforms lost every entry: {shown}")
+    return problems
+
+
+def publish(
+    tmp_path: str,
+    path: str,
+    entries: int,
+    groups: dict[str, int],
+    sha256: str,
+    force: bool = False,
+    previous: dict | None = None,
+    **extra,
+) -> dict:
+    """Verify ``tmp_path`` and atomically make it the index at ``path``.
+
+    ``sha256`` is the digest computed while the file was written; reading it
+    back must give the same one. ``groups`` maps each platform to its entry
+    count. Raises :class:`IndexBuildError`, leaving the live index and
+    ``tmp_path`` untouched, if the file is damaged or, unless ``force`` is
+    set, looks much worse than the previous build. ``previous`` is the
+    manifest to compare with and number from when the index is moving to
+    ``path`` from another file; by default it is ``path``'s own. Returns the
+    new manifest.
+    """
+    size, actual = file_digest(tmp_path)
+    if actual != sha256:
+        raise IndexBuildError(f"{tmp_path} changed after it was written (checksum mismatch)")
+    previous = previous or read_manifest(path)
+    problems = check_build(entries, groups, previous)
+    if problems and not force:
+        raise IndexBuildError("; ".join(problems) + f". Kept the current index; the new one is at {tmp_path}")
+    for problem in problems:
+        print(f"[index_store] publishing anyway: {problem}")
+
+    manifest = {
+        "version": (previous or {}).get("version", 0) + 1,
+        "built": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "entries": entries,
+        "size": size,
+        "sha256": sha256,
+        "groups": groups,
+        **extra,
+    }
+    with open(tmp_path, "rb") as f:
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    # Written last: readers switch versions when the manifest changes
+    tmp_manifest = manifest_path(path) + ".tmp"
+    with open(tmp_manifest, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_manifest, manifest_path(path))
+    return manifest
+
+
+class Watcher:
+    """Tells a reader, at most every CHECK_INTERVAL seconds, that a manifest changed."""
+
+    def __init__(self) -> None:
+        self._seen: dict[str, tuple] = {}
+        self._next_check: dict[str, float] = {}
+
+    def changed(self, path: str) -> bool:
+        now = time.monotonic()
+        if now < self._next_check.get(path, 0.0):
+            return False
+        self._next_check[path] = now + CHECK_INTERVAL
+        try:
+            st = os.stat(manifest_path(path))
+            stamp = (st.st_ino, st.st_mtime_ns, st.st_size)
+        except OSError:
+            stamp = None
+        if path in self._seen and self._seen[path] == stamp:
+            return False
+        self._seen[path] = stamp
+        return stamp is not None
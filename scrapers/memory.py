@@ -0,0 +1,249 @@
+# scrapers/memory.py
+"""Memory accounting for the indexes and caches a process keeps resident.
+
+Modules :func:`register` what they hold (the Myrient and EmulatorJS indexes,
+the autocomplete index) and keep their caches in a :class:`BoundedCache`,
+which counts hits, misses and evictions and can be held to a budget in
+bytes. :func:`report` measures everything registered with
+:func:`deep_sizeof`; the owner-only ``!memory`` command and
+``scripts/memory_report.py`` print it with :func:`format_report`.
+"""
+
+from __future__ import annotations
+
+import collections
+import sys
+import types
+from typing import Callable
+
+# Byte budgets by cache name, set from cacheBudgetsMb in config.json. Caches
+# created later pick theirs up when they are constructed.
+BUDGETS: dict[str, int] = {}
+
+# name -> (object to measure, extra fields such as hits or entries)
+REGISTRY: dict[str, tuple[Callable[[], object] | None, Callable[[], dict] | None]] = {}
+# Every BoundedCache by name, for set_budgets
+CACHES: dict[str, "BoundedCache"] = {}
+
+# Shared, immutable or owned elsewhere: never followed by deep_sizeof
+_OPAQUE = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+_LEAVES = (str, bytes, int, float, bool, type(None))
+
+
+def register(
+    name: str, measure: Callable[[], object] | None, stats: Callable[[], dict] | None = None
+) -> None:
+    """Report ``measure()`` as ``name``, with the fields returned by ``stats()``.
+
+    ``measure`` may be ``None`` for caches whose contents cannot be walked.
+    """
+    REGISTRY[name] = (measure, stats)
+
+
+def deep_sizeof(obj, seen: set[int] | None = None) -> int:
+    """Return the size in bytes of ``obj`` and every object it references.
+
+    Objects whose ids are in ``seen`` are skipped and new ones are added, so
+    measuring several structures with one set counts shared strings once.
+    Classes, modules and functions are not followed; memory-mapped files
+    count as their small Python object only.
+    """
+    seen = set() if seen is None else seen
+    total = 0
+    stack = [obj]
+    while stack:
+        o = stack.pop()
+        if id(o) in seen or isinstance(o, _OPAQUE):
+            continue
+        seen.add(id(o))
+        total += sys.getsizeof(o)
+        if isinstance(o, _LEAVES):
+            continue
+        if isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset, collections.deque)):
+            stack.extend(o)
+        else:
+            attrs = getattr(o, "__dict__", None)
+            if attrs is not None:
+                stack.append(attrs)
+            for slot in getattr(type(o), "__slots__", ()):
+                if hasattr(o, slot):
+                    stack.append(getattr(o, slot))
+    return total
+
+
+class BoundedCache:
+    """Least-recently-used cache bounded by entry count and, optionally, bytes.
+
+    ``sizeof(value)`` estimates an entry's size for the byte budget; it
+    should be cheap, since it runs on every insert. The newest entry is
+    always kept, even alone over budget, so a lookup never has to rebuild
+    what it just built.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int | None = None,
+        max_bytes: int | None = None,
+        sizeof: Callable[[object], int] = sys.getsizeof,
+    ) -> None:
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = BUDGETS.get(name, max_bytes)
+        self._sizeof = sizeof
+        self._data: collections.OrderedDict = collections.OrderedDict()
+        self._sizes: dict = {}
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        CACHES[name] = self
+        register(name, lambda: self._data, self.stats)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def configure(self, max_entries: int | None = None, max_bytes: int | None = None) -> None:
+        """Change the limits that are given, evicting entries to meet them."""
+        if max_entries is not None:
+            self.max_entries = max_entries
+        if max_bytes is not None:
+            self.max_bytes = max_bytes
+        self._trim()
+
+    def get(self, key, default=None):
+        value = self._data.get(key, default)
+        if key in self._sizes:
+            self.hits += 1
+            self._data.move_to_end(key)
+        else:
+            self.misses += 1
+        return value
+
+    def put(self, key, value) -> None:
+        if key in self._sizes:
+            self.nbytes -= self._sizes.pop(key)
+        size = sys.getsizeof(key) + self._sizeof(value)
+        self._data[key] = value
+        self._data.move_to_end(key)
+        self._sizes[key] = size
+        self.nbytes += size
+        self._trim()
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._sizes.clear()
+        self.nbytes = 0
+
+    def _trim(self) -> None:
+        while len(self._data) > 1 and (
+            (self.max_entries is not None and len(self._data) > self.max_entries)
+            or (self.max_bytes is not None and self.nbytes > self.max_bytes)
+        ):
+            key, _ = self._data.popitem(last=False)
+            self.nbytes -= self._sizes.pop(key)
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._data),
+            "estimated_bytes": self.nbytes,
+            "budget_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+def set_budgets(budgets_mb: dict[str, float]) -> None:
+    """Apply byte budgets, in MiB by cache name, to current and future caches."""
+    for name, mb in budgets_mb.items():
+        BUDGETS[name] = int(float(mb) * 1024 * 1024)
+        cache = CACHES.get(name)
+        if cache is not None:
+            cache.configure(max_bytes=BUDGETS[name])
+
+
+def rss_bytes() -> int | None:
+    """Return the resident set size of this process, if the OS reports it."""
+    try:
+        with open("/proc/self/status", "r", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def report(top: int = 10) -> dict:
+    """Measure every registered structure.
+
+    Returns ``{"rss_bytes", "structures": [...], "traced": ...}``. Each
+    structure is measured after the ones before it, sharing one ``seen``
+    set, so a string held by two structures is counted for the first.
+    ``traced`` lists the ``top`` allocating files when :mod:`tracemalloc`
+    is tracing, and is ``None`` otherwise.
+    """
+    # Snapshot first, so the walk's own bookkeeping is not in it
+    traced = None
+    import tracemalloc
+
+    if tracemalloc.is_tracing():
+        current, peak = tracemalloc.get_traced_memory()
+        top_stats = tracemalloc.take_snapshot().statistics("filename")[:top]
+        traced = {
+            "current_bytes": current,
+            "peak_bytes": peak,
+            "top": [[str(s.traceback[0].filename), s.size] for s in top_stats],
+        }
+
+    seen: set[int] = set()
+    rows = []
+    for name, (measure, stats) in sorted(REGISTRY.items()):
+        row = {"name": name}
+        try:
+            row.update(stats() if stats else {})
+            row["bytes"] = deep_sizeof(measure(), seen) if measure else None
+        except Exception as e:  # a structure being swapped out mid-walk
+            row["error"] = f"{type(e).__name__}: {e}"
+        lookups = row.get("hits", 0) + row.get("misses", 0)
+        if lookups:
+            row["hit_rate"] = round(row["hits"] / lookups, 3)
+        rows.append(row)
+
+    return {"rss_bytes": rss_bytes(), "structures": rows, "traced": traced}
+
+
+def _mib(n: int | None) -> str:
+    if n is None:
+        return "-"
+    return f"{n / 1024:.0f}K" if n < 1024 * 1024 else f"{n / (1024 * 1024):.1f}M"
+
+
+def format_report(data: dict) -> str:
+    """Render :func:`report` as a fixed-width table."""
+    lines = [f"RSS {_mib(data['rss_bytes'])}"]
+    lines.append(f"{'structure':<22} {'entries':>8} {'size':>8} {'budget':>7} {'hit%':>6} {'evicted':>8}")
+    for row in data["structures"]:
+        if "error" in row:
+            lines.append(f"{row['name']:<22} {row['error']}")
+            continue
+        hit_rate = f"{row['hit_rate'] * 100:.1f}" if "hit_rate" in row else "-"
+        entries = "-" if row.get("entries") is None else row["entries"]
+        line = (
+            f"{row['name']:<22} {entries:>8} {_mib(row['bytes']):>8} "
+            f"{_mib(row.get('budget_bytes')):>7} {hit_rate:>6} {row.get('evictions', '-'):>8}"
+        )
+        if row.get("mapped_bytes"):
+            line += f"  (+{_mib(row['mapped_bytes'])} mapped)"
+        lines.append(line)
+    traced = data.get("traced")
+    if traced:
+        lines.append(f"tracemalloc: {_mib(traced['current_bytes'])} now, {_mib(traced['peak_bytes'])} peak")
+        for filename, size in traced["top"]:
+            lines.append(f"  {_mib(size):>8}  {filename}")
+    return "\n".join(lines)
@@ -1,27 +1,82 @@
 # scrapers/myrient.py
+import bisect
+import hashlib
 import os
+import mmap
+import struct
 import urllib.parse
 import json
+import zlib
 
-import requests
 import re
-from bs4 import BeautifulSoup
+import sys
 # Attempt to use rapidfuzz for fast fuzzy matching but fall back to difflib
-from scrapers.fuzz_fallback import fuzz
-from scrapers.platform_map import canonicalize_platform_name
+from scrapers.fuzz_fallback import fuzz, process
+from scrapers import gog_games, index_store, memory, paths, rom_tags
+from scrapers.platform_map import MYRIENT_PLATFORM_MAP, PlatformRoute, resolve_platform
 
-BASE_URL = "https://myrient.erista.me/files"
+# Can be overridden via the environment, e.g. to point at a local mock server
+BASE_URL = os.environ.get("MYRIENT_BASE_URL", "https://myrient.erista.me/files").rstrip("/")
 
-# Local index file generated via scripts/update_myrient_index.py
-INDEX_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "myrient_index.txt")
-# File storing crawl progress so that indexing can be resumed
-PROGRESS_PATH = os.path.join(os.path.dirname(INDEX_PATH), "myrient_progress.json")
+# Compressed and text indexes are kept under their own extensions, so text
+# tools and --sort never mistake one for the other
+BLOCKS_SUFFIX = ".blocks"
+TEXT_SUFFIX = ".txt"
 
-_index_cache: list[str] | None = None
+
+def index_path(path: str, compress: bool) -> str:
+    """Return where the index at ``path`` is stored in the given format.
+
+    Names ending in neither suffix are kept as they are.
+    """
+    root, ext = os.path.splitext(path)
+    if ext not in (BLOCKS_SUFFIX, TEXT_SUFFIX):
+        return path
+    return root + (BLOCKS_SUFFIX if compress else TEXT_SUFFIX)
 
 
-def update_index(resume: bool = False) -> None:
-    """Regenerate or resume the local index file by crawling the Myrient directory."""
+# Local index file generated via scripts/update_myrient_index.py; the
+# compressed one when it has been built
+INDEX_PATH = paths.MYRIENT_INDEX
+if os.path.isfile(paths.MYRIENT_BLOCKS_INDEX):
+    INDEX_PATH = paths.MYRIENT_BLOCKS_INDEX
+# File storing crawl progress so that indexing can be resumed
+PROGRESS_PATH = paths.MYRIENT_PROGRESS
+
+_index_cache: list[str] | None = None
+# Memory-mapped view of a sorted index; False once the index proved unsorted
+_sorted_index: "_SortedIndex | None | bool" = None
+# Manifest of the index version being served, if it was published with one
+_manifest: dict | None = None
+_watcher = index_store.Watcher()
+# Per-platform match candidates carved out of the index, keyed by directory
+# prefix; its byte budget is "myrient.platforms" in cacheBudgetsMb
+PLATFORM_CACHE_SIZE = 16
+platform_cache = memory.BoundedCache(
+    "myrient.platforms", max_entries=PLATFORM_CACHE_SIZE, sizeof=lambda c: c.nbytes
+)
+
+# Codec for new compressed indexes. zlib is always available; "zstd" gives
+# smaller blocks but needs the optional zstandard package wherever the index
+# is read
+BLOCK_CODEC = "zlib"
+
+# First bytes of a compressed index; anything else is read as plain text
+BLOCKS_MAGIC = b"MYRIDX\x01\n"
+
+
+def update_index(resume: bool = False, force: bool = False, compress: bool = True) -> None:
+    """Regenerate or resume the local index file by crawling the Myrient directory.
+
+    The crawl is written to :func:`partial_path`; the live index keeps
+    being served until the finished crawl is published by :func:`_publish`.
+    ``force`` publishes it even if it looks much smaller than the last build.
+    The index is written compressed (see :class:`_BlockIndex`) unless
+    ``compress`` is false.
+    """
+    # Only the crawler needs these; searching the index never loads them
+    import requests
+    from bs4 import BeautifulSoup
 
     def crawl(out_file, stack: list[str], count: int) -> list[str]:
         """Recursively collect all file paths from the open directory."""
@@ -62,146 +117,430 @@ def update_index(resume: bool = False) -> None:
         out_file.flush()
         return results
 
-    global _index_cache
     os.makedirs(os.path.dirname(INDEX_PATH), exist_ok=True)
+    partial = partial_path()
 
     stack: list[str]
     count = 0
     mode = "w"
-    if resume and os.path.isfile(PROGRESS_PATH) and os.path.isfile(INDEX_PATH):
+    if resume and os.path.isfile(PROGRESS_PATH) and os.path.isfile(partial):
         with open(PROGRESS_PATH, "r", encoding="utf-8") as pf:
             stack = json.load(pf)
-        count = sum(1 for _ in open(INDEX_PATH, "r", encoding="utf-8"))
+        count = sum(1 for _ in open(partial, "r", encoding="utf-8"))
         mode = "a"
         print(f"[myrient] Resuming crawl with {len(stack)} paths left...")
     else:
         stack = [""]
         print("[myrient] Starting new crawl. This may take a while...")
 
-    with open(INDEX_PATH, mode, encoding="utf-8") as f:
-        entries = crawl(f, stack, count)
+    with open(partial, mode, encoding="utf-8") as f:
+        crawl(f, stack, count)
 
     if os.path.isfile(PROGRESS_PATH):
         os.remove(PROGRESS_PATH)
 
-    _index_cache = None
-    total = count + len(entries)
+    total = _publish(partial, INDEX_PATH, force, compress)
+    os.remove(partial)
     print(f"[myrient] Index updated with {total} entries.")
 
-MYRIENT_PLATFORM_MAP = {
-    "Nintendo Game Boy": "No-Intro/Nintendo - Game Boy",
-    "Nintendo Game Boy Color": "No-Intro/Nintendo - Game Boy Color",
-    "Nintendo Game Boy Advance": "No-Intro/Nintendo - Game Boy Advance",
-    "Nintendo DS": "No-Intro/Nintendo - Nintendo DS (Decrypted)",
-    # Only the BigEndian set is hosted on Myrient
-    "Nintendo 64": "No-Intro/Nintendo - Nintendo 64 (BigEndian)",
-    "Nintendo Entertainment System": "No-Intro/Nintendo - Nintendo Entertainment System (Headered)",
-    "Super Nintendo (SNES)": "No-Intro/Nintendo - Super Nintendo Entertainment System",
-    "Super Nintendo Entertainment System": "No-Intro/Nintendo - Super Nintendo Entertainment System",
-    "Nintendo 3DS": "No-Intro/Nintendo - Nintendo 3DS (Decrypted)",
-    # GameCube titles are provided in the NKit RVZ set
-    "Nintendo GameCube": "Redump/Nintendo - GameCube - NKit RVZ [zstd-19-128k]",
-    "Nintendo Wii": "Redump/Nintendo - Wii",
-    "Nintendo Wii U": "Redump/Nintendo - Wii U",
-    "Sony PlayStation": "Redump/Sony - PlayStation",
-    "Sony PlayStation 2": "Redump/Sony - PlayStation 2",
-    "Sony Playstation 3": "Redump/Sony - PlayStation 3",
-    "Sony Playstation 4": "Redump/Sony - PlayStation 4",
-    "Sony PSP": "Redump/Sony - PlayStation Portable",
-    "Microsoft Xbox": "Redump/Microsoft - Xbox",
-    "Microsoft Xbox 360": "Redump/Microsoft - Xbox 360",
-    # Additional consoles and computers
-    "3DO Interactive Multiplayer": "Redump/Panasonic - 3DO Interactive Multiplayer",
-    "Atari 2600": "No-Intro/Atari - Atari 2600",
-    "Atari 5200": "No-Intro/Atari - 5200",
-    "Atari 7800": "No-Intro/Atari - 7800",
-    "Fujitsu FM Towns Marty": "Redump/Fujitsu - FM-Towns",
-    "Bandai Pippin": "Redump/Bandai - Pippin",
-    "Atari Jaguar CD": "Redump/Atari - Jaguar CD Interactive Multimedia System",
-    "Sega Dreamcast": "Redump/Sega - Dreamcast",
-    "Sega Mega CD": "Redump/Sega - Mega CD & Sega CD",
-    "Sega Game Gear": "No-Intro/Sega - Game Gear",
-    "Sega Genesis": "No-Intro/Sega - Mega Drive - Genesis",
-    "Sega Saturn": "Redump/Sega - Saturn",
-    "Sony Playstation Vita": "No-Intro/Sony - PlayStation Vita (PSN) (Content)",
-    "NEC PC Engine - TurboGrafx-16": "No-Intro/NEC - PC Engine - TurboGrafx-16",
-    "NEC PC Engine CD": "Redump/NEC - PC Engine CD & TurboGrafx CD",
-    "NEC PC-FX": "Redump/NEC - PC-FX & PC-FXGA",
-    "NEC PC-98": "Redump/NEC - PC-98 series",
-    "Panasonic 3DO": "Redump/Panasonic - 3DO Interactive Multiplayer",
-    "Philips CD-i": "Redump/Philips - CD-i",
-    "SNK Neo Geo CD": "Redump/SNK - Neo Geo CD",
-    "Apple Macintosh": "Redump/Apple - Macintosh",
-    "Nintendo Famicom Disk System": "No-Intro/Nintendo - Family Computer Disk System (FDS)",
-    "Nintendo 64 (BigEndian)": "No-Intro/Nintendo - Nintendo 64 (BigEndian)",
-    "Nintendo 64DD": "No-Intro/Nintendo - Nintendo 64DD",
-    "Nintendo Pokemon Mini": "No-Intro/Nintendo - Pokemon Mini",
-    "Nintendo Virtual Boy": "No-Intro/Nintendo - Virtual Boy",
-    "Nintendo New 3DS": "No-Intro/Nintendo - New Nintendo 3DS (Decrypted)",
-    "Nintendo GameCube (NKit)": "Redump/Nintendo - GameCube - NKit RVZ [zstd-19-128k]",
-    "Nintendo Wii (NKit)": "Redump/Nintendo - Wii - NKit RVZ [zstd-19-128k]",
-    "Nintendo Wii U (WUA)": "Internet Archive/teamgt19/nintendo-wii-u-usa-full-set-wua-format-embedded-dlc-updates",
-    "Nintendo Wii U eShop (WUA)": "Internet Archive/teamgt19/nintendo-wii-u-eshop-usa-full-set-wua-format-embedded-dlc-updates",
-    "Sony PlayStation 3 (PSN)": "No-Intro/Sony - PlayStation 3 (PSN) (Content)",
-    # Arcade platforms
-    "Arcade Konami FireBeat": "Redump/Arcade - Konami - FireBeat",
-    "Arcade Konami M2": "Redump/Arcade - Konami - M2",
-    "Arcade Konami System 573": "Redump/Arcade - Konami - System 573",
-    "Arcade Konami System GV": "Redump/Arcade - Konami - System GV",
-    "Arcade Konami e-Amusement": "Redump/Arcade - Konami - e-Amusement",
-    "Arcade Triforce": "Redump/Arcade - Namco - Sega - Nintendo - Triforce",
-    "Arcade Namco System 246": "Redump/Arcade - Namco - System 246",
-    "Arcade Sega Chihiro": "Redump/Arcade - Sega - Chihiro",
-    "Arcade Sega Lindbergh": "Redump/Arcade - Sega - Lindbergh",
-    "Arcade Sega Naomi": "Redump/Arcade - Sega - Naomi",
-    "Arcade Sega Naomi 2": "Redump/Arcade - Sega - Naomi 2",
-    "Arcade Sega RingEdge": "Redump/Arcade - Sega - RingEdge",
-    "Arcade Sega RingEdge 2": "Redump/Arcade - Sega - RingEdge 2",
-    # Total DOS Collection
-    "DOS 1982": "Internet Archive/sketch_the_cow/Total_DOS_Collection_Release_16_March_2019/Games/Files/1982",
-    "DOS 1983": "Internet Archive/sketch_the_cow/Total_DOS_Collection_Release_16_March_2019/Games/Files/1983",
-    "DOS 1985": "Internet Archive/sketch_the_cow/Total_DOS_Collection_Release_16_March_2019/Games/Files/1985",
-    "DOS 1988": "Internet Archive/sketch_the_cow/Total_DOS_Collection_Release_16_March_2019/Games/Files/1988",
-    "DOS 1990": "Internet Archive/sketch_the_cow/Total_DOS_Collection_Release_16_March_2019/Games/Files/1990",
-    "DOS 1991": "Internet Archive/sketch_the_cow/Total_DOS_Collection_Release_16_March_2019/Games/Files/1991",
-    "DOS 1996": "Internet Archive/sketch_the_cow/Total_DOS_Collection_Release_16_March_2019/Games/Files/1996",
-    "DOS 1997": "Internet Archive/sketch_the_cow/Total_DOS_Collection_Release_16_March_2019/Games/Files/1997",
-    "DOS 1999": "Internet Archive/sketch_the_cow/Total_DOS_Collection_Release_16_March_2019/Games/Files/1999",
-    "DOS 199x": "Internet Archive/sketch_the_cow/Total_DOS_Collection_Release_16_March_2019/Games/Files/199x",
-    "DOS 2002": "Internet Archive/sketch_the_cow/Total_DOS_Collection_Release_16_March_2019/Games/Files/2002",
-    "DOS 2003": "Internet Archive/sketch_the_cow/Total_DOS_Collection_Release_16_March_2019/Games/Files/2003",
-    "DOS 2008": "Internet Archive/sketch_the_cow/Total_DOS_Collection_Release_16_March_2019/Games/Files/2008",
-    "DOS 2009": "Internet Archive/sketch_the_cow/Total_DOS_Collection_Release_16_March_2019/Games/Files/2009",
-    "DOS 2011": "Internet Archive/sketch_the_cow/Total_DOS_Collection_Release_16_March_2019/Games/Files/2011",
-    "DOS 2014": "Internet Archive/sketch_the_cow/Total_DOS_Collection_Release_16_March_2019/Games/Files/2014",
-    "DOS 2015": "Internet Archive/sketch_the_cow/Total_DOS_Collection_Release_16_March_2019/Games/Files/2015",
-    # Common PC platforms
-    "PC": "Redump/IBM - PC compatible",
-    "DOS": "Redump/IBM - PC compatible",
-}
+
+def partial_path() -> str:
+    """Return the file an unfinished crawl is written to, as plain text."""
+    return index_path(INDEX_PATH, False) + ".partial"
+
+
+def sort_index(path: str | None = None, force: bool = False, compress: bool = False) -> int:
+    """Sort and de-duplicate the index file in place, returning its size.
+
+    A sorted index can be memory-mapped and binary-searched per platform, so
+    several bot processes share one copy through the page cache. The sorted
+    file is published as a new version, like a crawl; ``compress`` converts
+    it to the compressed format, and a compressed index can be converted
+    back to text. A converted index moves to its format's file name (see
+    :func:`index_path`).
+    """
+    path = path or INDEX_PATH
+    return _publish(path, path, force, compress)
+
+
+def _read_entries(path: str):
+    """Yield the entries of the index file at ``path``, compressed or not."""
+    with open(path, "rb") as f:
+        compressed = f.read(len(BLOCKS_MAGIC)) == BLOCKS_MAGIC
+    if compressed:
+        blocks = _BlockIndex(path)
+        try:
+            yield from blocks
+        finally:
+            blocks.close()
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield line.strip()
+
+
+def _codec():
+    """Return the :data:`BLOCK_CODEC` compressor as ``(name, compress)``."""
+    if BLOCK_CODEC == "zlib":
+        return "zlib", lambda data: zlib.compress(data, 9)
+    if BLOCK_CODEC != "zstd":
+        raise ValueError(f"unknown block codec '{BLOCK_CODEC}'; use zlib or zstd")
+    try:
+        import zstandard
+    except ModuleNotFoundError:
+        raise ValueError("the zstd block codec needs the zstandard package; install it or use zlib") from None
+    return "zstd", zstandard.ZstdCompressor(level=10).compress
+
+
+def _encode_blocks(lines: list[str]) -> list[bytes]:
+    """Return the parts of a compressed index holding the sorted ``lines``."""
+    by_dir: dict[str, list[str]] = {}
+    for line in lines:
+        directory, _, name = line.rpartition("/")
+        by_dir.setdefault(directory, []).append(name)
+    codec, compress = _codec()
+    blocks, parts, offset = [], [], 0
+    # Ordered by "dir/" so every directory under a prefix is one contiguous run
+    for directory in sorted(by_dir, key=_dir_key):
+        names = by_dir[directory]
+        data = compress("\n".join(names).encode("utf-8"))
+        blocks.append([directory, offset, len(data), len(names)])
+        parts.append(data)
+        offset += len(data)
+    header = json.dumps({"codec": codec, "blocks": blocks}).encode("utf-8")
+    return [BLOCKS_MAGIC, struct.pack("<I", len(header)), header, *parts]
+
+
+def _publish(source: str, path: str, force: bool = False, compress: bool = False) -> int:
+    """Write ``source`` sorted and de-duplicated as a new version of the index at ``path``.
+
+    The new version goes to :func:`index_path` for the chosen format; if
+    that is another file, ``path`` is removed once it is published, and
+    running readers follow it there. Raises
+    :class:`~scrapers.index_store.IndexBuildError`, keeping the current
+    index, if the result fails verification.
+    """
+    global INDEX_PATH
+    lines = sorted(set(_read_entries(source)))
+    target = index_path(path, compress)
+    tmp = target + ".new"
+    sha = hashlib.sha256()
+    # Entry counts per directory, compared with the previous build
+    groups: dict[str, int] = {}
+    for line in lines:
+        directory = line.rpartition("/")[0]
+        groups[directory] = groups.get(directory, 0) + 1
+    parts = _encode_blocks(lines) if compress else ((line + "\n").encode("utf-8") for line in lines)
+    with open(tmp, "wb") as f:
+        for data in parts:
+            sha.update(data)
+            f.write(data)
+    manifest = index_store.publish(
+        tmp, target, len(lines), groups, sha.hexdigest(), force=force,
+        previous=index_store.read_manifest(target) or index_store.read_manifest(path),
+        sorted=True, format="blocks" if compress else "text",
+    )
+    if target != path:
+        # One index per name: the other format's file would be stale now
+        for old in (path, index_store.manifest_path(path)):
+            if os.path.exists(old):
+                os.remove(old)
+    if path == INDEX_PATH:
+        INDEX_PATH = target
+        reset_index_cache()
+    print(f"[myrient] Published index version {manifest['version']} ({len(lines)} entries, {len(groups)} directories).")
+    return len(lines)
+
 
 THRESHOLD = 70
 
-# Preferred regions in order of priority
+# Preferred regions in order of priority, unless a lookup passes its own;
+# set from regionPriority in config.json
 REGION_PRIORITY = ["USA", "Europe", "Japan"]
 
+def get_myrient_subpath_exact(platform_name: str | PlatformRoute) -> str | None:
+    return resolve_platform(platform_name).myrient
+
+
+def supports_platform(platform: str | PlatformRoute) -> bool:
+    """Return ``True`` if Myrient should be asked for ``platform``.
+
+    PC and DOS games are left to GOG-Games, as they always have been, even
+    though the Redump PC set has a route.
+    """
+    route = resolve_platform(platform)
+    return route.myrient is not None and route.name.lower() not in gog_games.PLATFORMS
+
+
+class _SortedIndex:
+    """Read-only, memory-mapped view of a sorted index file.
+
+    Lines for one platform directory form a contiguous byte range, found with
+    two binary searches; only that range is ever decoded. The mapping is
+    shared between every process that opens the same file.
+    """
+
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._size = len(self._mm)
+
+    def is_sorted(self) -> bool:
+        prev = b""
+        pos = 0
+        while pos < self._size:
+            end = self._mm.find(b"\n", pos)
+            if end == -1:
+                end = self._size
+            line = self._mm[pos:end].rstrip(b"\r")
+            if line < prev:
+                return False
+            prev = line
+            pos = end + 1
+        return True
+
+    def _lower_bound(self, key: bytes) -> int:
+        """Return the offset of the first line that is ``>= key``."""
+        lo, hi = 0, self._size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = self._mm.rfind(b"\n", 0, mid) + 1
+            end = self._mm.find(b"\n", start)
+            if end == -1:
+                end = self._size
+            if self._mm[start:end].rstrip(b"\r") < key:
+                lo = end + 1
+            else:
+                hi = start
+        return lo
+
+    def entries(self, prefix: str) -> list[str]:
+        key = prefix.encode("utf-8")
+        start = self._lower_bound(key)
+        # 0xFF never occurs in UTF-8, so this bounds every line with the prefix
+        end = self._lower_bound(key + b"\xff")
+        block = self._mm[start:end].decode("utf-8")
+        return [line.strip() for line in block.splitlines() if line.strip()]
+
+    def __iter__(self):
+        pos = 0
+        while pos < self._size:
+            end = self._mm.find(b"\n", pos)
+            if end == -1:
+                end = self._size
+            line = self._mm[pos:end].decode("utf-8").strip()
+            if line:
+                yield line
+            pos = end + 1
+
+    def close(self) -> None:
+        self._mm.close()
+
+
+def _dir_key(directory: str) -> str:
+    return directory + "/" if directory else ""
+
+
+class _BlockIndex:
+    """Read-only, memory-mapped view of a compressed index.
+
+    The file holds one zstd or zlib block per directory, with the names of
+    its files relative to the directory, after a JSON header listing the
+    blocks. Directory prefixes, by far the longest part of most paths, are
+    stored once, and :meth:`entries` only decompresses the blocks under the
+    requested prefix. Offers the same reads as :class:`_SortedIndex`.
+    """
+
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (header_len,) = struct.unpack_from("<I", self._mm, len(BLOCKS_MAGIC))
+        start = len(BLOCKS_MAGIC) + 4
+        header = json.loads(self._mm[start:start + header_len])
+        self._base = start + header_len
+        self._blocks = header["blocks"]
+        self._keys = [_dir_key(block[0]) for block in self._blocks]
+        self._positions = {key: i for i, key in enumerate(self._keys)}
+        if header["codec"] == "zstd":
+            try:
+                import zstandard
+            except ModuleNotFoundError:
+                raise ValueError(
+                    f"{path} was compressed with zstd; install the zstandard package to read it, "
+                    "or convert it with --sort --format text on a host that has it"
+                ) from None
+
+            self._decompress = zstandard.ZstdDecompressor().decompress
+        else:
+            self._decompress = zlib.decompress
+
+    def __len__(self) -> int:
+        return sum(block[3] for block in self._blocks)
+
+    def _block(self, i: int) -> list[str]:
+        _, offset, length, _ = self._blocks[i]
+        start = self._base + offset
+        names = self._decompress(self._mm[start:start + length]).decode("utf-8").split("\n")
+        key = self._keys[i]
+        return [key + name for name in names] if key else names
+
+    def entries(self, prefix: str) -> list[str]:
+        # Directories starting with ``prefix`` form one run of the sorted keys
+        lo = bisect.bisect_left(self._keys, prefix)
+        hi = bisect.bisect_left(self._keys, prefix + "\U0010ffff", lo)
+        found = [entry for i in range(lo, hi) for entry in self._block(i)]
+        merged = hi - lo > 1
+        # A prefix that ends inside a file name selects part of one directory
+        parent = self._positions.get(prefix[:prefix.rfind("/") + 1])
+        if parent is not None and not lo <= parent < hi:
+            found.extend(entry for entry in self._block(parent) if entry.startswith(prefix))
+            merged = True
+        # Same order as a sorted text index, so matching breaks ties alike
+        return sorted(found) if merged else found
+
+    def __iter__(self):
+        for i in range(len(self._blocks)):
+            yield from self._block(i)
+
+    def close(self) -> None:
+        self._mm.close()
+
+
+def _open_index(path: str) -> "_SortedIndex | _BlockIndex":
+    with open(path, "rb") as f:
+        compressed = f.read(len(BLOCKS_MAGIC)) == BLOCKS_MAGIC
+    return _BlockIndex(path) if compressed else _SortedIndex(path)
+
+
+def reset_index_cache() -> None:
+    """Forget every loaded view of the index so the next lookup reloads it."""
+    global _index_cache, _sorted_index, _manifest
+    if isinstance(_sorted_index, (_SortedIndex, _BlockIndex)):
+        _sorted_index.close()
+    _index_cache = None
+    _sorted_index = None
+    _manifest = None
+    platform_cache.clear()
 
-def _region_rank(filename: str) -> int:
-    """Return a rank based on preferred region inside the filename."""
-    upper = filename.upper()
-    for idx, region in enumerate(REGION_PRIORITY):
-        if region.upper() in upper:
-            return idx
-    return len(REGION_PRIORITY)
 
-def get_myrient_subpath_exact(platform_name: str) -> str | None:
-    canonical = canonicalize_platform_name(platform_name)
-    return MYRIENT_PLATFORM_MAP.get(canonical)
+def _check_for_update() -> None:
+    """Switch to a newly published index version once it matches its manifest.
+
+    Until then, and for good if it never does, the current version is served.
+    A version converted to the other format is followed to its file name.
+    """
+    global INDEX_PATH, _index_cache, _sorted_index, _manifest
+    if _sorted_index is None and _index_cache is None:
+        return
+    current = (_manifest or {}).get("version")
+    for path in dict.fromkeys((INDEX_PATH, index_path(INDEX_PATH, True), index_path(INDEX_PATH, False))):
+        manifest = index_store.read_manifest(path) if _watcher.changed(path) else None
+        if manifest is None:
+            continue
+        if path == INDEX_PATH:
+            if manifest["version"] != current:
+                break
+        # Conversions keep numbering versions, so a leftover file is never newer
+        elif manifest["version"] > (current or 0):
+            break
+    else:
+        return
+    try:
+        candidate = _open_index(path)
+    except (OSError, ValueError) as e:
+        print(f"[myrient] cannot open index version {manifest['version']}: {e}")
+        return
+    if not index_store.size_matches(candidate._mm, manifest):
+        candidate.close()
+        print(f"[myrient] index file does not match version {manifest['version']}; keeping the current index")
+        return
+    # The old mapping is left to the garbage collector: another thread may
+    # still be iterating over it
+    if manifest.get("sorted") or isinstance(candidate, _BlockIndex):
+        _sorted_index = candidate
+    else:
+        candidate.close()
+        _sorted_index = None
+    _index_cache = None
+    _manifest = manifest
+    INDEX_PATH = path
+    platform_cache.clear()
+    print(f"[myrient] now serving index version {manifest['version']} ({manifest['entries']} entries)")
+
+
+def _get_sorted_index() -> "_SortedIndex | _BlockIndex | None":
+    """Memory-map the index if it is compressed or sorted; otherwise return ``None``."""
+    global _sorted_index, _manifest
+    _check_for_update()
+    if _sorted_index is None:
+        _sorted_index = False
+        if os.path.isfile(INDEX_PATH) and os.path.getsize(INDEX_PATH) > 0:
+            candidate = _open_index(INDEX_PATH)
+            manifest = index_store.read_manifest(INDEX_PATH)
+            # Checked against its checksum when published; checking the order
+            # line by line would read the whole file on the event loop
+            if manifest is not None and index_store.size_matches(candidate._mm, manifest):
+                _manifest = manifest
+                is_sorted = bool(manifest.get("sorted"))
+            else:
+                if manifest is not None:
+                    print("[myrient] index file does not match its manifest; checking it line by line")
+                is_sorted = isinstance(candidate, _BlockIndex) or candidate.is_sorted()
+            if is_sorted:
+                _sorted_index = candidate
+            else:
+                candidate.close()
+                print(
+                    "[myrient] index is not sorted; loading it into memory. Run "
+                    "scripts/update_myrient_index.py --sort to share it between processes."
+                )
+    return _sorted_index or None
+
+
+def _platform_entries(prefix: str) -> list[str]:
+    """Return every index entry under the directory ``prefix``."""
+    sorted_index = _get_sorted_index()
+    if sorted_index is not None:
+        return sorted_index.entries(prefix)
+    return [entry for entry in _load_index() if entry.startswith(prefix)]
+
+
+def _platform_candidates(prefix: str) -> "_PlatformCandidates":
+    """Return the match candidates for ``prefix``, building them on first use."""
+    cached = platform_cache.get(prefix)
+    if cached is not None:
+        return cached
+    candidates = _PlatformCandidates(_platform_entries(prefix))
+    platform_cache.put(prefix, candidates)
+    return candidates
+
+
+def _index_stats() -> dict:
+    if _index_cache is not None:
+        return {"entries": len(_index_cache)}
+    if _sorted_index:
+        # Counting the lines of a plain index would read all of it
+        entries = len(_sorted_index) if isinstance(_sorted_index, _BlockIndex) else (_manifest or {}).get("entries")
+        return {"entries": entries, "mapped_bytes": len(_sorted_index._mm)}
+    return {"entries": 0}
+
+
+memory.register("myrient.index", lambda: (_index_cache, _sorted_index or None), _index_stats)
+
+
+def iter_index():
+    """Yield every index entry without holding a full copy when mapped."""
+    sorted_index = _get_sorted_index()
+    if sorted_index is not None:
+        return iter(sorted_index)
+    return iter(_load_index())
 
 
 def _load_index() -> list[str]:
     """Loads the local index from INDEX_PATH, or returns an empty list."""
     global _index_cache
+    _check_for_update()
     if _index_cache is not None:
         return _index_cache
     if not os.path.isfile(INDEX_PATH) or os.path.getsize(INDEX_PATH) == 0:
@@ -211,8 +550,7 @@ def _load_index() -> list[str]:
         )
         _index_cache = []
     else:
-        with open(INDEX_PATH, "r", encoding="utf-8") as f:
-            _index_cache = [line.strip() for line in f if line.strip()]
+        _index_cache = list(_read_entries(INDEX_PATH))
     return _index_cache
 
 DISC_RE = re.compile(r"(?:disc|disk|cd)\s*(\d+)(?:\s*of\s*\d+)?", re.I)
@@ -223,10 +561,9 @@ _PAREN_RE = re.compile(r"\s*\([^)]*\)")
 
 def _normalize_title(title: str) -> str:
     """Lowercase ``title`` and strip parenthetical info."""
-    title = _PAREN_RE.sub("", title)
-    title = title.replace("_", " ")
-    title = re.sub(r"\s+", " ", title)
-    return title.strip().lower()
+    title = _PAREN_RE.sub("", title).replace("_", " ")
+    # Collapses whitespace like re.sub(r"\s+", " ", ...).strip(), at C speed
+    return " ".join(title.split()).lower()
 
 
 def _extract_disc_info(name: str) -> tuple[str, int | None]:
@@ -239,76 +576,198 @@ def _extract_disc_info(name: str) -> tuple[str, int | None]:
     return base, disc
 
 
-async def search_myrient(game_title: str, platform_name: str) -> list[tuple[str, int | None]]:
+# "(Track 02)" in the file names of a multi-track CD image
+TRACK_RE = re.compile(r"\s*\(track\s*(\d+)\)", re.I)
+# Left behind once a "(Disc 2)" tag has been removed
+_EMPTY_PARENS_RE = re.compile(r"\s*\(\s*\)")
+# Playlists come first in a release, then each disc's sheet, then its images
+_PLAYLIST_EXTS = {".m3u", ".m3u8"}
+_SHEET_EXTS = {".cue", ".gdi", ".ccd", ".mds", ".toc"}
+
+
+def _file_parts(fname: str) -> tuple[str, int | None, int, int]:
+    """Return ``(release, disc, role, track)`` for one file name.
+
+    ``release`` is the name without its disc and track tags and extension;
+    the files sharing it (discs, a cue sheet and its tracks, an ``.m3u``
+    playlist) make up one release. ``role`` orders a disc's files.
+    """
+    stem, dot, ext = fname.rpartition(".")
+    if not dot or " " in ext or len(ext) > 5:
+        stem, ext = fname, ""
+    ext = "." + ext.lower()
+    role = 0 if ext in _PLAYLIST_EXTS else 1 if ext in _SHEET_EXTS else 2
+    # Most files have neither tag; skip the regular expressions for them
+    lower = stem.lower()
+    disc, track = None, 0
+    if "disc" in lower or "disk" in lower or "cd" in lower:
+        stem, disc = _extract_disc_info(stem)
+    if "track" in lower:
+        match = TRACK_RE.search(stem)
+        if match:
+            track = int(match.group(1))
+            stem = TRACK_RE.sub("", stem)
+    if disc is not None or track:
+        stem = _EMPTY_PARENS_RE.sub("", stem).strip()
+    return stem, disc, role, track
+
+
+class _PlatformCandidates:
+    """One platform's index entries, grouped into releases once for matching.
+
+    Each release (see :func:`_file_parts`) is one candidate, and its files
+    are kept in download order: playlist, then disc by disc, sheet before
+    tracks. Betas, prototypes, demos, kiosk builds, bad dumps and BIOS files
+    are dropped; the region and revision tags of the rest are kept as
+    integers (see :mod:`scrapers.rom_tags`).
+    """
+
+    def __init__(self, entries: list[str]) -> None:
+        # Every kept file, with its disc number
+        self.entries: list[str] = []
+        self.discs: list[int | None] = []
+        # Per release: name of its first file, normalized title, region bits,
+        # revision and the positions of its files in ``entries``
+        self.names: list[str] = []
+        self.norms: list[str] = []
+        self.regions: list[int] = []
+        self.revisions: list[int] = []
+        self.sets: list[tuple[int, ...]] = []
+        # normalized title -> candidate positions, for exact matches
+        self.exact: dict[str, list[int]] = {}
+        # lowercased release -> [release, tags, file positions...]
+        releases: dict[str, list] = {}
+        for entry in entries:
+            fname = entry.rpartition("/")[2]
+            tags = rom_tags.parse(fname)
+            if tags.flags & rom_tags.SKIP:
+                continue
+            release, disc, _, _ = _file_parts(fname)
+            key = release.lower()
+            files = releases.get(key)
+            if files is None:
+                releases[key] = [release, tags, len(self.entries)]
+            else:
+                files.append(len(self.entries))
+            self.entries.append(entry)
+            self.discs.append(disc)
+        for files in releases.values():
+            release, tags = files[0], files[1]
+            if len(files) == 3:
+                positions = (files[2],)
+            else:
+                positions = tuple(sorted(files[2:], key=self._file_order))
+            norm = _normalize_title(release)
+            self.exact.setdefault(norm, []).append(len(self.norms))
+            self.names.append(self.entries[positions[0]].rpartition("/")[2])
+            self.norms.append(norm)
+            self.regions.append(tags.regions)
+            self.revisions.append(tags.revision)
+            self.sets.append(positions)
+        self.nbytes = self._estimate_size()
+
+    def _estimate_size(self) -> int:
+        """Bytes held by the candidates, counting each string and container once."""
+        size = sys.getsizeof
+        total = sum(map(size, self.entries)) + sum(map(size, self.names)) + sum(map(size, self.norms))
+        total += sum(map(size, self.sets)) + sum(map(size, self.exact.values())) + size(self.exact)
+        for column in (self.entries, self.discs, self.names, self.norms, self.regions, self.revisions, self.sets):
+            total += size(column)
+        return total
+
+    def _file_order(self, i: int) -> tuple:
+        fname = self.entries[i].rpartition("/")[2]
+        _, disc, role, track = _file_parts(fname)
+        return disc or 0, role, track, fname
+
+    def _rank(self, i: int, masks: tuple[int, ...]) -> int:
+        """Lower is better: preferred region first, then the earliest revision."""
+        return rom_tags.region_rank(self.regions[i], masks) << 16 | min(self.revisions[i], 0xFFFF)
+
+    def scores(self, target_norm: str) -> dict[int, float]:
+        """Return ``{position: score}`` for candidates scoring at least THRESHOLD."""
+        exact = self.exact.get(target_norm)
+        if exact:
+            # Exact matches always win
+            return {i: 200 for i in exact}
+        if process is not None:
+            matches = process.extract(
+                target_norm, self.norms, scorer=fuzz.WRatio, score_cutoff=THRESHOLD, limit=None
+            )
+            return {i: score for _, score, i in matches}
+        hits = {}
+        for i, norm in enumerate(self.norms):
+            score = fuzz.WRatio(norm, target_norm)
+            if score >= THRESHOLD:
+                hits[i] = score
+        return hits
+
+    def pick(
+        self, hits: dict[int, float], verbose: bool = True, regions: list[str] | None = None
+    ) -> list[tuple[str, int | None]]:
+        """Return every file of the best matching release as ``(url, disc)``.
+
+        Ties on score go to the first region in ``regions`` (default
+        :data:`REGION_PRIORITY`), then to the earliest revision.
+        """
+        if not hits:
+            return []
+        masks = rom_tags.preference(tuple(regions or REGION_PRIORITY))
+        best = max(hits, key=lambda i: (hits[i], -self._rank(i, masks)))
+        files = self.sets[best]
+        if verbose:
+            print(
+                f"[myrient] Best match: '{self.names[best]}' (score={hits[best]}, "
+                f"region_rank={self._rank(best, masks) >> 16}, files={len(files)}) => {self._url(files[0])}"
+            )
+        return [(self._url(f), self.discs[f]) for f in files]
+
+    def _url(self, i: int) -> str:
+        return f"{BASE_URL}/{urllib.parse.quote(self.entries[i], safe='/')}"
+
+
+async def search_myrient(
+    game_title: str, platform_name: str | PlatformRoute, regions: list[str] | None = None
+) -> list[tuple[str, int | None]]:
     """Search the local Myrient index for matching files.
 
     Returns a list of tuples ``(url, disc_number)``. ``disc_number`` will be
     ``None`` for single disc games or when no disc information could be
-    determined.
+    determined. ``regions`` overrides :data:`REGION_PRIORITY`.
     """
-    subpath = get_myrient_subpath_exact(platform_name)
+    route = resolve_platform(platform_name)
+    subpath = route.myrient
     if subpath is None:
-        print(f"[myrient] No subpath mapping for '{platform_name}'")
+        print(f"[myrient] No subpath mapping for '{route.name}'")
         return []
 
-    index = _load_index()
-    if not index:
-        return []
+    candidates = _platform_candidates(subpath.rstrip("/") + "/")
+    return candidates.pick(candidates.scores(_normalize_title(game_title)), regions=regions)
 
-    candidates = []
-    target_norm = _normalize_title(game_title)
-    prefix = subpath.rstrip("/") + "/"
-    for entry in index:
-        if not entry.startswith(prefix):
-            continue
-        fname = os.path.basename(entry)
-        lower_fname = fname.lower()
-        if (
-            "(rev" in lower_fname
-            or "lodgenet" in lower_fname
-            or "demo" in lower_fname
-            or "prototype" in lower_fname
-            or "beta" in lower_fname
-        ):
-            # Skip later revisions, LodgeNet kiosk versions, demos, and prototypes
-            continue
-        base, _ = _extract_disc_info(fname)
-        norm = _normalize_title(base)
-        score = fuzz.WRatio(norm, target_norm)
-        if norm == target_norm:
-            score = 200  # Prefer exact normalized matches
-        if score >= THRESHOLD:
-            encoded_path = urllib.parse.quote(entry, safe="/")
-            url = f"{BASE_URL}/{encoded_path}"
-            region = _region_rank(fname)
-            candidates.append((region, score, url, fname))
-
-    if not candidates:
-        return []
 
-    best_region, best_score, best_url, best_name = max(
-        candidates, key=lambda t: (t[1], -t[0])
-    )
-    best_base, best_disc = _extract_disc_info(best_name)
-    print(
-        f"[myrient] Best match: '{best_name}' (score={best_score}, region_rank={best_region}) => {best_url}"
-    )
-    if best_disc is None:
-        return [(best_url, None)]
-
-    # Collect the best candidate for each disc that shares the same base name
-    discs: dict[int, tuple[int, int, str, str]] = {}
-    for region, score, url, fname in candidates:
-        base, disc = _extract_disc_info(fname)
-        if disc is None or base.lower() != best_base.lower():
-            continue
-        prev = discs.get(disc)
-        if prev is None or (score, -region) > (prev[1], -prev[0]):
-            discs[disc] = (region, score, url, fname)
+def match_many(
+    titles: list[str], platform: str | PlatformRoute, regions: list[str] | None = None
+) -> list[list[tuple[str, int | None]]]:
+    """Batch form of :func:`search_myrient` for many titles on one platform.
 
-    results = [(discs[d][2], d) for d in sorted(discs)]
-    return results
-
-async def get_myrient_download_links(game_title: str, platform_name: str) -> list[tuple[str, int | None]]:
+    The platform's candidates are prepared once and each distinct title is
+    scored once; nothing is logged per title.
+    """
+    subpath = resolve_platform(platform).myrient
+    if subpath is None:
+        return [[] for _ in titles]
+    candidates = _platform_candidates(subpath.rstrip("/") + "/")
+    results: dict[str, list[tuple[str, int | None]]] = {}
+    out = []
+    for title in titles:
+        target = _normalize_title(title)
+        if target not in results:
+            results[target] = candidates.pick(candidates.scores(target), verbose=False, regions=regions)
+        out.append(results[target])
+    return out
+
+async def get_myrient_download_links(
+    game_title: str, platform_name: str | PlatformRoute, regions: list[str] | None = None
+) -> list[tuple[str, int | None]]:
     """Convenience wrapper around :func:`search_myrient`."""
-    return await search_myrient(game_title, platform_name)
+    return await search_myrient(game_title, platform_name, regions)
@@ -0,0 +1,23 @@
+# scrapers/paths.py
+"""Default locations of the bot's data files.
+
+Kept free of third-party imports so scripts that only need a path (e.g.
+``scripts/update_emulatorjs_index.py``) don't load the scrapers themselves.
+Modules copy these defaults into their own globals, which configuration and
+tooling may still override at runtime.
+"""
+
+import os
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+# Generated by scripts/update_myrient_index.py: compressed blocks by default,
+# a plain sorted list with --format text
+MYRIENT_BLOCKS_INDEX = os.path.join(DATA_DIR, "myrient_index.blocks")
+MYRIENT_INDEX = os.path.join(DATA_DIR, "myrient_index.txt")
+MYRIENT_PROGRESS = os.path.join(DATA_DIR, "myrient_progress.json")
+# Generated by scripts/update_emulatorjs_index.py
+EMULATORJS_INDEX = os.path.join(DATA_DIR, "emulatorjs_index.json")
+# Populated by scripts/sync_thegamesdb_mirror.py
+TGDB_MIRROR = os.path.join(DATA_DIR, "thegamesdb.sqlite")
+SHARED_CACHE = os.path.join(DATA_DIR, "cache.sqlite")
@@ -1,5 +1,18 @@
 # scrapers/platform_map.py
+"""Platform routing for every download provider.
 
+The three provider maps below are keyed by TheGamesDB platform names. At
+import they are merged into one frozen :class:`PlatformRoute` per platform,
+reachable by name, by any alias in :data:`PLATFORM_SYNONYMS` and, once seen
+in an API response, by TheGamesDB platform id. Call :func:`resolve_platform`
+once per lookup and hand the route to the providers.
+"""
+
+from __future__ import annotations
+
+from typing import NamedTuple
+
+# RomsPure section slugs
 ROMSPURE_PLATFORM_MAP = {
     "3DO Interactive Multiplayer": "3do-interactive-multiplayer",
     "Atari 2600": "atari-2600",
@@ -62,19 +75,219 @@ PLATFORM_SYNONYMS = {
     "nintendo 64": "Nintendo 64",  # allow lowercase normalization
     "n64": "Nintendo 64",
     "nintendo n64": "Nintendo 64",
+    # Names TheGamesDB uses that differ from the provider maps
+    "nintendo entertainment system (nes)": "Nintendo Entertainment System",
+    "nes": "Nintendo Entertainment System",
+    "famicom": "Nintendo Entertainment System",
+    "snes": "Super Nintendo (SNES)",
+    "nds": "Nintendo DS",
+    "nintendo pokémon mini": "Nintendo Pokemon Mini",
+    "sega mega drive": "Sega Genesis",
+    "sega mega drive - genesis": "Sega Genesis",
+    "mega drive": "Sega Genesis",
+    "genesis": "Sega Genesis",
+    "sega cd": "Sega Mega CD",
+    "sony playstation portable": "Sony PSP",
+    "playstation portable": "Sony PSP",
+    "psp": "Sony PSP",
+    "panasonic 3do": "3DO Interactive Multiplayer",
+    "turbografx 16": "NEC PC Engine - TurboGrafx-16",
+    "turbografx-16": "NEC PC Engine - TurboGrafx-16",
+    "pc engine": "NEC PC Engine - TurboGrafx-16",
+    "turbografx cd": "NEC PC Engine CD",
+    "neo geo": "SNK Neo Geo AES",
+    "neo geo cd": "SNK Neo Geo CD",
+    "nec pc-98": "NEC PC-98",
+    "pc-98": "NEC PC-98",
+    "mac os": "Apple Macintosh",
+    "ms-dos": "DOS",
+}
+
+# Myrient directories, relative to the files root
+MYRIENT_PLATFORM_MAP = {
+    "Nintendo Game Boy": "No-Intro/Nintendo - Game Boy",
+    "Nintendo Game Boy Color": "No-Intro/Nintendo - Game Boy Color",
+    "Nintendo Game Boy Advance": "No-Intro/Nintendo - Game Boy Advance",
+    "Nintendo DS": "No-Intro/Nintendo - Nintendo DS (Decrypted)",
+    # Only the BigEndian set is hosted on Myrient
+    "Nintendo 64": "No-Intro/Nintendo - Nintendo 64 (BigEndian)",
+    "Nintendo Entertainment System": "No-Intro/Nintendo - Nintendo Entertainment System (Headered)",
+    "Super Nintendo (SNES)": "No-Intro/Nintendo - Super Nintendo Entertainment System",
+    "Super Nintendo Entertainment System": "No-Intro/Nintendo - Super Nintendo Entertainment System",
+    "Nintendo 3DS": "No-Intro/Nintendo - Nintendo 3DS (Decrypted)",
+    # GameCube titles are provided in the NKit RVZ set
+    "Nintendo GameCube": "Redump/Nintendo - GameCube - NKit RVZ [zstd-19-128k]",
+    "Nintendo Wii": "Redump/Nintendo - Wii",
+    "Nintendo Wii U": "Redump/Nintendo - Wii U",
+    "Sony PlayStation": "Redump/Sony - PlayStation",
+    "Sony PlayStation 2": "Redump/Sony - PlayStation 2",
+    "Sony Playstation 3": "Redump/Sony - PlayStation 3",
+    "Sony Playstation 4": "Redump/Sony - PlayStation 4",
+    "Sony PSP": "Redump/Sony - PlayStation Portable",
+    "Microsoft Xbox": "Redump/Microsoft - Xbox",
+    "Microsoft Xbox 360": "Redump/Microsoft - Xbox 360",
+    # Additional consoles and computers
+    "3DO Interactive Multiplayer": "Redump/Panasonic - 3DO Interactive Multiplayer",
+    "Atari 2600": "No-Intro/Atari - Atari 2600",
+    "Atari 5200": "No-Intro/Atari - 5200",
+    "Atari 7800": "No-Intro/Atari - 7800",
+    "Fujitsu FM Towns Marty": "Redump/Fujitsu - FM-Towns",
+    "Bandai Pippin": "Redump/Bandai - Pippin",
+    "Atari Jaguar CD": "Redump/Atari - Jaguar CD Interactive Multimedia System",
+    "Sega Dreamcast": "Redump/Sega - Dreamcast",
+    "Sega Mega CD": "Redump/Sega - Mega CD & Sega CD",
+    "Sega Game Gear": "No-Intro/Sega - Game Gear",
+    "Sega Genesis": "No-Intro/Sega - Mega Drive - Genesis",
+    "Sega Saturn": "Redump/Sega - Saturn",
+    "Sony Playstation Vita": "No-Intro/Sony - PlayStation Vita (PSN) (Content)",
+    "NEC PC Engine - TurboGrafx-16": "No-Intro/NEC - PC Engine - TurboGrafx-16",
+    "NEC PC Engine CD": "Redump/NEC - PC Engine CD & TurboGrafx CD",
+    "NEC PC-FX": "Redump/NEC - PC-FX & PC-FXGA",
+    "NEC PC-98": "Redump/NEC - PC-98 series",
+    "Panasonic 3DO": "Redump/Panasonic - 3DO Interactive Multiplayer",
+    "Philips CD-i": "Redump/Philips - CD-i",
+    "SNK Neo Geo CD": "Redump/SNK - Neo Geo CD",
+    "Apple Macintosh": "Redump/Apple - Macintosh",
+    "Nintendo Famicom Disk System": "No-Intro/Nintendo - Family Computer Disk System (FDS)",
+    "Nintendo 64 (BigEndian)": "No-Intro/Nintendo - Nintendo 64 (BigEndian)",
+    "Nintendo 64DD": "No-Intro/Nintendo - Nintendo 64DD",
+    "Nintendo Pokemon Mini": "No-Intro/Nintendo - Pokemon Mini",
+    "Nintendo Virtual Boy": "No-Intro/Nintendo - Virtual Boy",
+    "Nintendo New 3DS": "No-Intro/Nintendo - New Nintendo 3DS (Decrypted)",
+    "Nintendo GameCube (NKit)": "Redump/Nintendo - GameCube - NKit RVZ [zstd-19-128k]",
+    "Nintendo Wii (NKit)": "Redump/Nintendo - Wii - NKit RVZ [zstd-19-128k]",
+    "Nintendo Wii U (WUA)": "Internet Archive/teamgt19/nintendo-wii-u-usa-full-set-wua-format-embedded-dlc-updates",
+    "Nintendo Wii U eShop (WUA)": "Internet Archive/teamgt19/nintendo-wii-u-eshop-usa-full-set-wua-format-embedded-dlc-updates",
+    "Sony PlayStation 3 (PSN)": "No-Intro/Sony - PlayStation 3 (PSN) (Content)",
+    # Arcade platforms
+    "Arcade Konami FireBeat": "Redump/Arcade - Konami - FireBeat",
+    "Arcade Konami M2": "Redump/Arcade - Konami - M2",
+    "Arcade Konami System 573": "Redump/Arcade - Konami - System 573",
+    "Arcade Konami System GV": "Redump/Arcade - Konami - System GV",
+    "Arcade Konami e-Amusement": "Redump/Arcade - Konami - e-Amusement",
+    "Arcade Triforce": "Redump/Arcade - Namco - Sega - Nintendo - Triforce",
+    "Arcade Namco System 246": "Redump/Arcade - Namco - System 246",
+    "Arcade Sega Chihiro": "Redump/Arcade - Sega - Chihiro",
+    "Arcade Sega Lindbergh": "Redump/Arcade - Sega - Lindbergh",
+    "Arcade Sega Naomi": "Redump/Arcade - Sega - Naomi",
+    "Arcade Sega Naomi 2": "Redump/Arcade - Sega - Naomi 2",
+    "Arcade Sega RingEdge": "Redump/Arcade - Sega - RingEdge",
+    "Arcade Sega RingEdge 2": "Redump/Arcade - Sega - RingEdge 2",
+    # Total DOS Collection
+    "DOS 1982": "Internet Archive/sketch_the_cow/Total_DOS_Collection_Release_16_March_2019/Games/Files/1982",
+    "DOS 1983": "Internet Archive/sketch_the_cow/Total_DOS_Collection_Release_16_March_2019/Games/Files/1983",
+    "DOS 1985": "Internet Archive/sketch_the_cow/Total_DOS_Collection_Release_16_March_2019/Games/Files/1985",
+    "DOS 1988": "Internet Archive/sketch_the_cow/Total_DOS_Collection_Release_16_March_2019/Games/Files/1988",
+    "DOS 1990": "Internet Archive/sketch_the_cow/Total_DOS_Collection_Release_16_March_2019/Games/Files/1990",
+    "DOS 1991": "Internet Archive/sketch_the_cow/Total_DOS_Collection_Release_16_March_2019/Games/Files/1991",
+    "DOS 1996": "Internet Archive/sketch_the_cow/Total_DOS_Collection_Release_16_March_2019/Games/Files/1996",
+    "DOS 1997": "Internet Archive/sketch_the_cow/Total_DOS_Collection_Release_16_March_2019/Games/Files/1997",
+    "DOS 1999": "Internet Archive/sketch_the_cow/Total_DOS_Collection_Release_16_March_2019/Games/Files/1999",
+    "DOS 199x": "Internet Archive/sketch_the_cow/Total_DOS_Collection_Release_16_March_2019/Games/Files/199x",
+    "DOS 2002": "Internet Archive/sketch_the_cow/Total_DOS_Collection_Release_16_March_2019/Games/Files/2002",
+    "DOS 2003": "Internet Archive/sketch_the_cow/Total_DOS_Collection_Release_16_March_2019/Games/Files/2003",
+    "DOS 2008": "Internet Archive/sketch_the_cow/Total_DOS_Collection_Release_16_March_2019/Games/Files/2008",
+    "DOS 2009": "Internet Archive/sketch_the_cow/Total_DOS_Collection_Release_16_March_2019/Games/Files/2009",
+    "DOS 2011": "Internet Archive/sketch_the_cow/Total_DOS_Collection_Release_16_March_2019/Games/Files/2011",
+    "DOS 2014": "Internet Archive/sketch_the_cow/Total_DOS_Collection_Release_16_March_2019/Games/Files/2014",
+    "DOS 2015": "Internet Archive/sketch_the_cow/Total_DOS_Collection_Release_16_March_2019/Games/Files/2015",
+    # Common PC platforms
+    "PC": "Redump/IBM - PC compatible",
+    "DOS": "Redump/IBM - PC compatible",
+}
+
+# EmulatorJS system codes
+EMULATORJS_PLATFORM_MAP = {
+    "Nintendo Game Boy": "gb",
+    "Nintendo Game Boy Color": "gbc",
+    "Nintendo Game Boy Advance": "gba",
+    "Nintendo Entertainment System": "nes",
+    "Super Nintendo (SNES)": "snes",
+    "Super Nintendo Entertainment System": "snes",
+    "Nintendo 64": "n64",
+    "Sega Genesis": "segaMD",
+    "Sega Mega Drive - Genesis": "segaMD",
+    "Sega Mega Drive": "segaMD",
+    "Sony PlayStation": "psx",
+    "3DO Interactive Multiplayer": "3do",
 }
 
-_PLATFORM_SYNONYMS_LOWER = {k.lower(): v for k, v in PLATFORM_SYNONYMS.items()}
+
+class PlatformRoute(NamedTuple):
+    """Where each provider keeps one platform; ``None`` means not carried."""
+
+    name: str
+    romspure: str | None = None
+    myrient: str | None = None
+    emulatorjs: str | None = None
+
+    @property
+    def routed(self) -> bool:
+        return any((self.romspure, self.myrient, self.emulatorjs))
+
+
+def _build_routes() -> dict[str, PlatformRoute]:
+    # Map keys differ in capitalisation ("Sony PlayStation" vs "Playstation")
+    lowered = [
+        {k.lower(): v for k, v in m.items()}
+        for m in (ROMSPURE_PLATFORM_MAP, MYRIENT_PLATFORM_MAP, EMULATORJS_PLATFORM_MAP)
+    ]
+    routes: dict[str, PlatformRoute] = {}
+    for name in (*ROMSPURE_PLATFORM_MAP, *MYRIENT_PLATFORM_MAP, *EMULATORJS_PLATFORM_MAP):
+        key = name.lower()
+        if key not in routes:
+            routes[key] = PlatformRoute(name, *(m.get(key) for m in lowered))
+    for alias, canonical in PLATFORM_SYNONYMS.items():
+        route = routes.get(canonical.lower())
+        if route is None:
+            raise ValueError(f"platform alias '{alias}' points at unknown platform '{canonical}'")
+        routes[alias.lower()] = route
+    return routes
+
+
+_ROUTES = _build_routes()
+_ROUTES_BY_ID: dict[int, PlatformRoute] = {}
+
+
+def resolve_platform(platform: str | int | PlatformRoute) -> PlatformRoute:
+    """Return the route for a platform name, alias, TheGamesDB id or route.
+
+    Unknown names resolve to a route with no providers; unknown ids resolve
+    to an empty route named "Unknown".
+    """
+    if isinstance(platform, PlatformRoute):
+        return platform
+    if isinstance(platform, int):
+        return _ROUTES_BY_ID.get(platform) or PlatformRoute("Unknown")
+    return _ROUTES.get(platform.strip().lower()) or PlatformRoute(platform)
+
+
+def register_platform_id(platform_id: int | str, name: str) -> None:
+    """Remember which platform a TheGamesDB id stands for."""
+    _ROUTES_BY_ID[int(platform_id)] = resolve_platform(name)
+
+
+def register_platform_include(include: dict) -> None:
+    """Record the ids in an API response's ``include.platform.data`` block."""
+    for pid, pdata in include.get("platform", {}).get("data", {}).items():
+        if pdata.get("name"):
+            register_platform_id(pid, pdata["name"])
+
+
+def known_platforms() -> list[PlatformRoute]:
+    """Return every distinct route, for validation tooling."""
+    return sorted(set(_ROUTES.values()), key=lambda r: r.name.lower())
+
 
 def canonicalize_platform_name(name: str) -> str:
     """Return the canonical platform name for lookups."""
-    return _PLATFORM_SYNONYMS_LOWER.get(name.lower(), name)
+    return resolve_platform(name).name
+
 
-def get_romspure_subpath_exact(platform_name: str) -> str | None:
+def get_romspure_subpath_exact(platform_name: str | PlatformRoute) -> str | None:
     """
     Returns the romspure subpath for the given TheGamesDB platform name.
-    Handles common aliases via canonicalize_platform_name().
+    Handles common aliases via resolve_platform().
     If there is no exact match, returns None.
     """
-    canonical = canonicalize_platform_name(platform_name)
-    return ROMSPURE_PLATFORM_MAP.get(canonical)
+    return resolve_platform(platform_name).romspure
@@ -0,0 +1,65 @@
+# scrapers/providers.py
+"""Registry of download-link providers.
+
+Each :class:`Provider` declares which platforms it can serve, its priority
+and how long a lookup may take. :func:`providers_for` returns the providers
+for one platform, so the aggregator never starts a lookup that is bound to
+find nothing. Register extra providers with :func:`register`.
+"""
+
+from __future__ import annotations
+
+from typing import Awaitable, Callable
+
+from scrapers.circuit_breaker import CircuitBreaker
+from scrapers.platform_map import PlatformRoute, resolve_platform
+
+# ``fetch(title, route)`` returns ``(url, disc_number)`` pairs; regional
+# providers also take ``regions=``, the preferred release regions
+Fetch = Callable[[str, PlatformRoute], Awaitable[list[tuple[str, int | None]]]]
+
+
+class Provider:
+    def __init__(
+        self,
+        name: str,
+        fetch: Fetch,
+        supports: Callable[[PlatformRoute], bool],
+        priority: int = 0,
+        timeout: float = 10.0,
+        breaker: CircuitBreaker | None = None,
+        regional: bool = False,
+    ) -> None:
+        """Describe a provider.
+
+        ``name`` labels its links in the embed, lower ``priority`` values are
+        listed first, and ``timeout`` bounds lookups that are not guarded by
+        a ``breaker`` (which sets its own adaptive timeout). ``regional``
+        providers pick between regional releases and are passed the
+        lookup's region preference.
+        """
+        self.name = name
+        self.fetch = fetch
+        self.supports = supports
+        self.priority = priority
+        self.timeout = timeout
+        self.breaker = breaker
+        self.regional = regional
+
+
+REGISTRY: dict[str, Provider] = {}
+
+
+def register(provider: Provider) -> Provider:
+    """Add ``provider``, replacing any provider with the same name."""
+    REGISTRY[provider.name] = provider
+    return provider
+
+
+def providers_for(platform: str | PlatformRoute) -> list[Provider]:
+    """Return the providers supporting ``platform``, by priority."""
+    route = resolve_platform(platform)
+    return sorted(
+        (p for p in REGISTRY.values() if p.supports(route)),
+        key=lambda p: p.priority,
+    )
@@ -0,0 +1,148 @@
+# scrapers/rate_limit.py
+"""Priority token-bucket scheduler with monthly-quota awareness.
+
+Requests wait for a token from a bucket refilled at ``rate`` per second (up
+to ``burst`` tokens). When several requests are waiting, the one with the
+lowest priority value goes first, so interactive lookups overtake background
+work. The scheduler also tracks the remaining allowance reported by the API
+and sheds lower-priority requests, by raising :class:`QuotaExceeded`, once
+the allowance falls below ``reserve``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+
+# Priorities, most urgent first
+INTERACTIVE = 0  # a user is waiting on this exact response
+DROPDOWN = 1  # nice-to-have details for the selection menu
+BACKGROUND = 2  # speculative or maintenance work
+
+
+class QuotaExceeded(RuntimeError):
+    """Raised when a request is shed to preserve the remaining quota."""
+
+
+class Ticket:
+    """A priority that can be raised later with :meth:`RequestScheduler.promote`.
+
+    Pass the same ticket for every request of one unit of work, e.g. a
+    speculative prefetch, so the whole unit can be promoted at once.
+    """
+
+    def __init__(self, priority: int) -> None:
+        self.priority = priority
+
+
+class RequestScheduler:
+    def __init__(self, rate: float = 5.0, burst: int = 10, reserve: int = 300) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.reserve = reserve
+        self.remaining: int | None = None
+        self._refresh_at = 0.0
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._waiters: list[tuple[int, int, asyncio.Future, Ticket | None]] = []
+        self._seq = itertools.count()
+        self._dispatcher: asyncio.Task | None = None
+
+    def configure(self, rate: float, burst: int, reserve: int) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.reserve = reserve
+        self._tokens = min(self._tokens, float(burst))
+
+    # -- quota -----------------------------------------------------------
+    def update_allowance(self, data: dict) -> None:
+        """Record the allowance fields from an API response, if present."""
+        monthly = data.get("remaining_monthly_allowance")
+        if monthly is None:
+            return
+        previous = self.remaining
+        self.remaining = int(monthly) + int(data.get("extra_allowance") or 0)
+        refresh = data.get("allowance_refresh_timer")
+        if refresh is not None:
+            self._refresh_at = time.monotonic() + float(refresh)
+        for limit, what in ((self.reserve, "background"), (self.reserve // 2, "dropdown")):
+            if self.remaining <= limit and (previous is None or previous > limit):
+                print(f"[thegamesdb] {self.remaining} calls left this month; shedding {what} requests")
+
+    def _min_remaining(self, priority: int) -> int:
+        """Return the allowance below which ``priority`` is shed."""
+        if priority >= BACKGROUND:
+            return self.reserve
+        if priority >= DROPDOWN:
+            return self.reserve // 2
+        return 0
+
+    def allows(self, priority: int) -> bool:
+        """Return ``True`` if the quota still permits ``priority`` requests."""
+        if self.remaining is None:
+            return True
+        if self._refresh_at and time.monotonic() >= self._refresh_at:
+            # The monthly allowance has been refreshed since we last heard
+            self.remaining = None
+            return True
+        return self.remaining > self._min_remaining(priority)
+
+    # -- rate limiting ---------------------------------------------------
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(float(self.burst), self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, priority: int | Ticket = INTERACTIVE) -> None:
+        """Wait for permission to send one request at ``priority``."""
+        ticket = priority if isinstance(priority, Ticket) else None
+        if ticket is not None:
+            priority = ticket.priority
+        if not self.allows(priority):
+            raise QuotaExceeded(f"TheGamesDB allowance low ({self.remaining} left)")
+        self._refill()
+        if not self._waiters and self._tokens >= 1:
+            self._tokens -= 1
+            return
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), fut, ticket))
+        self._ensure_dispatcher(loop)
+        await fut
+
+    def promote(self, ticket: Ticket, priority: int = INTERACTIVE) -> None:
+        """Raise ``ticket`` to ``priority``, including requests already queued."""
+        if priority >= ticket.priority:
+            return
+        ticket.priority = priority
+        for _, _, fut, owner in list(self._waiters):
+            if owner is ticket and not fut.done():
+                # The stale entry is skipped once the future has been resolved
+                heapq.heappush(self._waiters, (priority, next(self._seq), fut, ticket))
+
+    def _ensure_dispatcher(self, loop: asyncio.AbstractEventLoop) -> None:
+        # The dispatcher exits once the queue drains; restart it on demand
+        if self._dispatcher is None or self._dispatcher.done() or self._dispatcher.get_loop() is not loop:
+            self._dispatcher = loop.create_task(self._dispatch())
+
+    async def _dispatch(self) -> None:
+        while self._waiters:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                continue
+            _, _, fut, _ = heapq.heappop(self._waiters)
+            if fut.done():
+                # The waiter was cancelled or promoted while queued
+                continue
+            self._tokens -= 1
+            fut.set_result(None)
+
+    def status(self) -> dict:
+        return {
+            "queued": len({id(f) for _, _, f, _ in self._waiters if not f.done()}),
+            "tokens": round(self._tokens, 2),
+            "remaining": self.remaining,
+        }
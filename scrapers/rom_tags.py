@@ -0,0 +1,150 @@
+# scrapers/rom_tags.py
+"""Structured No-Intro / Redump filename tags.
+
+Set names carry their metadata in tags: ``(USA, Europe)`` lists regions,
+``(Rev 1)`` or ``(v1.1)`` a revision, ``(Beta)``, ``(Proto 2)``, ``(Demo)``,
+``(Kiosk)`` or ``(LodgeNet)`` an unreleased or special build, ``[b]`` a bad
+dump and ``[BIOS]`` a system file. :func:`parse` reads them once into
+integers, so ranking candidates is a few bit and integer comparisons. Only
+tags count: "Beta Bloc (Europe)" is a released game, and "Europe Racing
+(USA)" a USA release.
+"""
+
+from __future__ import annotations
+
+import functools
+import re
+from typing import NamedTuple
+
+from scrapers import memory
+
+# Region names as they appear in tags; each gets one bit
+REGIONS = (
+    "USA", "Europe", "Japan", "Asia", "Australia", "Austria", "Belgium", "Brazil",
+    "Canada", "China", "Denmark", "Finland", "France", "Germany", "Greece",
+    "Hong Kong", "India", "Ireland", "Italy", "Korea", "Latin America", "Mexico",
+    "Netherlands", "New Zealand", "Norway", "Poland", "Portugal", "Russia",
+    "Scandinavia", "South Africa", "Spain", "Sweden", "Switzerland", "Taiwan", "UK",
+)
+_REGION_BITS = {name.lower(): 1 << i for i, name in enumerate(REGIONS)}
+# "(World)" is one release for every region
+WORLD = (1 << len(REGIONS)) - 1
+_REGION_BITS["world"] = WORLD
+
+# Build flags
+BETA = 1
+PROTO = 2
+DEMO = 4
+KIOSK = 8
+BAD_DUMP = 16
+BIOS = 32
+# Builds never offered as a download
+SKIP = BETA | PROTO | DEMO | KIOSK | BAD_DUMP | BIOS
+
+_FLAG_WORDS = {
+    "beta": BETA,
+    "proto": PROTO,
+    "prototype": PROTO,
+    "demo": DEMO,
+    "sample": DEMO,
+    "taikenban": DEMO,
+    "kiosk": KIOSK,
+    "lodgenet": KIOSK,
+    "bios": BIOS,
+}
+
+_TAG_RE = re.compile(r"\(([^()]*)\)|\[([^\[\]]*)\]")
+_WORD_RE = re.compile(r"[a-z]+")
+_REV_RE = re.compile(r"rev ([0-9]+|[a-z])$")
+_VERSION_RE = re.compile(r"v([0-9]+)(?:\.([0-9]+))?$")
+
+
+class RomTags(NamedTuple):
+    """Tags of one file: region bits, revision (0 for the first release) and flags."""
+
+    regions: int = 0
+    revision: int = 0
+    flags: int = 0
+
+
+_NO_TAGS = RomTags()
+
+
+def parse(filename: str) -> RomTags:
+    """Return the tags in ``filename``."""
+    paren, bracket = filename.find("("), filename.find("[")
+    start = min(paren, bracket) if paren != -1 and bracket != -1 else max(paren, bracket)
+    if start == -1:
+        return _NO_TAGS
+    # Tags follow the title, and few distinct runs of them exist in a set
+    return _parse_tags(filename[start:])
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_tags(text: str) -> RomTags:
+    regions = revision = flags = 0
+    for match in _TAG_RE.finditer(text):
+        paren, bracket = match.groups()
+        tag = (paren if paren is not None else bracket).strip().lower()
+        if bracket is not None and (tag == "b" or (tag[:1] == "b" and tag[1:].isdigit())):
+            flags |= BAD_DUMP
+            continue
+        if not regions:
+            items = [item.strip() for item in tag.split(",")]
+            bits = [_REGION_BITS.get(item) for item in items]
+            if all(bits):
+                for bit in bits:
+                    regions |= bit
+                continue
+        rev = _REV_RE.match(tag)
+        if rev:
+            value = rev.group(1)
+            revision = int(value) if value.isdigit() else ord(value) - ord("a") + 1
+            continue
+        version = _VERSION_RE.match(tag)
+        if version:
+            # v1.0 is the first release
+            major, minor = int(version.group(1)), int(version.group(2) or 0)
+            revision = max(major - 1, 0) * 100 + minor
+            continue
+        for word in _WORD_RE.findall(tag):
+            flags |= _FLAG_WORDS.get(word, 0)
+    return RomTags(regions, revision, flags)
+
+
+@functools.lru_cache(maxsize=64)
+def preference(names: tuple[str, ...]) -> tuple[int, ...]:
+    """Return the region bits for a preference such as ``("Europe", "USA")``.
+
+    Unknown names are reported once and ignored.
+    """
+    masks = []
+    for name in names:
+        bit = _REGION_BITS.get(name.strip().lower())
+        if bit is None:
+            print(f"[rom_tags] unknown region '{name}' in region preference; known: {', '.join(REGIONS)}")
+            continue
+        masks.append(bit)
+    return tuple(masks)
+
+
+def region_rank(regions: int, masks: tuple[int, ...]) -> int:
+    """Return the position of the first preferred region in ``regions`` (lower is better)."""
+    for rank, mask in enumerate(masks):
+        if regions & mask:
+            return rank
+    return len(masks)
+
+
+def _parse_stats() -> dict:
+    info = _parse_tags.cache_info()
+    return {
+        "entries": info.currsize,
+        "hits": info.hits,
+        "misses": info.misses,
+        # Every miss inserts; whatever is no longer held was evicted
+        "evictions": info.misses - info.currsize,
+    }
+
+
+memory.register("rom_tags.parse", None, _parse_stats)
@@ -1,23 +1,30 @@
 # scrapers/romspure.py
 
-import aiohttp
+import os
 import urllib.parse
-from bs4 import BeautifulSoup
 
 # We do fuzzy matching for the game name within the search results
 # Attempt to use rapidfuzz for fast fuzzy matching but fall back to difflib
 from scrapers.fuzz_fallback import fuzz
 
-# Import the dictionary-based function from platform_map
-from scrapers.platform_map import get_romspure_subpath_exact
+from scrapers.platform_map import PlatformRoute, resolve_platform
 
-BASE_URL = "https://romspure.cc"
+# Can be overridden via the environment, e.g. to point at a local mock server
+BASE_URL = os.environ.get("ROMSPURE_BASE_URL", "https://romspure.cc").rstrip("/")
+# Upper bound in seconds for a single search request
+TIMEOUT = 15
 
-async def search_romspure(game_title: str, platform_name: str) -> list[str]:
+
+def supports_platform(platform: str | PlatformRoute) -> bool:
+    """Return ``True`` if RomsPure has a section for ``platform``."""
+    return resolve_platform(platform).romspure is not None
+
+async def search_romspure(game_title: str, platform_name: str | PlatformRoute) -> list[str]:
     # 1) Attempt an exact dictionary match for the platform
-    subpath = get_romspure_subpath_exact(platform_name)
+    route = resolve_platform(platform_name)
+    subpath = route.romspure
     if subpath is None:
-        print(f"[romspure] No exact subpath mapping for '{platform_name}' in platform_map.")
+        print(f"[romspure] No exact subpath mapping for '{route.name}' in platform_map.")
         return []
 
     # 2) Build the search URL
@@ -25,15 +32,23 @@ async def search_romspure(game_title: str, platform_name: str) -> list[str]:
     search_url = f"{BASE_URL}/roms/{subpath}?keywords={encoded_query}&orderby=popular&order=desc"
     print(f"[romspure] Searching: {search_url}")
 
-    # 3) Fetch the HTML with aiohttp
-    async with aiohttp.ClientSession() as session:
+    # 3) Fetch the HTML with aiohttp (the bot has it loaded already; scripts may not)
+    import aiohttp
+
+    timeout = aiohttp.ClientTimeout(total=TIMEOUT)
+    async with aiohttp.ClientSession(timeout=timeout) as session:
         async with session.get(search_url) as resp:
+            if resp.status >= 500:
+                # Let the caller's circuit breaker see server-side failures
+                resp.raise_for_status()
             if resp.status != 200:
                 print(f"[romspure] HTTP {resp.status} from {search_url}")
                 return []
             html = await resp.text()
 
-    # 4) Parse the HTML
+    # 4) Parse the HTML; BeautifulSoup is likewise loaded on the first search
+    from bs4 import BeautifulSoup
+
     soup = BeautifulSoup(html, "html.parser")
     containers = soup.select("div.col-archive-item")
     if not containers:
@@ -45,7 +60,7 @@ async def search_romspure(game_title: str, platform_name: str) -> list[str]:
     # We'll gather (url, displayed_name, fuzzy_score)
     candidates = []
     for c in containers:
-        a_tag = c.select_one('a[href^="https://romspure.cc/roms/"]')
+        a_tag = c.select_one(f'a[href^="{BASE_URL}/roms/"]')
         if not a_tag:
             continue
 
@@ -81,7 +96,7 @@ async def search_romspure(game_title: str, platform_name: str) -> list[str]:
     print(f"[romspure] Best match: '{best_name}' (score={best_score}) => {best_url}")
     return [best_url]
 
-async def get_romspure_download_links(game_title: str, platform_name: str) -> list[str]:
+async def get_romspure_download_links(game_title: str, platform_name: str | PlatformRoute) -> list[str]:
     """
     1) calls search_romspure
     2) returns just the best single link
@@ -0,0 +1,119 @@
+# scrapers/shared_cache.py
+"""Small SQLite key-value cache shared by every bot process on a host.
+
+Values are stored as JSON with an expiry time, grouped by namespace. The
+database runs in WAL mode, so any number of processes can read while one
+writes; each lookup is a single primary-key query, cheap enough to run on the
+event loop. Failures to read or write are logged and treated as misses, so a
+locked or missing cache never breaks a command.
+
+The cache is off until :func:`set_path` names a file (``cachePath`` in
+``config.json``). Expired entries are purged when the file is opened and
+then every ``PURGE_INTERVAL`` seconds by whichever process writes next.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import time
+
+from scrapers import paths
+
+CACHE_PATH = paths.SHARED_CACHE
+# Seconds between purges of expired entries
+PURGE_INTERVAL = 600.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    expires REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+"""
+
+_conn: sqlite3.Connection | None = None
+_enabled = False
+_next_purge = 0.0
+
+
+def set_path(path: str | None) -> None:
+    """Use the cache at ``path``; an empty value disables the cache."""
+    global CACHE_PATH, _conn, _enabled
+    if _conn is not None:
+        _conn.close()
+        _conn = None
+    _enabled = bool(path)
+    if path:
+        CACHE_PATH = path
+
+
+def _db() -> sqlite3.Connection | None:
+    global _conn, _enabled
+    if not _enabled:
+        return None
+    if _conn is None:
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(CACHE_PATH)), exist_ok=True)
+            conn = sqlite3.connect(CACHE_PATH, timeout=1.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+        except sqlite3.Error as e:
+            print(f"[shared_cache] disabled; cannot open {CACHE_PATH}: {e}")
+            _enabled = False
+            return None
+        _conn = conn
+        purge()
+    return _conn
+
+
+def get(namespace: str, key: str):
+    """Return the cached value for ``key``, or ``None`` if missing or expired."""
+    conn = _db()
+    if conn is None:
+        return None
+    try:
+        row = conn.execute(
+            "SELECT value FROM cache WHERE namespace = ? AND key = ? AND expires > ?",
+            (namespace, key, time.time()),
+        ).fetchone()
+    except sqlite3.Error as e:
+        print(f"[shared_cache] read failed: {e}")
+        return None
+    return json.loads(row[0]) if row else None
+
+
+def put(namespace: str, key: str, value, ttl: float) -> None:
+    """Store ``value`` under ``key`` for ``ttl`` seconds."""
+    conn = _db()
+    if conn is None:
+        return
+    try:
+        conn.execute(
+            "INSERT INTO cache(namespace, key, value, expires) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(namespace, key) DO UPDATE SET "
+            "value = excluded.value, expires = excluded.expires",
+            (namespace, key, json.dumps(value), time.time() + ttl),
+        )
+    except sqlite3.Error as e:
+        print(f"[shared_cache] write failed: {e}")
+    if time.monotonic() >= _next_purge:
+        purge()
+
+
+def purge() -> int:
+    """Delete expired entries and return how many were removed."""
+    global _next_purge
+    conn = _db()
+    if conn is None:
+        return 0
+    _next_purge = time.monotonic() + PURGE_INTERVAL
+    try:
+        return conn.execute("DELETE FROM cache WHERE expires <= ?", (time.time(),)).rowcount
+    except sqlite3.Error as e:
+        print(f"[shared_cache] purge failed: {e}")
+        return 0
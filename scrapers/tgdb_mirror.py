@@ -0,0 +1,245 @@
+# scrapers/tgdb_mirror.py
+"""Optional local SQLite mirror of TheGamesDB metadata.
+
+The mirror holds games, platforms and image filenames, with an FTS5 index on
+game titles. It is populated by ``scripts/sync_thegamesdb_mirror.py`` and
+consulted by :mod:`scrapers.thegamesdb` before calling the API; any miss
+falls back to the live API. All lookups are single indexed queries, fast
+enough to run directly on the event loop.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import sqlite3
+
+from scrapers import paths
+from scrapers.platform_map import register_platform_id
+
+DB_PATH = paths.TGDB_MIRROR
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS platforms (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    alias TEXT
+);
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    game_title TEXT NOT NULL,
+    release_date TEXT,
+    platform INTEGER,
+    overview TEXT,
+    rating TEXT,
+    images_synced INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS images (
+    game_id INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    side TEXT,
+    filename TEXT NOT NULL,
+    PRIMARY KEY (game_id, type, filename)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS games_fts USING fts5(
+    game_title, content='games', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS games_ai AFTER INSERT ON games BEGIN
+    INSERT INTO games_fts(rowid, game_title) VALUES (new.id, new.game_title);
+END;
+CREATE TRIGGER IF NOT EXISTS games_ad AFTER DELETE ON games BEGIN
+    INSERT INTO games_fts(games_fts, rowid, game_title) VALUES ('delete', old.id, old.game_title);
+END;
+CREATE TRIGGER IF NOT EXISTS games_au AFTER UPDATE OF game_title ON games BEGIN
+    INSERT INTO games_fts(games_fts, rowid, game_title) VALUES ('delete', old.id, old.game_title);
+    INSERT INTO games_fts(rowid, game_title) VALUES (new.id, new.game_title);
+END;
+"""
+
+GAME_COLUMNS = ("game_title", "release_date", "platform", "overview", "rating")
+# Edits for games the mirror lacks create rows one field at a time; until a
+# row has a title and a platform it is treated as missing
+_COMPLETE = "g.game_title != '' AND g.platform IS NOT NULL"
+
+_conn: sqlite3.Connection | None = None
+_enabled = True
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def set_path(path: str | None) -> None:
+    """Use the mirror at ``path``; an empty value disables the mirror."""
+    global DB_PATH, _conn, _enabled
+    if _conn is not None:
+        _conn.close()
+        _conn = None
+    _enabled = bool(path)
+    if path:
+        DB_PATH = path
+
+
+def connect(path: str | None = None, create: bool = False) -> sqlite3.Connection:
+    """Open a connection to the mirror, creating the schema if requested."""
+    conn = sqlite3.connect(path or DB_PATH, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    if create:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+    return conn
+
+
+def _db() -> sqlite3.Connection | None:
+    """Return the shared read connection, or ``None`` if there is no mirror."""
+    global _conn
+    if not _enabled:
+        return None
+    if _conn is None:
+        if not os.path.isfile(DB_PATH):
+            return None
+        _conn = connect()
+        for row in _conn.execute("SELECT id, name FROM platforms"):
+            register_platform_id(row["id"], row["name"])
+    return _conn
+
+
+def _fts_query(title: str) -> str | None:
+    tokens = _TOKEN_RE.findall(title.lower())
+    if not tokens:
+        return None
+    # Every word must match; the last one may be a prefix of a longer word
+    quoted = [f'"{t}"' for t in tokens]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def search(title: str, limit: int = 20) -> list[dict]:
+    """Return games matching ``title`` in the same shape as ``ByGameName``."""
+    conn = _db()
+    query = _fts_query(title)
+    if conn is None or query is None:
+        return []
+    rows = conn.execute(
+        "SELECT g.id, g.game_title, g.release_date, g.platform, g.rating "
+        "FROM games_fts JOIN games g ON g.id = games_fts.rowid "
+        f"WHERE games_fts MATCH ? AND {_COMPLETE} "
+        "ORDER BY (lower(g.game_title) = lower(?)) DESC, bm25(games_fts) "
+        "LIMIT ?",
+        (query, title, limit),
+    ).fetchall()
+    return [dict(r) for r in rows]
+
+
+def game(game_id: int) -> dict | None:
+    """Return the mirrored game with its platform name, or ``None`` if incomplete."""
+    conn = _db()
+    if conn is None:
+        return None
+    row = conn.execute(
+        "SELECT g.*, p.name AS platform_name FROM games g "
+        f"LEFT JOIN platforms p ON p.id = g.platform WHERE g.id = ? AND {_COMPLETE}",
+        (game_id,),
+    ).fetchone()
+    return dict(row) if row else None
+
+
+def images(game_id: int) -> tuple[str, list[dict]] | None:
+    """Return ``(base_url, images)`` for ``game_id`` if its images were synced."""
+    conn = _db()
+    if conn is None:
+        return None
+    synced = conn.execute(
+        "SELECT images_synced FROM games WHERE id = ?", (game_id,)
+    ).fetchone()
+    if not synced or not synced[0]:
+        return None
+    rows = conn.execute(
+        "SELECT type, side, filename FROM images WHERE game_id = ?", (game_id,)
+    ).fetchall()
+    return get_meta("image_base_url") or "", [dict(r) for r in rows]
+
+
+def all_titles() -> list[str]:
+    """Return every mirrored game title (used to seed autocomplete)."""
+    conn = _db()
+    if conn is None:
+        return []
+    return [r[0] for r in conn.execute("SELECT game_title FROM games WHERE game_title != ''")]
+
+
+def get_meta(key: str, conn: sqlite3.Connection | None = None) -> str | None:
+    conn = conn or _db()
+    if conn is None:
+        return None
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+
+# -------------------------------------------------------------------------
+# Write helpers used by the sync script
+# -------------------------------------------------------------------------
+def set_meta(conn: sqlite3.Connection, key: str, value: str) -> None:
+    conn.execute(
+        "INSERT INTO meta(key, value) VALUES (?, ?) "
+        "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+        (key, value),
+    )
+
+
+def upsert_platforms(conn: sqlite3.Connection, platforms: list[dict]) -> None:
+    conn.executemany(
+        "INSERT INTO platforms(id, name, alias) VALUES (:id, :name, :alias) "
+        "ON CONFLICT(id) DO UPDATE SET name = excluded.name, alias = excluded.alias",
+        [{"id": int(p["id"]), "name": p.get("name", ""), "alias": p.get("alias")} for p in platforms],
+    )
+
+
+def upsert_games(conn: sqlite3.Connection, games: list[dict]) -> None:
+    rows = []
+    for g in games:
+        row = {col: g.get(col) for col in GAME_COLUMNS}
+        row["id"] = int(g["id"])
+        row["game_title"] = row["game_title"] or ""
+        rows.append(row)
+    conn.executemany(
+        "INSERT INTO games(id, game_title, release_date, platform, overview, rating) "
+        "VALUES (:id, :game_title, :release_date, :platform, :overview, :rating) "
+        "ON CONFLICT(id) DO UPDATE SET "
+        "game_title = excluded.game_title, release_date = excluded.release_date, "
+        "platform = excluded.platform, "
+        "overview = COALESCE(excluded.overview, games.overview), "
+        "rating = COALESCE(excluded.rating, games.rating)",
+        rows,
+    )
+
+
+def update_game_field(conn: sqlite3.Connection, game_id: int, field: str, value) -> None:
+    """Apply a single-field edit from the ``Games/Updates`` endpoint.
+
+    An edit for a game not yet mirrored starts a row that :func:`game` and
+    :func:`search` skip until its title and platform have arrived.
+    """
+    if field not in GAME_COLUMNS:
+        raise ValueError(f"unknown game field '{field}'")
+    conn.execute(
+        "INSERT INTO games(id, game_title) VALUES (?, '') ON CONFLICT(id) DO NOTHING",
+        (game_id,),
+    )
+    conn.execute(f"UPDATE games SET {field} = ? WHERE id = ?", (value, game_id))
+
+
+def delete_game(conn: sqlite3.Connection, game_id: int) -> None:
+    conn.execute("DELETE FROM images WHERE game_id = ?", (game_id,))
+    conn.execute("DELETE FROM games WHERE id = ?", (game_id,))
+
+
+def replace_images(conn: sqlite3.Connection, game_id: int, imgs: list[dict]) -> None:
+    conn.execute("DELETE FROM images WHERE game_id = ?", (game_id,))
+    conn.executemany(
+        "INSERT OR IGNORE INTO images(game_id, type, side, filename) VALUES (?, ?, ?, ?)",
+        [(game_id, i.get("type", ""), i.get("side"), i["filename"]) for i in imgs if i.get("filename")],
+    )
+    conn.execute("UPDATE games SET images_synced = 1 WHERE id = ?", (game_id,))
@@ -0,0 +1,319 @@
+# scrapers/thegamesdb.py
+"""Thin async client for the TheGamesDB v1 API."""
+
+import asyncio
+import os
+import re
+import urllib.parse
+
+import aiohttp
+
+from scrapers import shared_cache, tgdb_mirror
+from scrapers.platform_map import register_platform_include
+from scrapers.rate_limit import (
+    DROPDOWN,
+    INTERACTIVE,
+    QuotaExceeded,
+    RequestScheduler,
+    Ticket,
+)
+
+# Base URL of the API. Can be overridden via the environment or at runtime
+# with :func:`set_base_url`, e.g. to point at a local mock server.
+BASE_URL = os.environ.get("THEGAMESDB_BASE_URL", "https://api.thegamesdb.net").rstrip("/")
+API_KEY = ""
+
+DEFAULT_IMAGE_BASE = "https://cdn.thegamesdb.net/images/original/"
+
+# How long API responses are kept in the shared cache, in seconds
+RESPONSE_TTL = 24 * 3600
+# How long the image picked for a game is kept; artwork rarely changes
+IMAGE_TTL = 7 * 24 * 3600
+# Most game ids sent in one /v1/Games/Images request
+IMAGE_BATCH = 20
+
+_APIKEY_RE = re.compile(r"apikey=[^&]*&?")
+
+# Every API call goes through this scheduler; see scrapers/rate_limit.py
+scheduler = RequestScheduler()
+
+# Image lookups in flight, so a prefetch and the dropdown's batch share one
+# request: game id -> (future of the image URL, ticket of that request)
+_pending_images: dict[int, tuple[asyncio.Future, Ticket]] = {}
+
+
+def set_base_url(url: str | None) -> None:
+    """Override :data:`BASE_URL`. A blank value keeps the current one."""
+    global BASE_URL
+    if url:
+        BASE_URL = url.rstrip("/")
+
+
+def set_api_key(key: str) -> None:
+    """Set the API key sent with every request."""
+    global API_KEY
+    API_KEY = key
+
+# -------------------------------------------------------------------------
+# Basic GET helper for TheGamesDB calls
+# -------------------------------------------------------------------------
+async def fetch_json(url: str, priority: int | Ticket = INTERACTIVE, cache: bool = True) -> dict:
+    """GET ``url`` once the scheduler admits a request at ``priority``.
+
+    Responses are kept in the shared cache, so repeated lookups from any bot
+    process cost no quota; pass ``cache=False`` for responses the caller
+    caches in its own form. Raises :class:`QuotaExceeded` if the request was
+    shed to save quota.
+    """
+    cache_key = _APIKEY_RE.sub("", url)
+    cached = shared_cache.get("thegamesdb", cache_key) if cache else None
+    if cached is not None:
+        return cached
+    await scheduler.acquire(priority)
+    async with aiohttp.ClientSession() as session:
+        async with session.get(url) as resp:
+            if resp.status != 200:
+                text = await resp.text()
+                raise RuntimeError(f"HTTP {resp.status} from TheGamesDB: {text[:200]}")
+            data = await resp.json()
+    scheduler.update_allowance(data)
+    if cache:
+        shared_cache.put("thegamesdb", cache_key, data, RESPONSE_TTL)
+    return data
+
+# -------------------------------------------------------------------------
+# 1) ByGameName search with TheGamesDB
+# -------------------------------------------------------------------------
+async def search_by_name(title: str) -> list:
+    mirrored = tgdb_mirror.search(title)
+    if mirrored:
+        return mirrored
+
+    base_url = f"{BASE_URL}/v1/Games/ByGameName"
+    fields = "platform,rating"
+    url = (
+        f"{base_url}?apikey={API_KEY}"
+        f"&name={urllib.parse.quote(title, safe='')}"
+        f"&fields={fields}"
+    )
+    data = await fetch_json(url)
+    return data.get("data", {}).get("games", [])
+
+# -------------------------------------------------------------------------
+# 2) Minimal ByGameID to get platform + release_date for dropdown label
+# -------------------------------------------------------------------------
+async def fetch_for_dropdown(game_id: int, priority: int | Ticket = DROPDOWN) -> dict | None:
+    """Return title, year and platform name for a dropdown label.
+
+    Returns ``None`` when the lookup was shed because the quota is running
+    low; callers should fall back to the data from the search results.
+    """
+    mirrored = tgdb_mirror.game(game_id)
+    if mirrored:
+        rdate = mirrored["release_date"] or ""
+        return {
+            "title": mirrored["game_title"],
+            "year": rdate[:4] if rdate else "????",
+            "platform_name": mirrored["platform_name"] or "Unknown",
+        }
+
+    base = f"{BASE_URL}/v1/Games/ByGameID"
+    fields = "platform,overview,rating"
+    includes = "platform"
+
+    url = (
+        f"{base}?apikey={API_KEY}"
+        f"&id={game_id}"
+        f"&fields={fields}"
+        f"&include={includes}"
+    )
+    try:
+        data = await fetch_json(url, priority)
+    except QuotaExceeded:
+        return None
+    games_list = data.get("data", {}).get("games", [])
+    if not games_list:
+        return {"title": "", "year": "????", "platform_name": "Unknown"}
+
+    g_info = games_list[0]
+    game_title = g_info.get("game_title", "Unknown Title")
+    rdate = g_info.get("release_date", "")
+    year_str = rdate[:4] if rdate else "????"
+
+    incl = data.get("include", {})
+    register_platform_include(incl)
+    p_data = incl.get("platform", {}).get("data", {})
+    p_val = g_info.get("platform")
+    p_str = "Unknown"
+    if p_val is not None:
+        spv = str(p_val)
+        if spv in p_data:
+            p_str = p_data[spv].get("name", "Unknown")
+
+    return {
+        "title": game_title,
+        "year": year_str,
+        "platform_name": p_str
+    }
+
+# -------------------------------------------------------------------------
+# 3) Full ByGameID for final embed details
+# -------------------------------------------------------------------------
+async def get_full_details(game_id: int, priority: int | Ticket = INTERACTIVE) -> dict:
+    mirrored = tgdb_mirror.game(game_id)
+    if mirrored:
+        return {
+            "title": mirrored["game_title"] or "Unknown Title",
+            "release_date": mirrored["release_date"] or "Unknown",
+            "overview": mirrored["overview"] or "",
+            "rating": mirrored["rating"] or "N/A",
+            "platform": mirrored["platform_name"] or "Unknown",
+        }
+
+    base = f"{BASE_URL}/v1/Games/ByGameID"
+    fields = "platform,overview,rating"
+    includes = "platform"
+
+    url = (
+        f"{base}?apikey={API_KEY}"
+        f"&id={game_id}"
+        f"&fields={fields}"
+        f"&include={includes}"
+    )
+    data = await fetch_json(url, priority)
+    games_list = data.get("data", {}).get("games", [])
+    if not games_list:
+        return {}
+
+    g_info = games_list[0]
+    result = {}
+    result["title"] = g_info.get("game_title", "Unknown Title")
+    rdate = g_info.get("release_date", "")
+    result["release_date"] = rdate if rdate else "Unknown"
+    result["overview"] = g_info.get("overview", "")
+    result["rating"] = g_info.get("rating", "N/A")
+
+    incl = data.get("include", {})
+    register_platform_include(incl)
+    p_data = incl.get("platform", {}).get("data", {})
+    p_val = g_info.get("platform")
+    plat_str = "Unknown"
+    if p_val is not None:
+        spv = str(p_val)
+        if spv in p_data:
+            plat_str = p_data[spv].get("name", "Unknown")
+    result["platform"] = plat_str
+
+    return result
+
+# -------------------------------------------------------------------------
+# 4) /v1/Games/Images for clearlogo/boxart from TheGamesDB
+# -------------------------------------------------------------------------
+async def fetch_images(game_id: int, priority: int | Ticket = INTERACTIVE) -> str:
+    """Return the clearlogo or boxart URL for ``game_id``, or ``""`` if it has none."""
+    return (await fetch_images_batch([game_id], priority)).get(game_id, "")
+
+
+async def fetch_images_batch(game_ids: list[int], priority: int | Ticket = DROPDOWN) -> dict[int, str]:
+    """Return ``{game_id: image_url}`` for many games in as few requests as possible.
+
+    Each game's pick is kept in the shared cache, so only games never seen
+    before are requested, up to IMAGE_BATCH per request. Games whose lookup
+    is already in flight wait for that request instead of sending another,
+    promoting it if this caller is more urgent.
+    """
+    found: dict[int, str] = {}
+    waiting: dict[int, tuple[asyncio.Future, Ticket]] = {}
+    missing: list[int] = []
+    for game_id in dict.fromkeys(game_ids):
+        mirrored = tgdb_mirror.images(game_id)
+        if mirrored is not None:
+            base_original, arr = mirrored
+            found[game_id] = _pick_image(base_original or DEFAULT_IMAGE_BASE, arr)
+            continue
+        cached = shared_cache.get("images", str(game_id))
+        if cached is not None:
+            found[game_id] = cached
+        elif game_id in _pending_images:
+            waiting[game_id] = _pending_images[game_id]
+        else:
+            missing.append(game_id)
+
+    if missing:
+        ticket = priority if isinstance(priority, Ticket) else Ticket(priority)
+        loop = asyncio.get_running_loop()
+        owned = {game_id: loop.create_future() for game_id in missing}
+        for game_id, fut in owned.items():
+            # Waiters retry on their own if this request fails
+            fut.add_done_callback(lambda f: f.cancelled() or f.exception())
+            _pending_images[game_id] = (fut, ticket)
+        try:
+            for start in range(0, len(missing), IMAGE_BATCH):
+                batch = missing[start:start + IMAGE_BATCH]
+                picked = await _request_images(batch, ticket)
+                for game_id in batch:
+                    url = picked.get(game_id, "")
+                    shared_cache.put("images", str(game_id), url, IMAGE_TTL)
+                    owned[game_id].set_result(url)
+                    found[game_id] = url
+        except BaseException as e:
+            # Not CancelledError: a waiter must not think it was cancelled itself
+            error = e if isinstance(e, Exception) else RuntimeError("image lookup cancelled")
+            for fut in owned.values():
+                if not fut.done():
+                    fut.set_exception(error)
+            raise
+        finally:
+            for game_id in missing:
+                _pending_images.pop(game_id, None)
+
+    retry = []
+    for game_id, (fut, ticket) in waiting.items():
+        urgency = priority.priority if isinstance(priority, Ticket) else priority
+        scheduler.promote(ticket, urgency)
+        try:
+            found[game_id] = await asyncio.shield(fut)
+        except Exception:
+            # e.g. a dropdown batch shed to save quota; ask at our own priority
+            retry.append(game_id)
+    if retry:
+        found.update(await fetch_images_batch(retry, priority))
+    return found
+
+
+async def _request_images(game_ids: list[int], priority: int | Ticket) -> dict[int, str]:
+    """Fetch and pick images for ``game_ids`` with one request per result page."""
+    url = (
+        f"{BASE_URL}/v1/Games/Images?apikey={API_KEY}"
+        f"&games_id={','.join(str(i) for i in game_ids)}"
+        f"&filter%5Btype%5D=clearlogo,boxart"
+    )
+    base_original = DEFAULT_IMAGE_BASE
+    images: dict[str, list[dict]] = {}
+    while url:
+        # Cached per game instead, so differently batched ids still hit
+        data = await fetch_json(url, priority, cache=False)
+        data_obj = data.get("data", {})
+        base_original = data_obj.get("base_url", {}).get("original", base_original)
+        for gid, arr in (data_obj.get("images") or {}).items():
+            images.setdefault(gid, []).extend(arr)
+        url = (data.get("pages") or {}).get("next")
+    return {game_id: _pick_image(base_original, images.get(str(game_id), [])) for game_id in game_ids}
+
+
+def _pick_image(base_original: str, arr: list[dict]) -> str:
+    """Return the clearlogo URL if there is one, else the first boxart."""
+    if not arr:
+        return ""
+
+    clearlogo_obj = next((img for img in arr if img.get("type") == "clearlogo"), None)
+    if clearlogo_obj:
+        filename = clearlogo_obj["filename"]
+        return base_original + filename
+
+    boxarts = [img for img in arr if img.get("type") == "boxart"]
+    if boxarts:
+        filename = boxarts[0]["filename"]
+        return base_original + filename
+
+    return ""
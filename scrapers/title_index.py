@@ -0,0 +1,192 @@
+# scrapers/title_index.py
+"""In-memory title index used for ``/play`` autocomplete.
+
+Titles are kept in two sorted arrays: one keyed by the whole normalized
+title and one keyed by every suffix that starts at a word boundary, so
+"mario" finds "Super Mario World". Both are searched with :mod:`bisect`.
+When prefix matching finds too few titles, a bounded fuzzy pass scores only
+the titles that share a word starting with the query's first two letters,
+which keeps each lookup to a few milliseconds even for millions of titles.
+"""
+
+from __future__ import annotations
+
+import bisect
+import os
+import re
+import threading
+
+from scrapers import memory
+from scrapers.fuzz_fallback import fuzz
+
+MAX_RESULTS = 25  # Discord shows at most 25 autocomplete choices
+MAX_FUZZY_CANDIDATES = 5000
+FUZZY_THRESHOLD = 75
+CACHE_SIZE = 4096
+# Larger batches passed to TitleIndex.add are merged with one sort
+INSORT_MAX = 64
+
+_PAREN_RE = re.compile(r"\s*[\(\[][^\)\]]*[\)\]]")
+_NON_WORD_RE = re.compile(r"[^0-9a-z]+")
+_EXT_RE = re.compile(r"\.[A-Za-z0-9]{1,4}$")
+
+
+def normalize(title: str) -> str:
+    """Lowercase ``title`` and strip tags, punctuation and extra spaces."""
+    title = _PAREN_RE.sub(" ", title.replace("_", " ")).lower()
+    return _NON_WORD_RE.sub(" ", title).strip()
+
+
+def display_title(filename: str) -> str:
+    """Turn an index filename such as ``Foo (USA) (Disc 1).chd`` into ``Foo``."""
+    name = _EXT_RE.sub("", os.path.basename(filename))
+    return re.sub(r"\s+", " ", _PAREN_RE.sub("", name.replace("_", " "))).strip()
+
+
+class TitleIndex:
+    def __init__(self, name: str = "title_index") -> None:
+        """``name`` labels the index and its query cache in memory reports."""
+        # (sorted keys, sorted (word suffix, key) pairs, key -> display title)
+        self._data: tuple[list[str], list[tuple[str, str]], dict[str, str]] = ([], [], {})
+        self._lock = threading.Lock()
+        # Results share their strings with the index, so only the lists count
+        self._cache = memory.BoundedCache(f"{name}.queries", max_entries=CACHE_SIZE)
+        memory.register(name, lambda: self._data, lambda: {"entries": len(self)})
+
+    def __len__(self) -> int:
+        return len(self._data[0])
+
+    def build(self, titles) -> None:
+        """Replace the index contents with ``titles``."""
+        displays: dict[str, str] = {}
+        for title in titles:
+            key = normalize(title)
+            if key and key not in displays:
+                displays[key] = title.strip()
+        keys = sorted(displays)
+        words = sorted(
+            (key[m.start():], key) for key in keys for m in re.finditer(r"(?<= )\S", key)
+        )
+        with self._lock:
+            self._data = (keys, words, displays)
+            self._cache.clear()
+
+    def add(self, titles) -> None:
+        """Insert extra titles, e.g. from TheGamesDB search results.
+
+        A few titles are inserted in place; a larger batch is merged with
+        one sort, since each insert moves every later entry.
+        """
+        with self._lock:
+            keys, words, displays = self._data
+            new_keys: list[str] = []
+            for title in titles:
+                key = normalize(title)
+                if not key or key in displays:
+                    continue
+                displays[key] = title.strip()
+                new_keys.append(key)
+            if not new_keys:
+                return
+            new_words = [(key[m.start():], key) for key in new_keys for m in re.finditer(r"(?<= )\S", key)]
+            if len(new_keys) <= INSORT_MAX:
+                for key in new_keys:
+                    bisect.insort(keys, key)
+                for pair in new_words:
+                    bisect.insort(words, pair)
+            else:
+                # Two sorted runs: sort() merges them in linear time
+                keys = keys + sorted(new_keys)
+                keys.sort()
+                words = words + sorted(new_words)
+                words.sort()
+                self._data = (keys, words, displays)
+            self._cache.clear()
+
+    def complete(self, query: str, limit: int = MAX_RESULTS) -> list[str]:
+        """Return up to ``limit`` display titles matching ``query``."""
+        q = normalize(query)
+        if not q:
+            return []
+        cache_key = f"{limit}:{q}"
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        keys, words, displays = self._data
+        found: list[str] = []
+        seen: set[str] = set()
+
+        def take(key: str) -> bool:
+            if key not in seen:
+                seen.add(key)
+                found.append(key)
+            return len(found) >= limit
+
+        i = bisect.bisect_left(keys, q)
+        while i < len(keys) and keys[i].startswith(q):
+            if take(keys[i]):
+                break
+            i += 1
+
+        if len(found) < limit:
+            i = bisect.bisect_left(words, (q,))
+            while i < len(words) and words[i][0].startswith(q):
+                if take(words[i][1]):
+                    break
+                i += 1
+
+        if len(found) < limit and len(q) >= 3:
+            for key in self._fuzzy(q, keys, words, seen, limit - len(found)):
+                take(key)
+
+        result = [displays[k] for k in found]
+        with self._lock:
+            self._cache.put(cache_key, result)
+        return result
+
+    @staticmethod
+    def _fuzzy(q, keys, words, seen, limit) -> list[str]:
+        """Score titles sharing a word that starts like one of the query's."""
+        candidates: list[str] = []
+        for token in q.split():
+            stem = token[:2]
+            i = bisect.bisect_left(keys, stem)
+            while i < len(keys) and keys[i].startswith(stem) and len(candidates) < MAX_FUZZY_CANDIDATES:
+                candidates.append(keys[i])
+                i += 1
+            i = bisect.bisect_left(words, (stem,))
+            while i < len(words) and words[i][0].startswith(stem) and len(candidates) < MAX_FUZZY_CANDIDATES:
+                candidates.append(words[i][1])
+                i += 1
+        scored = []
+        for key in set(candidates) - seen:
+            score = fuzz.WRatio(q, key)
+            if score >= FUZZY_THRESHOLD:
+                scored.append((score, key))
+        scored.sort(key=lambda t: (-t[0], t[1]))
+        return [key for _, key in scored[:limit]]
+
+
+def collect_titles() -> list[str]:
+    """Gather titles from the Myrient, EmulatorJS and TheGamesDB mirror indexes."""
+    # Imported lazily so the index module stays cheap to import
+    from scrapers import emulatorjs, myrient, tgdb_mirror
+
+    titles: list[str] = []
+    titles.extend(display_title(entry) for entry in myrient.iter_index())
+    for names in emulatorjs._load_index().values():
+        titles.extend(display_title(name) for name in names)
+    titles.extend(tgdb_mirror.all_titles())
+    return titles
+
+
+# Shared instance used by the bot
+index = TitleIndex()
+
+
+def build_default() -> int:
+    """(Re)build :data:`index` from every local source and return its size."""
+    index.build(collect_titles())
+    print(f"[title_index] indexed {len(index)} titles for autocomplete")
+    return len(index)
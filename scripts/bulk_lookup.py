@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""Resolve download links for a whole list of games.
+
+Typical use::
+
+    python scripts/bulk_lookup.py games.csv --output links.jsonl
+    python scripts/bulk_lookup.py games.jsonl --online --concurrency 4 > links.jsonl
+
+The input is a CSV file with a header row, or JSON Lines, with ``title`` and
+``platform`` fields (see ``--title-column``/``--platform-column``). Rows are
+matched against the local Myrient and EmulatorJS indexes in chunks: rows of
+one platform are matched together by :func:`scrapers.myrient.match_many`.
+Each platform is always sent to the same one of ``--workers`` processes, so
+every worker prepares and keeps only its own platforms' candidates, while
+all of them share the memory-mapped index.
+``--online`` also asks RomsPure and GOG-Games, at most ``--concurrency``
+lookups at a time, through the usual circuit breakers. ``--regions`` sets the
+preferred release regions (default: ``regionPriority`` from ``config.json``).
+
+Each input row is written back as one JSON line, in input order, with
+``platform_resolved`` and ``links`` (``source``, ``url``, ``disc``) added.
+Progress goes to stderr.
+"""
+
+import argparse
+import asyncio
+import collections
+import concurrent.futures
+import contextlib
+import csv
+import json
+import os
+import sys
+import time
+import zlib
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, ROOT_DIR)
+
+from scrapers import emulatorjs, memory, myrient, shared_cache
+from scrapers.platform_map import PlatformRoute, resolve_platform
+
+LOCAL_PROVIDERS = {"Myrient", "PlayNow"}
+
+
+def _load_config() -> dict:
+    path = os.environ.get("LETMEPLAYTHIS_CONFIG") or os.path.join(ROOT_DIR, "config.json")
+    if not os.path.isfile(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def read_rows(path: str, fmt: str | None):
+    """Yield input rows as dicts from a CSV or JSONL file (``-`` for stdin)."""
+    if fmt is None:
+        fmt = "jsonl" if path.endswith((".jsonl", ".ndjson", ".json")) else "csv"
+    f = sys.stdin if path == "-" else open(path, "r", encoding="utf-8", newline="")
+    try:
+        if fmt == "csv":
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def _field(row: dict, name: str) -> str:
+    for key, value in row.items():
+        if key and key.strip().lower() == name:
+            return (value or "").strip()
+    return ""
+
+
+# -------------------------------------------------------------------------
+# Local matching, run in worker processes
+# -------------------------------------------------------------------------
+def _init_worker(
+    myrient_path: str, emulatorjs_path: str, emulatorjs_base: str | None, budgets_mb: dict
+) -> None:
+    myrient.INDEX_PATH = myrient_path
+    myrient.reset_index_cache()
+    memory.set_budgets(budgets_mb)
+    # Input rows arrive in any platform order; keep every platform prepared,
+    # unless cacheBudgetsMb limits the memory they may take
+    myrient.platform_cache.configure(max_entries=1024)
+    emulatorjs.INDEX_PATH = emulatorjs_path
+    emulatorjs.set_base_url(emulatorjs_base)
+
+
+def match_local(titles: list[str], route: PlatformRoute, regions: list[str] | None = None) -> list[list[dict]]:
+    """Return the Myrient and Play Now links for each of ``titles``."""
+    results = []
+    # Same providers as the bot: PC and DOS are left to GOG-Games
+    matches = myrient.match_many(titles, route, regions) if myrient.supports_platform(route) else [[]] * len(titles)
+    for title, found in zip(titles, matches):
+        links = [{"source": "Myrient", "url": url, "disc": disc} for url, disc in found]
+        if route.emulatorjs:
+            play_url = emulatorjs.match_play_url(title, route)
+            if play_url:
+                links.append({"source": "PlayNow", "url": play_url, "disc": None})
+        results.append(links)
+    return results
+
+
+# -------------------------------------------------------------------------
+# Chunk pipeline
+# -------------------------------------------------------------------------
+async def resolve_chunk(rows: list[dict], args, pools, online_slots: asyncio.Semaphore | None) -> list[dict]:
+    loop = asyncio.get_running_loop()
+    title_key, platform_key = args.title_column.lower(), args.platform_column.lower()
+    out: list[dict] = []
+    groups: dict[PlatformRoute, list[int]] = collections.defaultdict(list)
+    for i, row in enumerate(rows):
+        title, platform = _field(row, title_key), _field(row, platform_key)
+        route = resolve_platform(platform)
+        result = dict(row, platform_resolved=route.name, links=[])
+        if not title:
+            result["error"] = "missing title"
+        elif not route.routed and not args.online:
+            result["error"] = "no route for platform"
+        else:
+            groups[route].append(i)
+        out.append(result)
+
+    jobs = []
+    for route, idx in groups.items():
+        titles = [_field(rows[i], title_key) for i in idx]
+        if not pools:
+            jobs.append(asyncio.sleep(0, match_local(titles, route, args.regions)))
+        else:
+            pool = pools[zlib.crc32(route.name.encode()) % len(pools)]
+            jobs.append(loop.run_in_executor(pool, match_local, titles, route, args.regions))
+    for (route, idx), found in zip(groups.items(), await asyncio.gather(*jobs)):
+        for i, links in zip(idx, found):
+            out[i]["links"] = links
+
+    if online_slots is not None:
+        from scrapers.aggregator import REGISTRY, get_all_download_links
+
+        online = [name for name in REGISTRY if name not in LOCAL_PROVIDERS]
+
+        async def lookup(i: int, route: PlatformRoute) -> None:
+            async with online_slots:
+                found = await get_all_download_links(
+                    _field(rows[i], title_key), route, only=online, regions=args.regions
+                )
+            # Online providers are listed first, as in the bot
+            out[i]["links"] = [
+                {"source": source, "url": url, "disc": disc} for source, url, disc in found
+            ] + out[i]["links"]
+
+        await asyncio.gather(*(lookup(i, route) for route, idx in groups.items() for i in idx))
+    return out
+
+
+async def run(args, out) -> dict:
+    config = _load_config()
+    emulatorjs_base = config.get("emulatorJsBaseUrl", "").strip() or emulatorjs.BASE_URL
+    emulatorjs.set_base_url(emulatorjs_base)
+    if "cachePath" in config:
+        cache_path = config["cachePath"].strip()
+        shared_cache.set_path(os.path.join(ROOT_DIR, cache_path) if cache_path else None)
+    if args.regions is None:
+        args.regions = config.get("regionPriority") or None
+
+    budgets = config.get("cacheBudgetsMb", {})
+    _init_worker(args.myrient_index, args.emulatorjs_index, emulatorjs.BASE_URL, budgets)
+    pools = []
+    if args.workers > 1:
+        # One single-process pool per worker, so platforms stick to a worker
+        pools = [
+            concurrent.futures.ProcessPoolExecutor(
+                1,
+                initializer=_init_worker,
+                initargs=(myrient.INDEX_PATH, emulatorjs.INDEX_PATH, emulatorjs.BASE_URL, budgets),
+            )
+            for _ in range(args.workers)
+        ]
+    online_slots = asyncio.Semaphore(args.concurrency) if args.online else None
+
+    stats = {"rows": 0, "matched": 0, "errors": 0}
+    start = time.perf_counter()
+    pending: collections.deque[asyncio.Task] = collections.deque()
+
+    async def flush_one() -> None:
+        for result in await pending.popleft():
+            stats["rows"] += 1
+            stats["matched"] += bool(result["links"])
+            stats["errors"] += "error" in result
+            out.write(json.dumps(result, ensure_ascii=False) + "\n")
+        elapsed = time.perf_counter() - start
+        print(f"[bulk] {stats['rows']} rows, {stats['matched']} with links "
+              f"({stats['rows'] / elapsed:.0f} rows/s)", file=sys.stderr)
+
+    try:
+        chunk: list[dict] = []
+        for row in read_rows(args.input, args.format):
+            chunk.append(row)
+            if len(chunk) >= args.chunk_size:
+                pending.append(asyncio.create_task(resolve_chunk(chunk, args, pools, online_slots)))
+                chunk = []
+                # Keep every worker busy without reading the whole file ahead
+                while len(pending) > args.workers:
+                    await flush_one()
+        if chunk:
+            pending.append(asyncio.create_task(resolve_chunk(chunk, args, pools, online_slots)))
+        while pending:
+            await flush_one()
+    finally:
+        for pool in pools:
+            pool.shutdown(cancel_futures=True)
+    stats["seconds"] = round(time.perf_counter() - start, 1)
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Resolve download links for many games at once.")
+    parser.add_argument("input", help="CSV or JSONL file with title and platform columns, or - for stdin")
+    parser.add_argument("--output", default="-", help="JSONL output file (default: stdout)")
+    parser.add_argument("--format", choices=("csv", "jsonl"), help="input format (default: from extension)")
+    parser.add_argument("--title-column", default="title")
+    parser.add_argument("--platform-column", default="platform")
+    parser.add_argument("--myrient-index", default=myrient.INDEX_PATH)
+    parser.add_argument("--emulatorjs-index", default=emulatorjs.INDEX_PATH)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="processes matching against the local indexes")
+    parser.add_argument("--chunk-size", type=int, default=2000, help="rows per unit of work")
+    parser.add_argument("--online", action="store_true", help="also query RomsPure and GOG-Games")
+    parser.add_argument("--concurrency", type=int, default=8, help="online lookups at a time")
+    parser.add_argument("--regions", type=lambda s: [r.strip() for r in s.split(",") if r.strip()],
+                        help="preferred release regions in order, e.g. Europe,USA,Japan")
+    args = parser.parse_args()
+
+    if args.output == "-":
+        # Keep the scrapers' own logging out of the JSONL on stdout
+        out = sys.stdout
+        with contextlib.redirect_stdout(sys.stderr):
+            stats = asyncio.run(run(args, out))
+    else:
+        with open(args.output, "w", encoding="utf-8") as out:
+            stats = asyncio.run(run(args, out))
+    print(f"[bulk] done: {json.dumps(stats)}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Report how much memory the bot's indexes and caches take.
+
+Loads the local Myrient and EmulatorJS indexes and the autocomplete index
+the way a bot process does, searches ``--platforms`` Myrient platforms once
+each to fill the per-platform cache, then prints what ``!memory`` shows::
+
+    python scripts/memory_report.py
+    python scripts/memory_report.py --platforms 60 --budget myrient.platforms=64
+    python scripts/memory_report.py --tracemalloc --output memory.json
+
+Budgets come from ``cacheBudgetsMb`` in ``config.json``; ``--budget NAME=MB``
+overrides one for this run. ``--tracemalloc`` traces allocations from the
+start and adds the files that allocated the most.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, ROOT_DIR)
+
+
+def _load_config() -> dict:
+    path = os.environ.get("LETMEPLAYTHIS_CONFIG") or os.path.join(ROOT_DIR, "config.json")
+    if not os.path.isfile(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _budget(value: str) -> tuple[str, float]:
+    name, _, mb = value.partition("=")
+    try:
+        return name.strip(), float(mb)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected NAME=MB, got {value!r}") from None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Report memory used by the local indexes and caches.")
+    parser.add_argument("--myrient-index", help="Myrient index file (default: the bot's)")
+    parser.add_argument("--emulatorjs-index", help="EmulatorJS index file (default: the bot's)")
+    parser.add_argument("--platforms", type=int, default=16,
+                        help="Myrient platforms to search once each (default: %(default)s)")
+    parser.add_argument("--no-titles", action="store_true", help="skip building the autocomplete index")
+    parser.add_argument("--budget", type=_budget, action="append", default=[],
+                        help="cache budget as NAME=MB, e.g. myrient.platforms=64")
+    parser.add_argument("--tracemalloc", action="store_true", help="trace allocations (slower)")
+    parser.add_argument("--output", help="also write the report as JSON to this file")
+    args = parser.parse_args()
+
+    if args.tracemalloc:
+        import tracemalloc
+
+        tracemalloc.start()
+
+    from scrapers import emulatorjs, memory, myrient, title_index
+    from scrapers.platform_map import MYRIENT_PLATFORM_MAP
+
+    memory.set_budgets({**_load_config().get("cacheBudgetsMb", {}), **dict(args.budget)})
+    if args.myrient_index:
+        myrient.INDEX_PATH = args.myrient_index
+    if args.emulatorjs_index:
+        emulatorjs.INDEX_PATH = args.emulatorjs_index
+
+    start = time.perf_counter()
+    next(myrient.iter_index(), None)
+    emulatorjs._load_index()
+    if not args.no_titles:
+        title_index.build_default()
+    # One search per platform, as a bot would after that many different games
+    platforms = {}
+    for name, subpath in MYRIENT_PLATFORM_MAP.items():
+        platforms.setdefault(subpath, name)
+    for name in list(platforms.values())[:args.platforms]:
+        myrient.match_many(["memory report"], name)
+    print(f"[memory] loaded in {time.perf_counter() - start:.1f}s\n")
+
+    data = memory.report()
+    print(memory.format_report(data))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        print(f"\n[memory] wrote report to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
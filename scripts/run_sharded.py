@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Run the bot as several processes, each handling a slice of the shards.
+
+Typical use::
+
+    python scripts/run_sharded.py --processes 4 --shards 8
+
+Every process runs ``bot.py`` as an ``AutoShardedBot`` for its shards. The
+processes share the memory-mapped Myrient index and the SQLite response cache
+in ``data/``, and split the TheGamesDB request rate evenly. A process that
+exits unexpectedly is restarted after a short delay; Ctrl+C stops them all.
+"""
+
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(SCRIPT_DIR)
+BOT_PATH = os.path.join(ROOT_DIR, "bot.py")
+
+RESTART_DELAY = 5.0
+
+
+def assign_shards(shards: int, processes: int) -> list[list[int]]:
+    """Split ``range(shards)`` into ``processes`` contiguous, even slices."""
+    return [
+        list(range(shards * i // processes, shards * (i + 1) // processes))
+        for i in range(processes)
+    ]
+
+
+def spawn(shard_ids: list[int], shards: int, processes: int) -> subprocess.Popen:
+    env = dict(os.environ)
+    env["LETMEPLAYTHIS_SHARD_IDS"] = ",".join(map(str, shard_ids))
+    env["LETMEPLAYTHIS_SHARD_COUNT"] = str(shards)
+    env["LETMEPLAYTHIS_PROCESS_COUNT"] = str(processes)
+    print(f"[sharded] starting shards {env['LETMEPLAYTHIS_SHARD_IDS']} of {shards}")
+    return subprocess.Popen([sys.executable, BOT_PATH], cwd=ROOT_DIR, env=env)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the bot across several processes.")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1,
+                        help="number of bot processes (default: one per CPU)")
+    parser.add_argument("--shards", type=int, default=0,
+                        help="total Discord shard count (default: one per process)")
+    args = parser.parse_args()
+
+    processes = max(1, args.processes)
+    shards = args.shards or processes
+    if shards < processes:
+        parser.error("--shards must be at least --processes")
+
+    slices = assign_shards(shards, processes)
+    children = {i: spawn(ids, shards, processes) for i, ids in enumerate(slices)}
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    while not stopping:
+        time.sleep(1)
+        for i, proc in list(children.items()):
+            code = proc.poll()
+            if code is None or stopping:
+                continue
+            print(f"[sharded] process for shards {slices[i]} exited with {code}; "
+                  f"restarting in {RESTART_DELAY:.0f}s")
+            time.sleep(RESTART_DELAY)
+            children[i] = spawn(slices[i], shards, processes)
+
+    print("[sharded] stopping...")
+    for proc in children.values():
+        if proc.poll() is None:
+            proc.terminate()
+    for proc in children.values():
+        try:
+            proc.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+if __name__ == "__main__":
+    main()
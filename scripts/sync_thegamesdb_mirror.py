@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""Build or refresh the local TheGamesDB mirror used for offline-first search.
+
+Typical use::
+
+    # initial load from a database dump, then platforms and images
+    python scripts/sync_thegamesdb_mirror.py --dump database-latest.json --platforms --images
+    # later, apply incremental edits
+    python scripts/sync_thegamesdb_mirror.py --updates --images
+
+``--dump`` accepts a local file or URL in the ``{"data": {"games": [...]}}``
+format served by TheGamesDB. ``--updates`` walks ``/v1/Games/Updates`` from
+the last applied edit id. ``--images`` fetches image filenames for every game
+that does not have them yet, many games per request. The API key and base
+URL are read from ``config.json`` unless given on the command line.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+import requests
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, ROOT_DIR)
+
+from scrapers import tgdb_mirror
+
+DEFAULT_BASE_URL = "https://api.thegamesdb.net"
+IMAGE_BATCH = 100
+IMAGE_TYPES = {"boxart", "clearlogo", "fanart", "banner", "screenshot", "titlescreen"}
+
+
+def _load_config() -> dict:
+    path = os.path.join(ROOT_DIR, "config.json")
+    if not os.path.isfile(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _get(session: requests.Session, url: str, params: dict | None = None) -> dict:
+    resp = session.get(url, params=params, timeout=60)
+    resp.raise_for_status()
+    data = resp.json()
+    remaining = data.get("remaining_monthly_allowance")
+    if remaining is not None:
+        print(f"[tgdb_mirror] {remaining} API calls left this month")
+    return data
+
+
+def load_dump(conn, source: str) -> None:
+    if source.startswith(("http://", "https://")):
+        print(f"[tgdb_mirror] Downloading {source}...")
+        resp = requests.get(source, timeout=600)
+        resp.raise_for_status()
+        data = resp.json()
+    else:
+        with open(source, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    games = data.get("data", {}).get("games", [])
+    tgdb_mirror.upsert_games(conn, games)
+    print(f"[tgdb_mirror] Loaded {len(games)} games from dump")
+
+
+def sync_platforms(conn, session, base_url: str, api_key: str) -> None:
+    data = _get(session, f"{base_url}/v1/Platforms", {"apikey": api_key})
+    platforms = data.get("data", {}).get("platforms", {})
+    if isinstance(platforms, dict):
+        platforms = list(platforms.values())
+    tgdb_mirror.upsert_platforms(conn, platforms)
+    print(f"[tgdb_mirror] Stored {len(platforms)} platforms")
+
+
+def sync_updates(conn, session, base_url: str, api_key: str) -> None:
+    last_edit = int(tgdb_mirror.get_meta("last_edit_id", conn) or 0)
+    url = f"{base_url}/v1/Games/Updates"
+    params: dict | None = {"apikey": api_key, "last_edit_id": last_edit}
+    applied = 0
+    while url:
+        data = _get(session, url, params)
+        for edit in data.get("data", {}).get("updates", []):
+            game_id = int(edit["game_id"])
+            field = edit.get("type")
+            if field == "delete":
+                tgdb_mirror.delete_game(conn, game_id)
+            elif field in tgdb_mirror.GAME_COLUMNS:
+                tgdb_mirror.update_game_field(conn, game_id, field, edit.get("value"))
+            elif field in IMAGE_TYPES:
+                # Refetch this game's images on the next --images run
+                conn.execute("UPDATE games SET images_synced = 0 WHERE id = ?", (game_id,))
+            last_edit = max(last_edit, int(edit.get("edit_id", last_edit)))
+            applied += 1
+        tgdb_mirror.set_meta(conn, "last_edit_id", str(last_edit))
+        conn.commit()
+        # The next page URL already carries the API key and cursor
+        url = (data.get("pages") or {}).get("next")
+        params = None
+    print(f"[tgdb_mirror] Applied {applied} edits (last edit id {last_edit})")
+
+
+def sync_images(conn, session, base_url: str, api_key: str) -> None:
+    pending = [r[0] for r in conn.execute("SELECT id FROM games WHERE images_synced = 0 ORDER BY id")]
+    print(f"[tgdb_mirror] Fetching images for {len(pending)} games...")
+    for start in range(0, len(pending), IMAGE_BATCH):
+        batch = pending[start:start + IMAGE_BATCH]
+        url = f"{base_url}/v1/Games/Images"
+        params: dict | None = {
+            "apikey": api_key,
+            "games_id": ",".join(str(i) for i in batch),
+            "filter[type]": "clearlogo,boxart",
+        }
+        found: dict[str, list] = {}
+        while url:
+            data = _get(session, url, params)
+            data_obj = data.get("data", {})
+            original = data_obj.get("base_url", {}).get("original")
+            if original:
+                tgdb_mirror.set_meta(conn, "image_base_url", original)
+            for gid, arr in data_obj.get("images", {}).items():
+                found.setdefault(gid, []).extend(arr)
+            url = (data.get("pages") or {}).get("next")
+            params = None
+        for game_id in batch:
+            tgdb_mirror.replace_images(conn, game_id, found.get(str(game_id), []))
+        conn.commit()
+        print(f"[tgdb_mirror] {min(start + IMAGE_BATCH, len(pending))}/{len(pending)} games done")
+
+
+def main() -> None:
+    config = _load_config()
+    parser = argparse.ArgumentParser(description="Sync the local TheGamesDB mirror.")
+    parser.add_argument("--db", default=tgdb_mirror.DB_PATH, help="mirror database path")
+    parser.add_argument("--dump", help="database dump JSON file or URL to import")
+    parser.add_argument("--platforms", action="store_true", help="fetch the platform list")
+    parser.add_argument("--updates", action="store_true", help="apply edits since the last sync")
+    parser.add_argument("--images", action="store_true", help="fetch missing image filenames")
+    parser.add_argument("--api-key", default=config.get("theGamesDbApiKey", ""))
+    parser.add_argument("--base-url", default=(
+        os.environ.get("THEGAMESDB_BASE_URL") or config.get("theGamesDbBaseUrl") or DEFAULT_BASE_URL
+    ))
+    args = parser.parse_args()
+
+    if not (args.dump or args.platforms or args.updates or args.images):
+        parser.error("nothing to do; pass --dump, --platforms, --updates and/or --images")
+    if (args.platforms or args.updates or args.images) and not args.api_key:
+        parser.error("an API key is required (config.json theGamesDbApiKey or --api-key)")
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.db)), exist_ok=True)
+    conn = tgdb_mirror.connect(args.db, create=True)
+    session = requests.Session()
+    base_url = args.base_url.rstrip("/")
+
+    if args.dump:
+        load_dump(conn, args.dump)
+        conn.commit()
+    if args.platforms:
+        sync_platforms(conn, session, base_url, args.api_key)
+        conn.commit()
+    if args.updates:
+        sync_updates(conn, session, base_url, args.api_key)
+    if args.images:
+        sync_images(conn, session, base_url, args.api_key)
+
+    total = conn.execute("SELECT COUNT(*) FROM games").fetchone()[0]
+    conn.close()
+    print(f"[tgdb_mirror] Mirror at {args.db} holds {total} games.")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,8 +6,15 @@ All ``*.json`` files in the given directory (or the script's own directory if
 no path is supplied) are parsed. Each JSON file should contain an ``items``
 object mapping game titles to their configuration. The filename without the
 extension is used as the system's short code.
+
+The index is written to a temporary file, verified and swapped into place
+with a manifest, so a running bot keeps its current index until then. An
+index with far fewer titles than the last one, or with systems that lost
+every title, is refused unless ``--force`` is given.
 """
 
+import argparse
+import hashlib
 import json
 import os
 import sys
@@ -16,7 +23,8 @@ SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 ROOT_DIR = os.path.dirname(SCRIPT_DIR)
 sys.path.insert(0, ROOT_DIR)
 
-from scrapers.emulatorjs import INDEX_PATH
+from scrapers import index_store
+from scrapers.paths import EMULATORJS_INDEX as INDEX_PATH
 
 
 def _collect_titles(config_dir: str) -> dict[str, list[str]]:
@@ -46,16 +54,29 @@ def _collect_titles(config_dir: str) -> dict[str, list[str]]:
 
 
 def main() -> None:
-    if len(sys.argv) > 2:
-        print("Usage: update_emulatorjs_index.py [path_to_configs]")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description="Generate the EmulatorJS game index.")
+    parser.add_argument("path_to_configs", nargs="?", default=SCRIPT_DIR)
+    parser.add_argument("--force", action="store_true",
+                        help="publish the new index even if it looks much smaller than the last one")
+    args = parser.parse_args()
 
-    config_dir = sys.argv[1] if len(sys.argv) == 2 else SCRIPT_DIR
-    index = _collect_titles(config_dir)
+    index = _collect_titles(args.path_to_configs)
+    data = json.dumps(index, indent=2).encode("utf-8")
     os.makedirs(os.path.dirname(INDEX_PATH), exist_ok=True)
-    with open(INDEX_PATH, "w", encoding="utf-8") as f:
-        json.dump(index, f, indent=2)
-    print(f"[emulatorjs] wrote index for {len(index)} systems to {INDEX_PATH}")
+    tmp = INDEX_PATH + ".new"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    try:
+        manifest = index_store.publish(
+            tmp, INDEX_PATH,
+            entries=sum(len(titles) for titles in index.values()),
+            groups={code: len(titles) for code, titles in index.items()},
+            sha256=hashlib.sha256(data).hexdigest(),
+            force=args.force,
+        )
+    except index_store.IndexBuildError as e:
+        sys.exit(f"[emulatorjs] index not updated: {e}")
+    print(f"[emulatorjs] wrote index version {manifest['version']} for {len(index)} systems to {INDEX_PATH}")
 
 
 if __name__ == "__main__":
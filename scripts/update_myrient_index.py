@@ -2,9 +2,26 @@
 """Utility to update the local Myrient file index.
 
 This script crawls the Myrient open directory using Python code (no `rclone`
-required) and writes the results to `data/myrient_index.txt`.
+required) and writes the results, sorted, to `data/myrient_index.blocks`.
+Pass ``--sort`` to sort an index written by an older version in place so it
+can be memory-mapped and shared between bot processes.
+
+The index is stored compressed, one block per directory, so only the
+platform being searched is ever decompressed. ``--format text`` writes a
+plain sorted list instead; ``--sort --format ...`` converts an existing
+index between the two. Text indexes are kept in `data/myrient_index.txt`;
+converting moves the index to the other name. Blocks use zlib unless
+``--codec zstd`` is given, which needs the optional ``zstandard`` package
+on every host that reads the index.
+
+The crawl goes to a separate file; the bot keeps using the current index
+until the new one has been verified and swapped in with its manifest
+(``data/myrient_index.blocks.manifest.json``). A build with far fewer entries
+than the last one, or with platforms that lost every file, is refused
+unless ``--force`` is given.
 """
 
+import argparse
 import os
 import sys
 
@@ -12,10 +29,40 @@ SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 ROOT_DIR = os.path.dirname(SCRIPT_DIR)
 sys.path.insert(0, ROOT_DIR)
 
-from scrapers.myrient import update_index, PROGRESS_PATH, INDEX_PATH
+from scrapers.index_store import IndexBuildError
+from scrapers import myrient
+from scrapers.myrient import update_index, sort_index, PROGRESS_PATH
 
 
 def main() -> None:
+    parser = argparse.ArgumentParser(description="Update the local Myrient file index.")
+    parser.add_argument("--sort", action="store_true", help="only sort the existing index in place")
+    parser.add_argument("--force", action="store_true",
+                        help="publish the new index even if it looks much smaller than the last one")
+    parser.add_argument("--format", choices=("compressed", "text"), default="compressed",
+                        help="index file format (default: %(default)s)")
+    parser.add_argument("--codec", choices=("zlib", "zstd"), default="zlib",
+                        help="block codec for the compressed format (default: %(default)s); "
+                             "zstd needs the zstandard package wherever the index is read")
+    args = parser.parse_args()
+    compress = args.format == "compressed"
+    myrient.BLOCK_CODEC = args.codec
+    if compress:
+        try:
+            myrient._codec()  # fail before a long crawl, not after it
+        except ValueError as e:
+            sys.exit(str(e))
+    if args.sort:
+        if not os.path.exists(myrient.INDEX_PATH):
+            print(f"No index at {myrient.INDEX_PATH}.")
+            return
+        try:
+            total = sort_index(force=args.force, compress=compress)
+            print(f"Sorted {total} entries in {myrient.INDEX_PATH}.")
+        except IndexBuildError as e:
+            sys.exit(f"Index not updated: {e}")
+        return
+
     resume = False
     if os.path.exists(PROGRESS_PATH):
         while True:
@@ -33,12 +80,16 @@ def main() -> None:
             return
 
     if not resume:
-        if os.path.exists(INDEX_PATH):
-            os.remove(INDEX_PATH)
+        # The live index stays in place until the new crawl is published
+        if os.path.exists(myrient.partial_path()):
+            os.remove(myrient.partial_path())
         if os.path.exists(PROGRESS_PATH):
             os.remove(PROGRESS_PATH)
 
-    update_index(resume=resume)
+    try:
+        update_index(resume=resume, force=args.force, compress=compress)
+    except IndexBuildError as e:
+        sys.exit(f"Index not updated: {e}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""Report platforms that no download provider can serve.
+
+Platform names come from the local TheGamesDB mirror if it has a platform
+list, from ``/v1/Platforms`` with ``--api``, or from the command line::
+
+    python scripts/validate_platforms.py
+    python scripts/validate_platforms.py --api
+    python scripts/validate_platforms.py "Sega Master System" "Nintendo DS"
+
+Each platform is resolved through ``scrapers.platform_map`` and listed with
+the providers the bot would ask for it (``providers_for``), so per-provider
+rules such as PC and DOS going to GOG-Games only are reflected. The script
+also checks that routed Myrient directories and EmulatorJS codes exist in
+the local indexes, and exits with status 1 if any platform has no provider.
+
+Without a mirror, ``--api`` or names there is nothing independent to check
+against, and the script stops; ``--maps`` lists the platforms of the
+provider maps themselves, which only checks the local indexes.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, ROOT_DIR)
+
+from scrapers import emulatorjs, myrient, tgdb_mirror
+from scrapers.aggregator import providers_for
+from scrapers.platform_map import known_platforms, resolve_platform
+
+DEFAULT_BASE_URL = "https://api.thegamesdb.net"
+
+
+def _load_config() -> dict:
+    path = os.path.join(ROOT_DIR, "config.json")
+    if not os.path.isfile(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _api_platforms(base_url: str, api_key: str) -> list[str]:
+    import requests
+
+    resp = requests.get(f"{base_url}/v1/Platforms", params={"apikey": api_key}, timeout=60)
+    resp.raise_for_status()
+    platforms = resp.json().get("data", {}).get("platforms", {})
+    if isinstance(platforms, dict):
+        platforms = list(platforms.values())
+    return [p["name"] for p in platforms if p.get("name")]
+
+
+def _mirror_platforms() -> list[str]:
+    if not os.path.isfile(tgdb_mirror.DB_PATH):
+        return []
+    conn = tgdb_mirror.connect()
+    try:
+        return [r[0] for r in conn.execute("SELECT name FROM platforms ORDER BY name")]
+    finally:
+        conn.close()
+
+
+def main() -> None:
+    config = _load_config()
+    parser = argparse.ArgumentParser(description="Report platforms without a download route.")
+    parser.add_argument("names", nargs="*", help="platform names to check")
+    parser.add_argument("--api", action="store_true", help="check every platform listed by TheGamesDB")
+    parser.add_argument("--maps", action="store_true",
+                        help="check the provider maps' own platforms (only tests the local indexes)")
+    parser.add_argument("--api-key", default=config.get("theGamesDbApiKey", ""))
+    parser.add_argument("--base-url", default=(
+        os.environ.get("THEGAMESDB_BASE_URL") or config.get("theGamesDbBaseUrl") or DEFAULT_BASE_URL
+    ))
+    args = parser.parse_args()
+    # Play Now is only offered where the bot has a server for it
+    emulatorjs.set_base_url(config.get("emulatorJsBaseUrl", "").strip() or None)
+
+    if args.names:
+        names, source = args.names, "command line"
+    elif args.api:
+        if not args.api_key:
+            parser.error("an API key is required (config.json theGamesDbApiKey or --api-key)")
+        names, source = _api_platforms(args.base_url.rstrip("/"), args.api_key), "TheGamesDB API"
+    elif args.maps:
+        names, source = [r.name for r in known_platforms()], "provider maps"
+        print("Note: the provider maps always route their own platforms; this only checks the local indexes.")
+    else:
+        names, source = _mirror_platforms(), "local mirror"
+        if not names:
+            sys.exit(
+                f"No platform list in the mirror at {tgdb_mirror.DB_PATH}. Run "
+                "scripts/sync_thegamesdb_mirror.py --platforms, or pass --api or platform names."
+            )
+    print(f"Checking {len(names)} platforms from the {source}\n")
+
+    unrouted = []
+    for name in names:
+        route = resolve_platform(name)
+        carried = [provider.name for provider in providers_for(route)]
+        alias = f" -> {route.name}" if route.name != name else ""
+        print(f"  {name}{alias}: {', '.join(carried) or 'NO PROVIDER'}")
+        if not carried:
+            unrouted.append(name)
+
+    routes = [resolve_platform(n) for n in names]
+    if os.path.isfile(myrient.INDEX_PATH) and os.path.getsize(myrient.INDEX_PATH):
+        missing = sorted({
+            r.myrient for r in routes
+            if myrient.supports_platform(r) and not myrient._platform_entries(r.myrient.rstrip("/") + "/")
+        })
+        if missing:
+            print("\nMyrient directories with no files in the local index:")
+            for directory in missing:
+                print(f"  {directory}")
+    ejs_index = emulatorjs._load_index() if os.path.isfile(emulatorjs.INDEX_PATH) else {}
+    if ejs_index:
+        missing = sorted({r.emulatorjs for r in routes if r.emulatorjs and r.emulatorjs not in ejs_index})
+        if missing:
+            print("\nEmulatorJS codes missing from the local index: " + ", ".join(missing))
+
+    if unrouted:
+        print(f"\n{len(unrouted)} of {len(names)} platforms have no provider:")
+        for name in unrouted:
+            print(f"  {name}")
+        sys.exit(1)
+    print(f"\nAll {len(names)} platforms have at least one provider.")
+
+
+if __name__ == "__main__":
+    main()
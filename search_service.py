@@ -0,0 +1,249 @@
+# search_service.py
+"""Standalone download-link service.
+
+Runs the download-link providers (:mod:`scrapers.aggregator`) in their own
+process behind a small JSON API, so Playwright page loads and fuzzy matching
+never share an event loop with the Discord gateway. Start it with::
+
+    python search_service.py --socket data/search.sock
+    python search_service.py --port 8095
+
+and set ``searchServiceUrl`` in ``config.json`` to ``unix:data/search.sock``
+or ``http://127.0.0.1:8095``.
+
+``POST /links`` with ``{"title": ..., "platform": ...}`` and optionally
+``"regions": [...]`` (preferred release regions, in order) returns
+``{"links": [[source, url, disc], ...]}``; ``GET /status`` reports the queue
+and circuit-breaker state. Jobs go through a bounded queue worked by a fixed
+number of workers. When the queue is full the service answers 503 at once
+instead of letting latency grow, and identical requests that are already
+queued or running share one job.
+
+:class:`LinkServiceClient` is the matching client used by ``bot.py``; it
+only needs :mod:`aiohttp`, so importing this module does not load any
+scraper.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+
+import aiohttp
+from aiohttp import web
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SOCKET = os.path.join(SCRIPT_DIR, "data", "search.sock")
+
+
+class ServiceUnavailable(RuntimeError):
+    """Raised by the client when the service is unreachable, busy or failing."""
+
+
+# -------------------------------------------------------------------------
+# Server
+# -------------------------------------------------------------------------
+class LinkService:
+    def __init__(self, workers: int = 4, queue_size: int = 64) -> None:
+        self.workers = workers
+        self._queue: asyncio.Queue[tuple] = asyncio.Queue(queue_size)
+        self._jobs: dict[tuple, asyncio.Future] = {}
+        self._tasks: list[asyncio.Task] = []
+        self.running = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._tasks = [loop.create_task(self._work()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def submit(self, title: str, platform: str, regions: list[str] | None = None) -> asyncio.Future:
+        """Queue a lookup, or join an identical one; raises ``asyncio.QueueFull``."""
+        key = (title, platform, tuple(regions) if regions else None)
+        fut = self._jobs.get(key)
+        if fut is None:
+            self._queue.put_nowait(key)
+            fut = asyncio.get_running_loop().create_future()
+            # Nobody may be left waiting if every client hung up
+            fut.add_done_callback(lambda f: f.cancelled() or f.exception())
+            self._jobs[key] = fut
+        return fut
+
+    async def _work(self) -> None:
+        # Imported here so the client side never loads the scrapers
+        from scrapers.aggregator import get_all_download_links
+
+        while True:
+            key = await self._queue.get()
+            fut = self._jobs[key]
+            title, platform, regions = key
+            self.running += 1
+            try:
+                links = await get_all_download_links(title, platform, regions=list(regions) if regions else None)
+            except Exception as e:
+                print(f"[search_service] lookup {key} failed: {type(e).__name__}: {e}")
+                fut.set_exception(e)
+            else:
+                fut.set_result(links)
+            finally:
+                self.running -= 1
+                self.completed += 1
+                del self._jobs[key]
+                self._queue.task_done()
+
+    def status(self) -> dict:
+        from scrapers.aggregator import BREAKERS
+
+        return {
+            "queued": self._queue.qsize(),
+            "queue_size": self._queue.maxsize,
+            "running": self.running,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "breakers": {name: b.status() for name, b in BREAKERS.items()},
+        }
+
+
+async def _handle_links(request: web.Request) -> web.Response:
+    service: LinkService = request.app["service"]
+    try:
+        body = await request.json()
+        title, platform = body["title"], body["platform"]
+        regions = body.get("regions")
+    except (json.JSONDecodeError, KeyError, TypeError, AttributeError):
+        return web.json_response({"error": "expected {\"title\": ..., \"platform\": ...}"}, status=400)
+    if not isinstance(title, str) or not isinstance(platform, str):
+        return web.json_response({"error": "title and platform must be strings"}, status=400)
+    if regions is not None and not (isinstance(regions, list) and all(isinstance(r, str) for r in regions)):
+        return web.json_response({"error": "regions must be a list of strings"}, status=400)
+    try:
+        fut = service.submit(title, platform, regions)
+    except asyncio.QueueFull:
+        service.rejected += 1
+        return web.json_response({"error": "queue full"}, status=503)
+    try:
+        # Shielded: a client hanging up must not cancel a job others share
+        links = await asyncio.shield(fut)
+    except Exception as e:
+        return web.json_response({"error": f"{type(e).__name__}: {e}"}, status=500)
+    return web.json_response({"links": links})
+
+
+async def _handle_status(request: web.Request) -> web.Response:
+    return web.json_response(request.app["service"].status())
+
+
+def build_app(workers: int = 4, queue_size: int = 64) -> web.Application:
+    app = web.Application()
+    app["service"] = LinkService(workers, queue_size)
+
+    async def on_startup(app: web.Application) -> None:
+        app["service"].start()
+
+    async def on_cleanup(app: web.Application) -> None:
+        await app["service"].stop()
+
+    app.on_startup.append(on_startup)
+    app.on_cleanup.append(on_cleanup)
+    app.router.add_post("/links", _handle_links)
+    app.router.add_get("/status", _handle_status)
+    return app
+
+
+def _apply_config() -> None:
+    """Apply the provider settings from the bot's config file, if present."""
+    path = os.environ.get("LETMEPLAYTHIS_CONFIG") or os.path.join(SCRIPT_DIR, "config.json")
+    if not os.path.isfile(path):
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        config = json.load(f)
+
+    import scrapers.emulatorjs as emulatorjs
+    import scrapers.memory as memory
+    import scrapers.myrient as myrient
+    import scrapers.shared_cache as shared_cache
+
+    memory.set_budgets(config.get("cacheBudgetsMb", {}))
+    emulatorjs.set_base_url(config.get("emulatorJsBaseUrl", "").strip() or None)
+    if config.get("regionPriority"):
+        myrient.REGION_PRIORITY = list(config["regionPriority"])
+    if "cachePath" in config:
+        cache_path = config["cachePath"].strip()
+        shared_cache.set_path(os.path.join(SCRIPT_DIR, cache_path) if cache_path else None)
+
+
+# -------------------------------------------------------------------------
+# Client
+# -------------------------------------------------------------------------
+class LinkServiceClient:
+    """Calls a running link service; ``url`` is ``unix:PATH`` or ``http://HOST:PORT``."""
+
+    def __init__(self, url: str, timeout: float = 60.0) -> None:
+        if url.startswith("unix:"):
+            path = url[len("unix:"):]
+            self._socket = path if os.path.isabs(path) else os.path.join(SCRIPT_DIR, path)
+            self._base = "http://localhost"
+        else:
+            self._socket = None
+            self._base = url.rstrip("/")
+        self._timeout = aiohttp.ClientTimeout(total=timeout)
+        self._session: aiohttp.ClientSession | None = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.UnixConnector(path=self._socket) if self._socket else None
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self._timeout)
+        return self._session
+
+    async def get_all_download_links(
+        self, game_title: str, platform_name: str, regions: list[str] | None = None
+    ) -> list[tuple[str, str, int | None]]:
+        """Same contract as :func:`scrapers.aggregator.get_all_download_links`."""
+        body = {"title": game_title, "platform": platform_name}
+        if regions:
+            body["regions"] = list(regions)
+        try:
+            async with self._get_session().post(f"{self._base}/links", json=body) as resp:
+                data = await resp.json()
+                if resp.status != 200:
+                    raise ServiceUnavailable(f"HTTP {resp.status}: {data.get('error')}")
+        except (aiohttp.ClientError, asyncio.TimeoutError, json.JSONDecodeError) as e:
+            raise ServiceUnavailable(f"{type(e).__name__}: {e}") from e
+        return [tuple(link) for link in data["links"]]
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve download-link lookups over a local JSON API.")
+    parser.add_argument("--socket", help=f"Unix socket path (default: {DEFAULT_SOCKET})")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, help="listen on TCP instead of a Unix socket")
+    parser.add_argument("--workers", type=int, default=4, help="lookups run concurrently")
+    parser.add_argument("--queue-size", type=int, default=64, help="lookups waiting before 503s")
+    args = parser.parse_args()
+
+    _apply_config()
+    app = build_app(args.workers, args.queue_size)
+    if args.port:
+        print(f"[search_service] listening on http://{args.host}:{args.port}")
+        web.run_app(app, host=args.host, port=args.port, print=None)
+    else:
+        path = args.socket or DEFAULT_SOCKET
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        print(f"[search_service] listening on unix:{path}")
+        web.run_app(app, path=path, print=None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,8 @@
+# tests/conftest.py
+"""Make the repository root importable, as the scripts do."""
+
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
@@ -0,0 +1,92 @@
+# tests/test_circuit_breaker.py
+import asyncio
+
+from scrapers.circuit_breaker import CLOSED, OPEN, CircuitBreaker
+
+
+def _breaker(**kwargs) -> CircuitBreaker:
+    return CircuitBreaker("test", failure_threshold=3, cooldown=30.0, **kwargs)
+
+
+def test_opens_after_threshold_consecutive_failures():
+    breaker = _breaker()
+    breaker.record_failure("boom")
+    breaker.record_failure("boom")
+    assert breaker.state == CLOSED and breaker.allow()
+    breaker.record_failure("boom")
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+
+
+def test_success_resets_the_failure_count():
+    breaker = _breaker()
+    breaker.record_failure("boom")
+    breaker.record_failure("boom")
+    breaker.record_success(0.1)
+    breaker.record_failure("boom")
+    assert breaker.state == CLOSED
+    assert breaker.failures == 1
+
+
+def test_slow_success_counts_as_failure():
+    breaker = _breaker(slow_after=1.0)
+    for _ in range(3):
+        breaker.record_success(2.0)
+    assert breaker.state == OPEN
+
+
+def test_without_probe_lets_one_call_through_after_cooldown():
+    breaker = _breaker()
+    for _ in range(3):
+        breaker.record_failure("boom")
+    breaker.opened_at -= 31
+    assert not breaker.allow()  # this check half-opens it
+    assert breaker.state == CLOSED and breaker.allow()
+    # One more failure reopens it straight away
+    breaker.record_failure("still down")
+    assert breaker.state == OPEN
+
+
+def test_probe_closes_only_on_success():
+    async def scenario(probe_ok: bool) -> str:
+        async def probe():
+            if not probe_ok:
+                raise RuntimeError("down")
+
+        breaker = _breaker(probe=probe)
+        for _ in range(3):
+            breaker.record_failure("boom")
+        breaker.opened_at -= 31
+        assert not breaker.allow()  # user calls never wait on the probe
+        await breaker._probe_task
+        return breaker.state
+
+    assert asyncio.run(scenario(True)) == CLOSED
+    assert asyncio.run(scenario(False)) == OPEN
+
+
+def test_call_returns_fallback_and_records_timeouts():
+    async def scenario():
+        breaker = _breaker(max_timeout=0.05)
+
+        async def hang():
+            await asyncio.sleep(1)
+
+        results = [await breaker.call(hang, fallback="fallback") for _ in range(3)]
+        return breaker, results
+
+    breaker, results = asyncio.run(scenario())
+    assert results == ["fallback"] * 3
+    assert breaker.state == OPEN
+
+
+def test_timeout_follows_recent_latency():
+    breaker = _breaker(min_timeout=2.0, max_timeout=15.0)
+    assert breaker.timeout() == 15.0  # too few samples
+    for _ in range(20):
+        breaker.record_success(1.5)
+    assert breaker.timeout() == 3.0
+    # Once the slow calls leave the window, the floor applies
+    for _ in range(50):
+        breaker.record_success(0.1)
+    assert breaker.timeout() == 2.0
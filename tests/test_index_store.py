@@ -0,0 +1,88 @@
+# tests/test_index_store.py
+import hashlib
+import os
+
+import pytest
+
+from scrapers import index_store
+
+
+def _write(path: str, data: bytes) -> str:
+    with open(path, "wb") as f:
+        f.write(data)
+    return hashlib.sha256(data).hexdigest()
+
+
+def test_check_build_accepts_a_similar_build():
+    previous = {"entries": 100, "groups": {"a": 60, "b": 40}}
+    assert index_store.check_build(90, {"a": 50, "b": 40}, previous) == []
+    assert index_store.check_build(10, {"a": 10}, None) == []
+
+
+def test_check_build_rejects_empty_shrunk_or_lost_platforms():
+    previous = {"entries": 100, "groups": {"a": 60, "b": 40}}
+    assert index_store.check_build(0, {}, None) == ["the new index is empty"]
+    problems = index_store.check_build(45, {"a": 45}, previous)
+    assert problems == ["45 entries, down from 100", "1 platforms lost every entry: b"]
+
+
+def test_publish_renames_and_writes_versioned_manifest(tmp_path):
+    path = str(tmp_path / "index.txt")
+    tmp = path + ".new"
+    sha = _write(tmp, b"a/1\nb/2\n")
+    manifest = index_store.publish(tmp, path, 2, {"a": 1, "b": 1}, sha, sorted=True)
+    assert not os.path.exists(tmp)
+    assert manifest["version"] == 1 and manifest["sorted"] is True
+    assert index_store.read_manifest(path) == manifest
+    with open(path, "rb") as f:
+        data = f.read()
+    assert index_store.matches(data, manifest)
+    assert index_store.size_matches(data, manifest)
+
+    sha = _write(tmp, b"a/1\nb/2\nb/3\n")
+    assert index_store.publish(tmp, path, 3, {"a": 1, "b": 2}, sha)["version"] == 2
+
+
+def test_publish_refuses_a_bad_build_and_keeps_the_live_index(tmp_path):
+    path = str(tmp_path / "index.txt")
+    tmp = path + ".new"
+    index_store.publish(tmp, path, 4, {"a": 2, "b": 2}, _write(tmp, b"a/1\na/2\nb/1\nb/2\n"))
+
+    sha = _write(tmp, b"a/1\n")
+    with pytest.raises(index_store.IndexBuildError, match="platforms lost every entry: b"):
+        index_store.publish(tmp, path, 1, {"a": 1}, sha)
+    assert os.path.exists(tmp)
+    assert index_store.read_manifest(path)["version"] == 1
+
+    # force publishes it anyway
+    assert index_store.publish(tmp, path, 1, {"a": 1}, sha, force=True)["version"] == 2
+
+
+def test_publish_refuses_a_file_changed_after_writing(tmp_path):
+    path = str(tmp_path / "index.txt")
+    tmp = path + ".new"
+    sha = _write(tmp, b"a/1\n")
+    _write(tmp, b"a/2\n")
+    with pytest.raises(index_store.IndexBuildError, match="checksum mismatch"):
+        index_store.publish(tmp, path, 1, {"a": 1}, sha)
+    assert not os.path.exists(path)
+
+
+def test_publish_numbers_from_a_previous_manifest(tmp_path):
+    path = str(tmp_path / "index.blocks")
+    tmp = path + ".new"
+    previous = {"version": 7, "entries": 1, "groups": {"a": 1}}
+    assert index_store.publish(tmp, path, 1, {"a": 1}, _write(tmp, b"x"), previous=previous)["version"] == 8
+
+
+def test_watcher_reports_each_manifest_change_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(index_store, "CHECK_INTERVAL", 0.0)
+    path = str(tmp_path / "index.txt")
+    watcher = index_store.Watcher()
+    assert not watcher.changed(path)  # no manifest yet
+    tmp = path + ".new"
+    index_store.publish(tmp, path, 1, {"a": 1}, _write(tmp, b"a/1\n"))
+    assert watcher.changed(path)
+    assert not watcher.changed(path)
+    index_store.publish(tmp, path, 2, {"a": 2}, _write(tmp, b"a/1\na/2\n"))
+    assert watcher.changed(path)
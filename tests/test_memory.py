@@ -0,0 +1,66 @@
+# tests/test_memory.py
+import pytest
+
+from scrapers import memory
+
+
+@pytest.fixture(autouse=True)
+def restore_registry():
+    saved = dict(memory.BUDGETS), dict(memory.CACHES), dict(memory.REGISTRY)
+    yield
+    for target, original in zip((memory.BUDGETS, memory.CACHES, memory.REGISTRY), saved):
+        target.clear()
+        target.update(original)
+
+
+def _cache(**kwargs) -> memory.BoundedCache:
+    return memory.BoundedCache("test-cache", sizeof=lambda v: v, **kwargs)
+
+
+def test_evicts_least_recently_used():
+    cache = _cache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 1)
+    cache.get("a")
+    cache.put("c", 1)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 1
+    assert cache.evictions == 1
+
+
+def test_byte_budget_keeps_the_newest_entry():
+    cache = _cache(max_bytes=10_000)
+    cache.put("a", 4_000)
+    cache.put("b", 4_000)
+    cache.put("c", 4_000)
+    assert len(cache) == 2 and cache.get("a") is None
+    cache.put("huge", 50_000)
+    assert len(cache) == 1 and cache.get("huge") == 50_000
+
+
+def test_replacing_a_key_does_not_double_count():
+    cache = _cache()
+    cache.put("a", 100)
+    cache.put("a", 300)
+    assert len(cache) == 1
+    assert cache.nbytes == cache.stats()["estimated_bytes"] < 400 + 100
+
+
+def test_stats_and_report():
+    cache = _cache(max_entries=10)
+    cache.put("a", 1)
+    cache.get("a")
+    cache.get("missing")
+    stats = cache.stats()
+    assert (stats["entries"], stats["hits"], stats["misses"]) == (1, 1, 1)
+    row = next(r for r in memory.report()["structures"] if r["name"] == "test-cache")
+    assert row["hit_rate"] == 0.5 and row["bytes"] > 0
+
+
+def test_set_budgets_applies_to_current_and_future_caches():
+    cache = _cache()
+    for key in "abcd":
+        cache.put(key, 400_000)
+    memory.set_budgets({"test-cache": 1})
+    assert len(cache) == 2 and cache.max_bytes == 1024 * 1024
+    assert memory.BoundedCache("test-cache", max_bytes=5).max_bytes == 1024 * 1024
@@ -0,0 +1,95 @@
+# tests/test_myrient_blocks.py
+import contextlib
+import io
+import os
+import sys
+
+import pytest
+
+from scrapers import myrient
+
+ENTRIES = [
+    "Redump/Sony - PlayStation/Crash Bandicoot (USA).zip",
+    "Redump/Sony - PlayStation/Final Fantasy VII (USA) (Disc 1).zip",
+    "Redump/Sony - PlayStation/Final Fantasy VII (USA) (Disc 2).zip",
+    "Redump/Sony - PlayStation 2/Ico (USA).zip",
+    "No-Intro/Nintendo - Game Boy/Tetris (World).zip",
+    "No-Intro/Nintendo - Game Boy/Tetris (World) (Rev 1).zip",
+    "No-Intro/Nintendo - Game Boy Color/Tetris DX (World).zip",
+    "README.txt",
+]
+
+
+def _publish(tmp_path, compress: bool) -> str:
+    """Write ENTRIES unsorted as text and publish them in the given format."""
+    path = str(tmp_path / "myrient_index.txt")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(reversed(ENTRIES)) + "\n" + ENTRIES[0] + "\n")
+    with contextlib.redirect_stdout(io.StringIO()):
+        myrient.sort_index(path, compress=compress)
+    return myrient.index_path(path, compress)
+
+
+@pytest.fixture
+def indexes(tmp_path):
+    (tmp_path / "text").mkdir()
+    (tmp_path / "blocks").mkdir()
+    text = myrient._SortedIndex(_publish(tmp_path / "text", False))
+    blocks = myrient._BlockIndex(_publish(tmp_path / "blocks", True))
+    yield text, blocks
+    text.close()
+    blocks.close()
+
+
+def test_blocks_hold_every_entry_once_in_sorted_order(indexes):
+    text, blocks = indexes
+    assert sorted(blocks) == sorted(ENTRIES)
+    assert len(blocks) == len(ENTRIES)
+    assert list(text) == sorted(ENTRIES)
+
+
+@pytest.mark.parametrize("prefix", [
+    "Redump/Sony - PlayStation/",
+    "Redump/Sony - PlayStation",  # also takes in "PlayStation 2"
+    "No-Intro/Nintendo - Game Boy/",
+    "No-Intro/",
+    "No-Intro/Nintendo - Game Boy/Tetris (World) (",  # ends inside a file name
+    "",
+    "Nothing here/",
+])
+def test_entries_match_the_sorted_text_index(indexes, prefix):
+    text, blocks = indexes
+    assert blocks.entries(prefix) == text.entries(prefix)
+
+
+def test_publishing_in_the_other_format_moves_the_file(tmp_path):
+    blocks_path = _publish(tmp_path, True)
+    assert blocks_path.endswith(".blocks")
+    assert sorted(os.listdir(tmp_path)) == ["myrient_index.blocks", "myrient_index.blocks.manifest.json"]
+    with open(blocks_path, "rb") as f:
+        assert f.read(len(myrient.BLOCKS_MAGIC)) == myrient.BLOCKS_MAGIC
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        myrient.sort_index(blocks_path, compress=False)
+    assert sorted(os.listdir(tmp_path)) == ["myrient_index.txt", "myrient_index.txt.manifest.json"]
+    text_path = str(tmp_path / "myrient_index.txt")
+    assert list(myrient._read_entries(text_path)) == sorted(ENTRIES)
+
+
+def test_index_path_only_renames_known_suffixes():
+    assert myrient.index_path("data/myrient_index.txt", True) == "data/myrient_index.blocks"
+    assert myrient.index_path("data/myrient_index.blocks", False) == "data/myrient_index.txt"
+    assert myrient.index_path("/tmp/custom.idx", True) == "/tmp/custom.idx"
+
+
+def test_zstd_without_the_package_fails_clearly(tmp_path, monkeypatch):
+    monkeypatch.setitem(sys.modules, "zstandard", None)
+    monkeypatch.setattr(myrient, "BLOCK_CODEC", "zstd")
+    with pytest.raises(ValueError, match="zstandard"):
+        myrient._codec()
+
+    header = b'{"codec": "zstd", "blocks": [["a", 0, 1, 1]]}'
+    path = tmp_path / "zstd.blocks"
+    path.write_bytes(myrient.BLOCKS_MAGIC + len(header).to_bytes(4, "little") + header + b"x")
+    with pytest.raises(ValueError, match="install the zstandard package"):
+        myrient._BlockIndex(str(path))
@@ -0,0 +1,80 @@
+# tests/test_myrient_grouping.py
+import posixpath
+import urllib.parse
+
+from scrapers import myrient
+
+PS1 = "Redump/Sony - PlayStation/"
+SATURN = "Redump/Sega - Saturn/"
+ENTRIES = [PS1 + name for name in (
+    "Final Fantasy VII (USA) (Disc 2).zip",
+    "Final Fantasy VII (USA) (Disc 1).zip",
+    "Final Fantasy VII (USA) (Disc 3).zip",
+    "Final Fantasy VII (Europe) (Disc 1).zip",
+    "Final Fantasy VII (Europe) (Disc 2).zip",
+    "Final Fantasy VII (USA).m3u",
+    "Other Game (USA).zip",
+)] + [SATURN + name for name in (
+    "Nights (USA) (Track 2).bin",
+    "Nights (USA) (Track 10).bin",
+    "Nights (USA) (Track 1).bin",
+    "Nights (USA).cue",
+    "Panzer Dragoon (USA) (Disc 2) (Track 1).bin",
+    "Panzer Dragoon (USA) (Disc 1).cue",
+    "Panzer Dragoon (USA) (Disc 2).cue",
+    "Panzer Dragoon (USA) (Disc 1) (Track 2).bin",
+    "Panzer Dragoon (USA) (Disc 1) (Track 1).bin",
+)]
+
+
+def _pick(title: str, regions=None) -> list[tuple[str, int | None]]:
+    candidates = myrient._PlatformCandidates(ENTRIES)
+    found = candidates.pick(candidates.scores(myrient._normalize_title(title)), verbose=False, regions=regions)
+    return [(posixpath.basename(urllib.parse.unquote(url)), disc) for url, disc in found]
+
+
+def test_file_parts():
+    assert myrient._file_parts("Final Fantasy VII (USA) (Disc 2).zip")[:2] == ("Final Fantasy VII (USA)", 2)
+    assert myrient._file_parts("Nights (USA) (Track 10).bin")[0] == "Nights (USA)"
+    assert myrient._file_parts("Nights (USA) (Track 10).bin")[3] == 10
+    release, disc, _, track = myrient._file_parts("Other Game (USA).zip")
+    assert (release, disc, track) == ("Other Game (USA)", None, 0)
+
+
+def test_multi_disc_set_comes_back_whole_with_playlist_first():
+    assert _pick("Final Fantasy VII", ["USA"]) == [
+        ("Final Fantasy VII (USA).m3u", None),
+        ("Final Fantasy VII (USA) (Disc 1).zip", 1),
+        ("Final Fantasy VII (USA) (Disc 2).zip", 2),
+        ("Final Fantasy VII (USA) (Disc 3).zip", 3),
+    ]
+
+
+def test_regional_sets_are_not_mixed():
+    assert _pick("Final Fantasy VII", ["Europe"]) == [
+        ("Final Fantasy VII (Europe) (Disc 1).zip", 1),
+        ("Final Fantasy VII (Europe) (Disc 2).zip", 2),
+    ]
+
+
+def test_sheet_comes_before_tracks_in_numeric_order():
+    assert [name for name, _ in _pick("Nights")] == [
+        "Nights (USA).cue",
+        "Nights (USA) (Track 1).bin",
+        "Nights (USA) (Track 2).bin",
+        "Nights (USA) (Track 10).bin",
+    ]
+
+
+def test_each_disc_lists_its_sheet_then_its_tracks():
+    assert _pick("Panzer Dragoon") == [
+        ("Panzer Dragoon (USA) (Disc 1).cue", 1),
+        ("Panzer Dragoon (USA) (Disc 1) (Track 1).bin", 1),
+        ("Panzer Dragoon (USA) (Disc 1) (Track 2).bin", 1),
+        ("Panzer Dragoon (USA) (Disc 2).cue", 2),
+        ("Panzer Dragoon (USA) (Disc 2) (Track 1).bin", 2),
+    ]
+
+
+def test_single_file_release():
+    assert _pick("Other Game") == [("Other Game (USA).zip", None)]
@@ -0,0 +1,85 @@
+# tests/test_rate_limit.py
+import asyncio
+
+import pytest
+
+from scrapers.rate_limit import BACKGROUND, DROPDOWN, INTERACTIVE, QuotaExceeded, RequestScheduler, Ticket
+
+
+def test_sheds_by_priority_as_allowance_falls():
+    scheduler = RequestScheduler(reserve=300)
+    assert scheduler.allows(BACKGROUND)  # nothing reported yet
+    scheduler.update_allowance({"remaining_monthly_allowance": 300})
+    assert not scheduler.allows(BACKGROUND)
+    assert scheduler.allows(DROPDOWN)
+    scheduler.update_allowance({"remaining_monthly_allowance": 150})
+    assert not scheduler.allows(DROPDOWN)
+    assert scheduler.allows(INTERACTIVE)
+    scheduler.update_allowance({"remaining_monthly_allowance": 0})
+    assert not scheduler.allows(INTERACTIVE)
+
+
+def test_extra_allowance_counts_towards_remaining():
+    scheduler = RequestScheduler(reserve=300)
+    scheduler.update_allowance({"remaining_monthly_allowance": 100, "extra_allowance": 500})
+    assert scheduler.remaining == 600
+    assert scheduler.allows(BACKGROUND)
+
+
+def test_allowance_refresh_lifts_shedding():
+    scheduler = RequestScheduler(reserve=300)
+    scheduler.update_allowance({"remaining_monthly_allowance": 10, "allowance_refresh_timer": 0})
+    assert scheduler.allows(BACKGROUND)
+    assert scheduler.remaining is None
+
+
+def test_acquire_raises_when_shed():
+    scheduler = RequestScheduler(reserve=300)
+    scheduler.update_allowance({"remaining_monthly_allowance": 200})
+    with pytest.raises(QuotaExceeded):
+        asyncio.run(scheduler.acquire(BACKGROUND))
+    asyncio.run(scheduler.acquire(DROPDOWN))
+
+
+def test_queued_requests_go_by_priority():
+    async def scenario() -> list[str]:
+        scheduler = RequestScheduler(rate=1000.0, burst=1)
+        await scheduler.acquire()  # empty the bucket so the rest queue
+        order: list[str] = []
+
+        async def request(name: str, priority) -> None:
+            await scheduler.acquire(priority)
+            order.append(name)
+
+        tasks = [
+            asyncio.ensure_future(request("background", BACKGROUND)),
+            asyncio.ensure_future(request("dropdown", DROPDOWN)),
+            asyncio.ensure_future(request("interactive", INTERACTIVE)),
+        ]
+        await asyncio.gather(*tasks)
+        return order
+
+    assert asyncio.run(scenario()) == ["interactive", "dropdown", "background"]
+
+
+def test_promoted_ticket_overtakes_queued_work():
+    async def scenario() -> list[str]:
+        scheduler = RequestScheduler(rate=1000.0, burst=1)
+        await scheduler.acquire()
+        ticket = Ticket(BACKGROUND)
+        order: list[str] = []
+
+        async def request(name: str, priority) -> None:
+            await scheduler.acquire(priority)
+            order.append(name)
+
+        tasks = [
+            asyncio.ensure_future(request("dropdown", DROPDOWN)),
+            asyncio.ensure_future(request("prefetch", ticket)),
+        ]
+        await asyncio.sleep(0)  # both are queued
+        scheduler.promote(ticket)
+        await asyncio.gather(*tasks)
+        return order
+
+    assert asyncio.run(scenario()) == ["prefetch", "dropdown"]
@@ -0,0 +1,72 @@
+# tests/test_rom_tags.py
+import posixpath
+import urllib.parse
+
+import pytest
+
+from scrapers import myrient, rom_tags
+from scrapers.rom_tags import BAD_DUMP, BETA, BIOS, DEMO, KIOSK, PROTO, WORLD, RomTags
+
+USA, EUROPE, JAPAN = 1, 2, 4
+
+
+@pytest.mark.parametrize("filename, expected", [
+    ("Plain.zip", RomTags()),
+    ("Game (USA).zip", RomTags(USA)),
+    ("Game (USA, Europe).zip", RomTags(USA | EUROPE)),
+    ("Game (Europe) (En,Fr,De).zip", RomTags(EUROPE)),
+    ("Tetris (World) (Rev 1).zip", RomTags(WORLD, 1)),
+    ("Game (USA) (Rev A).zip", RomTags(USA, 1)),
+    ("Game (Japan) (v1.0).zip", RomTags(JAPAN, 0)),
+    ("Game (Japan) (v1.1).zip", RomTags(JAPAN, 1)),
+    ("Game (Japan) (v2.0).zip", RomTags(JAPAN, 100)),
+    ("Game (USA) (Beta 2).zip", RomTags(USA, 0, BETA)),
+    ("Game (USA) (Proto).zip", RomTags(USA, 0, PROTO)),
+    ("Game (Japan) (Taikenban).zip", RomTags(JAPAN, 0, DEMO)),
+    ("Game (Kiosk) (USA).zip", RomTags(USA, 0, KIOSK)),
+    ("Game (USA, Europe) [b].zip", RomTags(USA | EUROPE, 0, BAD_DUMP)),
+    ("[BIOS] PS1 (USA).zip", RomTags(USA, 0, BIOS)),
+])
+def test_parse(filename, expected):
+    assert rom_tags.parse(filename) == expected
+
+
+def test_only_tags_count_not_title_words():
+    assert rom_tags.parse("Beta Bloc (Europe).zip") == RomTags(EUROPE)
+    assert rom_tags.parse("Europe Racing (USA).zip") == RomTags(USA)
+
+
+def test_preference_and_rank(capsys):
+    masks = rom_tags.preference(("Europe", "USA", "Atlantis"))
+    assert masks == (EUROPE, USA)
+    assert "unknown region 'Atlantis'" in capsys.readouterr().out
+    assert rom_tags.region_rank(USA | EUROPE, masks) == 0
+    assert rom_tags.region_rank(USA, masks) == 1
+    assert rom_tags.region_rank(JAPAN, masks) == 2
+    assert rom_tags.region_rank(WORLD, masks) == 0
+
+
+SET = [
+    "Redump/Sony - PlayStation/Game (Europe).zip",
+    "Redump/Sony - PlayStation/Game (USA) (Rev 1).zip",
+    "Redump/Sony - PlayStation/Game (USA).zip",
+    "Redump/Sony - PlayStation/Game (USA) (Beta).zip",
+    "Redump/Sony - PlayStation/Game (Japan).zip",
+]
+
+
+def _picked(regions=None, entries=SET) -> list[str]:
+    candidates = myrient._PlatformCandidates(entries)
+    found = candidates.pick(candidates.scores(myrient._normalize_title("Game")), verbose=False, regions=regions)
+    return [posixpath.basename(urllib.parse.unquote(url)) for url, _ in found]
+
+
+def test_pick_prefers_region_then_original_release():
+    assert _picked(["USA", "Europe"]) == ["Game (USA).zip"]
+    assert _picked(["Japan"]) == ["Game (Japan).zip"]
+    assert _picked(["Europe"]) == ["Game (Europe).zip"]
+
+
+def test_pick_never_offers_skipped_builds():
+    only_beta = [SET[3], "Redump/Sony - PlayStation/Game (USA) (Demo).zip"]
+    assert _picked(["USA"], only_beta) == []
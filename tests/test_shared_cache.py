@@ -0,0 +1,50 @@
+# tests/test_shared_cache.py
+import os
+
+import pytest
+
+from scrapers import shared_cache
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    original = shared_cache.CACHE_PATH
+    path = str(tmp_path / "cache.sqlite")
+    shared_cache.set_path(path)
+    yield path
+    shared_cache.set_path(None)
+    shared_cache.CACHE_PATH = original
+
+
+def test_off_until_a_path_is_set(tmp_path, monkeypatch):
+    monkeypatch.setattr(shared_cache, "CACHE_PATH", str(tmp_path / "cache.sqlite"))
+    shared_cache.set_path(None)
+    shared_cache.put("ns", "key", 1, ttl=60)
+    assert shared_cache.get("ns", "key") is None
+    assert not os.path.exists(shared_cache.CACHE_PATH)
+
+
+def test_round_trip_and_expiry(cache_path):
+    shared_cache.put("ns", "key", {"links": [1, 2]}, ttl=60)
+    shared_cache.put("ns", "old", "stale", ttl=-1)
+    assert shared_cache.get("ns", "key") == {"links": [1, 2]}
+    assert shared_cache.get("other", "key") is None
+    assert shared_cache.get("ns", "old") is None
+
+
+def _keys() -> set[str]:
+    return {key for (key,) in shared_cache._db().execute("SELECT key FROM cache")}
+
+
+def test_purges_on_open_and_on_interval(cache_path):
+    shared_cache.put("ns", "fresh", 1, ttl=60)
+    shared_cache.put("ns", "expired", 1, ttl=-1)
+    assert _keys() == {"fresh", "expired"}
+    shared_cache.set_path(cache_path)  # reopening purges
+    assert _keys() == {"fresh"}
+
+    shared_cache.put("ns", "expired", 1, ttl=-1)
+    assert "expired" in _keys()  # not yet due
+    shared_cache._next_purge = 0.0
+    shared_cache.put("ns", "another", 1, ttl=60)
+    assert _keys() == {"fresh", "another"}
@@ -0,0 +1,71 @@
+# tests/test_tgdb_mirror.py
+import pytest
+
+from scrapers import tgdb_mirror
+
+
+@pytest.fixture
+def mirror(tmp_path):
+    original = tgdb_mirror.DB_PATH
+    path = str(tmp_path / "thegamesdb.sqlite")
+    conn = tgdb_mirror.connect(path, create=True)
+    tgdb_mirror.upsert_platforms(conn, [{"id": 7, "name": "Nintendo Entertainment System (NES)"}])
+    tgdb_mirror.upsert_games(conn, [
+        {"id": 1, "game_title": "The Legend of Zelda", "platform": 7, "release_date": "1986-02-21"},
+        {"id": 2, "game_title": "Zelda II: The Adventure of Link", "platform": 7},
+    ])
+    conn.commit()
+    tgdb_mirror.set_path(path)
+    yield conn
+    conn.close()
+    tgdb_mirror.set_path(original)
+
+
+def test_game_joins_platform_name(mirror):
+    game = tgdb_mirror.game(1)
+    assert game["game_title"] == "The Legend of Zelda"
+    assert game["platform_name"] == "Nintendo Entertainment System (NES)"
+    assert tgdb_mirror.game(99) is None
+
+
+def test_search_prefers_exact_title_and_matches_prefixes(mirror):
+    assert [g["id"] for g in tgdb_mirror.search("the legend of zelda")][0] == 1
+    assert {g["id"] for g in tgdb_mirror.search("zel")} == {1, 2}
+    assert tgdb_mirror.search("!!!") == []
+
+
+def test_partial_rows_from_edits_are_misses(mirror):
+    # Edits for a game the mirror lacks arrive one field at a time
+    tgdb_mirror.update_game_field(mirror, 3, "game_title", "Metroid")
+    tgdb_mirror.update_game_field(mirror, 4, "overview", "no title yet")
+    mirror.commit()
+    assert tgdb_mirror.game(3) is None
+    assert tgdb_mirror.game(4) is None
+    assert tgdb_mirror.search("metroid") == []
+
+    tgdb_mirror.update_game_field(mirror, 3, "platform", 7)
+    mirror.commit()
+    assert tgdb_mirror.game(3)["game_title"] == "Metroid"
+    assert [g["id"] for g in tgdb_mirror.search("metroid")] == [3]
+
+
+def test_title_edits_reindex_search(mirror):
+    tgdb_mirror.update_game_field(mirror, 2, "game_title", "Adventure of Link")
+    mirror.commit()
+    assert [g["id"] for g in tgdb_mirror.search("adventure")] == [2]
+    assert [g["id"] for g in tgdb_mirror.search("zelda")] == [1]
+
+
+def test_delete_and_images(mirror):
+    tgdb_mirror.set_meta(mirror, "image_base_url", "https://cdn.example/")
+    assert tgdb_mirror.images(1) is None  # not synced yet
+    tgdb_mirror.replace_images(mirror, 1, [{"type": "boxart", "side": "front", "filename": "boxart/1.jpg"}])
+    mirror.commit()
+    base, imgs = tgdb_mirror.images(1)
+    assert base == "https://cdn.example/"
+    assert imgs == [{"type": "boxart", "side": "front", "filename": "boxart/1.jpg"}]
+
+    tgdb_mirror.delete_game(mirror, 1)
+    mirror.commit()
+    assert tgdb_mirror.game(1) is None
+    assert tgdb_mirror.search("legend") == []
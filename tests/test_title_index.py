@@ -0,0 +1,46 @@
+# tests/test_title_index.py
+from scrapers.title_index import INSORT_MAX, TitleIndex, display_title, normalize
+
+TITLES = ["Super Mario World", "Super Mario Kart", "Mario Kart 64", "The Legend of Zelda"]
+
+
+def _index(titles=TITLES) -> TitleIndex:
+    index = TitleIndex("test_title_index")
+    index.build(titles)
+    return index
+
+
+def test_normalize_and_display_title():
+    assert normalize("Super Mario World (USA)") == "super mario world"
+    assert display_title("No-Intro/Nintendo/Super_Mario World (USA) (Rev 1).zip") == "Super Mario World"
+
+
+def test_complete_matches_title_then_word_prefixes():
+    index = _index()
+    assert index.complete("mario") == ["Mario Kart 64", "Super Mario Kart", "Super Mario World"]
+    assert index.complete("zel") == ["The Legend of Zelda"]
+    assert index.complete("mario", limit=1) == ["Mario Kart 64"]
+    assert index.complete("   ") == []
+
+
+def test_complete_falls_back_to_fuzzy_matching():
+    assert "Super Mario World" in _index().complete("supr maro")
+
+
+def test_add_small_batch_and_invalidate_cache():
+    index = _index()
+    assert index.complete("metroid") == []
+    index.add(["Metroid", "Super Metroid", "Metroid"])
+    assert index.complete("metroid") == ["Metroid", "Super Metroid"]
+    assert len(index) == len(TITLES) + 2
+
+
+def test_bulk_add_matches_build():
+    extra = [f"Game {i:04d} Quest" for i in range(INSORT_MAX * 3)]
+    added = _index()
+    added.add(extra)
+    added.add(["Zelda Adventure"])  # a small batch after a bulk one
+    built = _index(TITLES + extra + ["Zelda Adventure"])
+    assert added._data[0] == built._data[0]
+    assert added._data[1] == built._data[1]
+    assert added.complete("quest", limit=3) == ["Game 0000 Quest", "Game 0001 Quest", "Game 0002 Quest"]